@@ -0,0 +1,55 @@
+import os
+import time
+
+import unreal
+
+
+def delete_assets_batched(asset_paths:[str], snapshot=None, fix_redirectors=True, run_gc=True):
+    # save, close editors, delete, fix up redirectors and gc, each phase runs once for all the assets
+    phases = {}
+
+    t = time.time()
+    exists = snapshot.exists if snapshot else unreal.EditorAssetLibrary.does_asset_exist
+    targets = [path for path in dict.fromkeys(asset_paths) if exists(path)]
+    assets = [asset for asset in (unreal.load_asset(path) for path in targets) if asset]
+    phases["load"] = time.time() - t
+
+    deleted = False
+    if assets:
+        t = time.time()
+        unreal.EditorAssetLibrary.save_loaded_assets(assets, only_if_is_dirty=True)
+        phases["save"] = time.time() - t
+
+        t = time.time()
+        asset_editor = unreal.get_editor_subsystem(unreal.AssetEditorSubsystem)
+        target_names = {asset.get_path_name() for asset in assets}
+        for edited in asset_editor.get_all_edited_assets():
+            if edited.get_path_name() in target_names:
+                asset_editor.close_all_editors_for_asset(edited)
+        edited = None  # python references keep the objects alive
+        phases["close_editors"] = time.time() - t
+
+        t = time.time()
+        deleted = unreal.EditorAssetLibrary.delete_loaded_assets(assets)
+        assets = None
+        phases["delete"] = time.time() - t
+        if snapshot:
+            for path in targets:
+                snapshot.on_asset_removed(path)
+
+        if fix_redirectors:
+            t = time.time()
+            folders = sorted({os.path.dirname(path) for path in targets})
+            unreal.PythonBPLib.fix_up_redirectors_in_folder(folders)
+            phases["fix_redirectors"] = time.time() - t
+
+        if run_gc:
+            t = time.time()
+            unreal.PythonBPLib.gc(0)
+            phases["gc"] = time.time() - t
+
+    result = {"deleted": len(targets) if deleted else 0, "targets": targets, "phases": phases
+            , "total_seconds": sum(phases.values())}
+    print(f"delete_assets_batched: {result['deleted']} assets in {result['total_seconds']:.2f}s, "
+          + ", ".join(f"{k}: {v:.2f}s" for k, v in phases.items()))
+    return result
@@ -0,0 +1,81 @@
+import time
+
+import unreal
+
+
+def to_package_name(asset_path:str) -> str:
+    # "/Game/A/B.B" or "/Game/A/B" -> "/Game/A/B"
+    return asset_path.split(".", 1)[0]
+
+
+def get_class_name(asset_data) -> str:
+    class_path = getattr(asset_data, "asset_class_path", None)  # ue5.1+
+    if class_path is not None:
+        return str(class_path.asset_name)
+    return str(asset_data.asset_class)
+
+
+class AssetSnapshot:
+    # Asset data of whole folders from one asset registry query, indexed by package name and by class.
+    # The registry delegates are not exposed to python, so the snapshot is kept in sync by on_asset_added/removed/renamed
+    # from the code that changes the assets, and a miss is confirmed with the registry before it is reported.
+    def __init__(self, folders:[str], recursive=True):
+        self.folders = [folder.rstrip("/") for folder in folders]
+        self.recursive = recursive
+        self.by_package = {}
+        self.by_class = {}
+        self.query_seconds = 0.0
+        self.lookups = 0
+        self.fallbacks = 0
+
+    def covers(self, asset_path:str) -> bool:
+        return any(asset_path.startswith(folder + "/") for folder in self.folders)
+
+    def refresh(self):
+        t = time.time()
+        self.by_package.clear()
+        self.by_class.clear()
+        registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        for folder in self.folders:
+            for asset_data in registry.get_assets_by_path(folder, recursive=self.recursive):
+                self.on_asset_added(asset_data)
+        self.query_seconds = time.time() - t
+        return self
+
+    def on_asset_added(self, asset_data):
+        package_name = str(asset_data.package_name)
+        self.on_asset_removed(package_name)
+        self.by_package[package_name] = asset_data
+        self.by_class.setdefault(get_class_name(asset_data), {})[package_name] = asset_data
+
+    def on_asset_removed(self, asset_path:str):
+        asset_data = self.by_package.pop(to_package_name(asset_path), None)
+        if asset_data is not None:
+            self.by_class.get(get_class_name(asset_data), {}).pop(str(asset_data.package_name), None)
+
+    def on_asset_renamed(self, asset_data, old_asset_path:str):
+        self.on_asset_removed(old_asset_path)
+        self.on_asset_added(asset_data)
+
+    def find_asset_data(self, asset_path:str):
+        self.lookups += 1
+        package_name = to_package_name(asset_path)
+        asset_data = self.by_package.get(package_name)
+        if asset_data is None:
+            # not in snapshot: out of the folders, or created after the refresh
+            self.fallbacks += 1
+            if unreal.EditorAssetLibrary.does_asset_exist(package_name):
+                asset_data = unreal.EditorAssetLibrary.find_asset_data(package_name)
+                if self.covers(package_name):
+                    self.on_asset_added(asset_data)
+        return asset_data
+
+    def exists(self, asset_path:str) -> bool:
+        return self.find_asset_data(asset_path) is not None
+
+    def assets_of_class(self, class_name:str):
+        return list(self.by_class.get(class_name, {}).values())
+
+    def report(self):
+        return {"assets": len(self.by_package), "classes": len(self.by_class), "query_seconds": self.query_seconds
+                , "lookups": self.lookups, "fallbacks": self.fallbacks}
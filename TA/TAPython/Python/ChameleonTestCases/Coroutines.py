@@ -0,0 +1,266 @@
+import os
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # runs with FakeTickSource outside the editor
+
+
+class Wait:
+    # Base awaitable. The runner resumes the coroutine on the first tick that ready() is True.
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.start_time = 0.0
+
+    def start(self, runner):
+        self.start_time = runner.clock()
+
+    def ready(self, runner) -> bool:
+        return True
+
+    def result(self):
+        return None
+
+    def timed_out(self, runner) -> bool:
+        return self.timeout is not None and runner.clock() - self.start_time > self.timeout
+
+    def __await__(self):
+        value = yield self
+        return value
+
+
+class NextFrame(Wait):
+    def __init__(self, count=1):
+        super().__init__()
+        self.count = count
+        self.target_frame = 0
+
+    def start(self, runner):
+        super().start(runner)
+        self.target_frame = runner.frame + self.count
+
+    def ready(self, runner):
+        return runner.frame >= self.target_frame
+
+
+class Sleep(Wait):
+    def __init__(self, seconds:float):
+        super().__init__()
+        self.seconds = seconds
+
+    def ready(self, runner):
+        return runner.clock() - self.start_time >= self.seconds
+
+
+class WaitUntil(Wait):
+    def __init__(self, predicate, timeout=None):
+        super().__init__(timeout)
+        self.predicate = predicate
+        self.value = None
+
+    def ready(self, runner):
+        self.value = self.predicate()
+        return bool(self.value)
+
+    def result(self):
+        return self.value
+
+
+class LogMatcher:
+    # only the new lines are scanned in each tick
+    def __init__(self, target:str, log_source):
+        self.target = target
+        self.log_source = log_source
+        self.scanned = 0
+
+    def __call__(self):
+        logs = self.log_source()
+        if len(logs) < self.scanned:  # log buffer cleared
+            self.scanned = 0
+        for line in logs[self.scanned:]:
+            if self.target in line:
+                return line
+        self.scanned = len(logs)
+        return None
+
+
+class NewFile(Wait):
+    # a new file in folder, and its size has not changed since the last tick(finished writing)
+    def __init__(self, folder:str, action=None, timeout=None):
+        super().__init__(timeout)
+        self.folder = folder
+        self.action = action
+        self.exists = set()
+        self.candidate = None
+        self.last_size = -1
+
+    def _list(self):
+        return set(os.listdir(self.folder)) if os.path.exists(self.folder) else set()
+
+    def start(self, runner):
+        super().start(runner)
+        self.exists = self._list()
+        if self.action:
+            self.action()
+
+    def ready(self, runner):
+        if self.candidate is None:
+            new_files = self._list() - self.exists
+            if not new_files:
+                return False
+            self.candidate = os.path.join(self.folder, max(new_files, key=lambda n: os.path.getmtime(os.path.join(self.folder, n))))
+        size = os.path.getsize(self.candidate)
+        bStable = 0 < size == self.last_size
+        self.last_size = size
+        return bStable
+
+    def result(self):
+        return self.candidate
+
+
+def next_frame(count=1) -> NextFrame:
+    return NextFrame(count)
+
+
+def sleep(seconds:float) -> Sleep:
+    return Sleep(seconds)
+
+
+def wait_until(predicate, timeout=None) -> WaitUntil:
+    return WaitUntil(predicate, timeout)
+
+
+def wait_for_log(target:str, timeout=10.0, log_source=None) -> WaitUntil:
+    # the matched log line is the result
+    if log_source is None:
+        log_source = unreal.PythonTestLib.get_logs
+    return WaitUntil(LogMatcher(target, log_source), timeout)
+
+
+def snapshot(folder:str, take_shot, timeout=10.0) -> NewFile:
+    # take_shot() is called when the wait starts, the path of the new screenshot is the result
+    return NewFile(folder, take_shot, timeout)
+
+
+class SlateTickSource:
+    def __init__(self):
+        self.tick_handle = None
+
+    def clock(self):
+        return time.perf_counter()
+
+    def start(self, callback):
+        if self.tick_handle is None:
+            self.tick_handle = unreal.register_slate_post_tick_callback(callback)
+
+    def stop(self):
+        if self.tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+
+
+class FakeTickSource:
+    # tick by hand, with a fake clock
+    def __init__(self, delta_seconds=1 / 60):
+        self.delta_seconds = delta_seconds
+        self.now = 0.0
+        self.callback = None
+
+    def clock(self):
+        return self.now
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def tick(self, count=1):
+        for _ in range(count):
+            if self.callback is None:
+                break
+            self.now += self.delta_seconds
+            self.callback(self.delta_seconds)
+
+    def run_until_complete(self, task, max_ticks=100000):
+        for _ in range(max_ticks):
+            if task.bFinished:
+                break
+            self.tick()
+        return task
+
+
+class CoroutineTask:
+    def __init__(self, coro, on_finished=None):
+        self.coro = coro
+        self.on_finished = on_finished
+        self.wait = None
+        self.result = None
+        self.error = None
+        self.bFinished = False
+
+    def step(self, runner):
+        value, error = None, None
+        if self.wait is not None:
+            if self.wait.ready(runner):
+                value = self.wait.result()
+            elif self.wait.timed_out(runner):
+                error = TimeoutError(f"{type(self.wait).__name__} timeout: {self.wait.timeout}s")
+            else:
+                return
+        try:
+            wait = self.coro.throw(error) if error else self.coro.send(value)
+        except StopIteration as e:
+            self._finish(result=e.value)
+        except Exception as e:
+            self._finish(error=e)
+        else:
+            if not isinstance(wait, Wait):
+                self.coro.close()
+                self._finish(error=TypeError(f"Only Wait can be awaited in CoroutineTask, got: {type(wait)}"))
+                return
+            wait.start(runner)
+            self.wait = wait
+
+    def _finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.bFinished = True
+        if self.on_finished:
+            self.on_finished(self)
+
+    def cancel(self, reason="cancelled"):
+        # stop without on_finished, the runner drops it in the next tick
+        if self.bFinished:
+            return
+        self.coro.close()
+        self.error = RuntimeError(reason)
+        self.bFinished = True
+
+
+class CoroutineRunner:
+    # Resume the awaiting coroutines in each tick, the tick source stops when there is no task left.
+    def __init__(self, tick_source=None):
+        self.tick_source = tick_source if tick_source else SlateTickSource()
+        self.frame = 0
+        self.tasks = []
+
+    def clock(self):
+        return self.tick_source.clock()
+
+    def spawn(self, coro, on_finished=None) -> CoroutineTask:
+        task = CoroutineTask(coro, on_finished)
+        self.tasks.append(task)
+        self.tick_source.start(self._tick)
+        return task
+
+    def _tick(self, delta_seconds):
+        self.frame += 1
+        for task in list(self.tasks):
+            if not task.bFinished:
+                task.step(self)
+            if task.bFinished:
+                self.tasks.remove(task)
+        if not self.tasks:
+            self.tick_source.stop()
@@ -0,0 +1,180 @@
+import json
+import time
+
+import unreal
+
+
+class DataTableIndex:
+    # A whole table read with one call, then rows by name and values by column without more round trips.
+    # Values from get_table_as_json are json values, from get_flatten_data_table they are strings.
+    def __init__(self, row_names:[str], columns:dict):
+        self.row_names = row_names
+        self.rows = {name: i for i, name in enumerate(row_names)}
+        self.columns = columns  # column name: [value of each row]
+
+    def __len__(self):
+        return len(self.row_names)
+
+    def __contains__(self, row_name):
+        return row_name in self.rows
+
+    @staticmethod
+    def from_json(table_as_json:str):
+        rows = json.loads(table_as_json) if table_as_json else []
+        row_names = [row["Name"] for row in rows]
+        columns = {}
+        for i, row in enumerate(rows):
+            for column, value in row.items():
+                if column == "Name":
+                    continue
+                if column not in columns:
+                    columns[column] = [None] * len(rows)
+                columns[column][i] = value
+        return DataTableIndex(row_names, columns)
+
+    @staticmethod
+    def from_flatten(flatten:[[str]]):
+        # the first row is the header, the first column is the row name
+        header, rows = flatten[0], flatten[1:]
+        columns = {column: [row[c] for row in rows] for c, column in enumerate(header) if c > 0}
+        return DataTableIndex([row[0] for row in rows], columns)
+
+    @staticmethod
+    def read(data_table, source="json"):
+        if source == "json":
+            return DataTableIndex.from_json(unreal.PythonDataTableLib.get_table_as_json(data_table))
+        return DataTableIndex.from_flatten(unreal.PythonDataTableLib.get_flatten_data_table(data_table, include_header=True))
+
+    def get(self, row_name:str, column:str):
+        return self.columns[column][self.rows[row_name]]
+
+    def row(self, row_name:str) -> dict:
+        i = self.rows[row_name]
+        return {column: values[i] for column, values in self.columns.items()}
+
+    def column(self, column:str) -> list:
+        return self.columns[column]
+
+    def to_json_rows(self) -> [dict]:
+        rows = [{"Name": name} for name in self.row_names]
+        for column, values in self.columns.items():
+            for row, value in zip(rows, values):
+                row[column] = value
+        return rows
+
+
+def can_fill_from_json() -> bool:
+    return hasattr(unreal, "DataTableFunctionLibrary") and hasattr(unreal.DataTableFunctionLibrary, "fill_data_table_from_json_string")
+
+
+class DataTableEditBuffer:
+    # Row and cell edits staged by column, applied with either:
+    #   "json": one get_table_as_json, merge in python, one fill_data_table_from_json_string
+    #   "cells": add_row/remove_row/set_property_by_string for each edit, cheaper for a few edits
+    # Values are import text like set_property_by_string, or json values(in "json" mode only).
+    def __init__(self, data_table, json_threshold=100):
+        self.data_table = data_table
+        self.json_threshold = json_threshold
+        self.added = {}  # row name: None, keep the order
+        self.removed = set()
+        self.cells = {}  # column: {row name: value}
+
+    def add_row(self, row_name:str, values:dict=None):
+        self.removed.discard(row_name)
+        self.added[row_name] = None
+        for column, value in (values or {}).items():
+            self.set(row_name, column, value)
+
+    def remove_row(self, row_name:str):
+        self.added.pop(row_name, None)
+        self.removed.add(row_name)
+        for column_cells in self.cells.values():
+            column_cells.pop(row_name, None)
+
+    def set(self, row_name:str, column:str, value):
+        self.cells.setdefault(column, {})[row_name] = value
+
+    def set_column(self, column:str, values_by_row:dict):
+        self.cells.setdefault(column, {}).update(values_by_row)
+
+    def edit_count(self) -> int:
+        return len(self.added) + len(self.removed) + sum(len(v) for v in self.cells.values())
+
+    def clear(self):
+        self.added, self.removed, self.cells = {}, set(), {}
+
+    def apply(self, mode="auto", index:DataTableIndex=None):
+        # return: {"mode", "edits", "engine_calls", "seconds"}
+        if mode == "auto":
+            all_strings = all(isinstance(v, str) for cells in self.cells.values() for v in cells.values())
+            mode = "json" if can_fill_from_json() and (self.edit_count() > self.json_threshold or not all_strings) else "cells"
+        t = time.time()
+        edits = self.edit_count()
+        engine_calls = self._apply_json(index) if mode == "json" else self._apply_cells()
+        self.clear()
+        return {"mode": mode, "edits": edits, "engine_calls": engine_calls, "seconds": time.time() - t}
+
+    def _apply_cells(self) -> int:
+        lib = unreal.PythonDataTableLib
+        calls = 0
+        for row_name in self.removed:
+            lib.remove_row(self.data_table, row_name)
+            calls += 1
+        for row_name in self.added:
+            lib.add_row(self.data_table, row_name)
+            calls += 1
+        for column, column_cells in self.cells.items():
+            for row_name, value in column_cells.items():
+                lib.set_property_by_string(self.data_table, row_name=row_name, column_name=column
+                                           , value_as_string=value if isinstance(value, str) else str(value))
+                calls += 1
+        return calls
+
+    def _apply_json(self, index:DataTableIndex=None) -> int:
+        assert can_fill_from_json(), "DataTableFunctionLibrary.fill_data_table_from_json_string not available"
+        calls = 0
+        if index is None:
+            index = DataTableIndex.read(self.data_table)
+            calls += 1
+        rows = [row for row in index.to_json_rows() if row["Name"] not in self.removed]
+        by_name = {row["Name"]: row for row in rows}
+        for row_name in self.added:
+            if row_name not in by_name:
+                by_name[row_name] = {"Name": row_name}
+                rows.append(by_name[row_name])
+        for column, column_cells in self.cells.items():
+            for row_name, value in column_cells.items():
+                if row_name in by_name:
+                    by_name[row_name][column] = value
+        unreal.DataTableFunctionLibrary.fill_data_table_from_json_string(self.data_table, json.dumps(rows))
+        return calls + 1
+
+
+def benchmark(data_table, sizes=(1000, 10_000, 100_000), values:dict=None, cells_limit=1000):
+    # fill the table with n rows, read it back and look up every row. The table is emptied before each run.
+    results = []
+    for size in sizes:
+        modes = ["json", "cells"] if size <= cells_limit else ["json"]
+        for mode in modes:
+            if can_fill_from_json():
+                unreal.DataTableFunctionLibrary.fill_data_table_from_json_string(data_table, "[]")
+            else:
+                for row_name in unreal.PythonDataTableLib.get_row_names(data_table):
+                    unreal.PythonDataTableLib.remove_row(data_table, row_name)
+            buffer = DataTableEditBuffer(data_table)
+            for i in range(size):
+                buffer.add_row(f"Row_{i}", values)
+            applied = buffer.apply(mode=mode, index=DataTableIndex([], {}))
+
+            t = time.time()
+            index = DataTableIndex.read(data_table)
+            read_seconds = time.time() - t
+            t = time.time()
+            found = sum(1 for i in range(size) if f"Row_{i}" in index)
+            lookup_seconds = time.time() - t
+            assert found == size, f"rows after {mode} apply: {found} != {size}"
+            results.append({"rows": size, "mode": mode, "engine_calls": applied["engine_calls"]
+                            , "apply_seconds": applied["seconds"], "read_seconds": read_seconds, "lookup_seconds": lookup_seconds})
+            print(f"DataTableBulk {mode:>5} {size:>7} rows: apply {applied['seconds']:.2f}s with {applied['engine_calls']} calls, "
+                  f"read {read_seconds:.2f}s, lookup {lookup_seconds * 1000:.1f}ms")
+    return results
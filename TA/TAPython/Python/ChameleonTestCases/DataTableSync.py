@@ -0,0 +1,307 @@
+import bisect
+import csv
+import hashlib
+import json
+import os
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # diff and MemoryTable work without the editor
+
+
+def row_hash(values:dict, columns) -> str:
+    text = json.dumps([values.get(column) for column in columns], separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def to_import_text(value) -> str:
+    # values for set_property_by_string
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(value)
+
+
+# streaming sources: (row name, {column: value})
+def iter_csv_rows(file_path:str):
+    # the first column is the row name, same as the csv exported by the editor
+    with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        columns = header[1:]
+        for row in reader:
+            if row:
+                yield row[0], dict(zip(columns, row[1:]))
+
+
+def iter_json_rows(file_path:str, chunk_size=1 << 20):
+    # a json array of row objects with "Name", read chunk by chunk
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        buffer, pos = "", 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            row = None
+            if pos < len(buffer):
+                try:
+                    row, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    row = None
+            if row is None:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    assert not buffer[pos:].strip(), f"Broken json rows at the end of: {file_path}"
+                    return
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield row.pop("Name"), row
+
+
+def iter_source_rows(file_path:str):
+    return iter_json_rows(file_path) if file_path.lower().endswith(".json") else iter_csv_rows(file_path)
+
+
+def longest_increasing_subsequence(values:[int]) -> [int]:
+    # indices of one longest strictly increasing subsequence
+    tails, tail_indices, parents = [], [], [-1] * len(values)
+    for i, v in enumerate(values):
+        k = bisect.bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_indices.append(i)
+        else:
+            tails[k] = v
+            tail_indices[k] = i
+        parents[i] = tail_indices[k - 1] if k > 0 else -1
+    result = []
+    i = tail_indices[-1] if tail_indices else -1
+    while i >= 0:
+        result.append(i)
+        i = parents[i]
+    return result[::-1]
+
+
+class RowDiff:
+    def __init__(self):
+        self.added = []  # (row name, values)
+        self.removed = []  # row name
+        self.changed = []  # (row name, {column: new value})
+        self.renamed = []  # (old name, new name), same content
+        self.moved = []  # row names out of order, after the other edits are applied
+        self.target_order = []
+        self.order_after_edits = []  # row names after rename/remove/add, before the moves
+        self.current_count = 0
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed or self.renamed or self.moved)
+
+    def edit_count(self):
+        return len(self.added) + len(self.removed) + len(self.renamed) + len(self.moved) \
+               + sum(len(cells) for _, cells in self.changed)
+
+    def report(self):
+        return {"current_rows": self.current_count, "target_rows": len(self.target_order), "added": len(self.added)
+                , "removed": len(self.removed), "changed": len(self.changed), "renamed": len(self.renamed), "moved": len(self.moved)}
+
+
+def diff_rows(current_rows, target_rows) -> RowDiff:
+    # current_rows, target_rows: iterables of (row name, {column: value}). Only the columns in the target are compared
+    diff = RowDiff()
+    current = {}
+    for name, values in current_rows:
+        current[name] = (len(current), values)
+    diff.current_count = len(current)
+
+    columns = {}
+    target_names = set()
+    added = {}
+    for name, values in target_rows:
+        assert name not in target_names, f"Duplicated row name: {name}"
+        target_names.add(name)
+        diff.target_order.append(name)
+        columns.update(dict.fromkeys(values))
+        if name not in current:
+            added[name] = (len(diff.target_order) - 1, values)
+            continue
+        current_values = current[name][1]
+        if row_hash(values, values) != row_hash(current_values, values):
+            diff.changed.append((name, {c: v for c, v in values.items() if current_values.get(c) != v}))
+
+    # a removed row and an added row with the same content is a rename
+    removed = [name for name in current if name not in target_names]
+    removed_by_hash = {}
+    for name in removed:
+        removed_by_hash.setdefault(row_hash(current[name][1], columns), []).append(name)
+    renamed_old = set()
+    for name, (position, values) in list(added.items()):
+        candidates = removed_by_hash.get(row_hash(values, columns))
+        if candidates:
+            # the nearest one, fewer moves later
+            old_name = min(candidates, key=lambda c: abs(current[c][0] - position))
+            candidates.remove(old_name)
+            diff.renamed.append((old_name, name))
+            renamed_old.add(old_name)
+            del added[name]
+    diff.removed = [name for name in removed if name not in renamed_old]
+    diff.added = [(name, values) for name, (_, values) in added.items()]
+
+    # order after rename/remove/add, rows out of the longest in-order run are moved
+    new_names = dict(diff.renamed)
+    working = [new_names.get(name, name) for name in current if name in target_names or name in new_names]
+    working.extend(name for name, _ in diff.added)
+    target_position = {name: i for i, name in enumerate(diff.target_order)}
+    positions = [target_position[name] for name in working]
+    in_order = set(working[i] for i in longest_increasing_subsequence(positions))
+    diff.moved = [name for name in diff.target_order if name not in in_order]
+    diff.order_after_edits = working
+    return diff
+
+
+def apply_diff(table, diff:RowDiff):
+    # table: add_row, remove_row, rename_row, move_row(name, up, num_rows_to_move_by), set_cell(name, column, value)
+    t = time.time()
+    calls = 0
+    for old_name, new_name in diff.renamed:
+        table.rename_row(old_name, new_name)
+        calls += 1
+    for name in diff.removed:
+        table.remove_row(name)
+        calls += 1
+    for name, values in diff.added:
+        table.add_row(name)
+        calls += 1
+        for column, value in values.items():
+            table.set_cell(name, column, value)
+            calls += 1
+    for name, cells in diff.changed:
+        for column, value in cells.items():
+            table.set_cell(name, column, value)
+            calls += 1
+
+    # each moved row goes right after its previous row in the target, in target order
+    working = list(diff.order_after_edits)
+    target_position = {name: i for i, name in enumerate(diff.target_order)}
+    for name in diff.moved:
+        i = target_position[name]
+        current_index = working.index(name)
+        working.pop(current_index)
+        dest_index = working.index(diff.target_order[i - 1]) + 1 if i > 0 else 0
+        working.insert(dest_index, name)
+        if dest_index != current_index:
+            table.move_row(name, up=dest_index < current_index, num_rows_to_move_by=abs(dest_index - current_index))
+            calls += 1
+    return {"engine_calls": calls, "seconds": time.time() - t}
+
+
+class MemoryTable:
+    # the table interface in memory, for dry runs and tests
+    def __init__(self, rows=None):
+        self.rows = [[name, dict(values)] for name, values in (rows or [])]
+        self.calls = 0
+
+    def _index(self, name):
+        return next(i for i, row in enumerate(self.rows) if row[0] == name)
+
+    def read_rows(self):
+        return [(name, dict(values)) for name, values in self.rows]
+
+    def add_row(self, name):
+        self.calls += 1
+        self.rows.append([name, {}])
+
+    def remove_row(self, name):
+        self.calls += 1
+        self.rows.pop(self._index(name))
+
+    def rename_row(self, old_name, new_name):
+        self.calls += 1
+        self.rows[self._index(old_name)][0] = new_name
+
+    def move_row(self, name, up, num_rows_to_move_by):
+        self.calls += 1
+        i = self._index(name)
+        row = self.rows.pop(i)
+        self.rows.insert(i - num_rows_to_move_by if up else i + num_rows_to_move_by, row)
+
+    def set_cell(self, name, column, value):
+        self.calls += 1
+        self.rows[self._index(name)][1][column] = value
+
+
+class EditorDataTable:
+    # the table interface over PythonDataTableLib. source: "flatten" for csv(values as strings), "json" for json
+    def __init__(self, data_table, source="flatten"):
+        self.data_table = data_table
+        self.source = source
+
+    def read_rows(self):
+        from .DataTableBulk import DataTableIndex
+        index = DataTableIndex.read(self.data_table, self.source)
+        for i, name in enumerate(index.row_names):
+            yield name, {column: values[i] for column, values in index.columns.items()}
+
+    def add_row(self, name):
+        unreal.PythonDataTableLib.add_row(self.data_table, name)
+
+    def remove_row(self, name):
+        unreal.PythonDataTableLib.remove_row(self.data_table, name)
+
+    def rename_row(self, old_name, new_name):
+        unreal.PythonDataTableLib.rename_row(self.data_table, old_name, new_name)
+
+    def move_row(self, name, up, num_rows_to_move_by):
+        unreal.PythonDataTableLib.move_row(self.data_table, name, up=up, num_rows_to_move_by=num_rows_to_move_by)
+
+    def set_cell(self, name, column, value):
+        unreal.PythonDataTableLib.set_property_by_string(self.data_table, row_name=name, column_name=column
+                                                         , value_as_string=to_import_text(value))
+
+
+def export_csv(rows, file_path:str):
+    # rows: iterable of (row name, values), written one by one
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        columns = None
+        for name, values in rows:
+            if columns is None:
+                columns = list(values)
+                writer.writerow(["Name"] + columns)
+            writer.writerow([name] + [values.get(column, "") for column in columns])
+            count += 1
+    return count
+
+
+def export_json(rows, file_path:str):
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    count = 0
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for name, values in rows:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(dict(Name=name, **values)))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def sync_from_file(table, file_path:str):
+    # diff the table with a csv/json file, then apply only the diff
+    t = time.time()
+    diff = diff_rows(table.read_rows(), iter_source_rows(file_path))
+    diff_seconds = time.time() - t
+    applied = apply_diff(table, diff)
+    result = diff.report()
+    result.update({"diff_seconds": diff_seconds, "apply_seconds": applied["seconds"], "engine_calls": applied["engine_calls"]})
+    return diff, result
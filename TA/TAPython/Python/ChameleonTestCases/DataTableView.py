@@ -0,0 +1,217 @@
+import hashlib
+import os
+import re
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # the text parser works without the editor
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    if unreal:
+        unreal.log_warning("No module numpy. Typed DataTable columns disabled")
+    bNumpy = False
+
+
+# ue export text: (X=1.0,Y=2.0), ("a", Class'"/Game/A.A"'), True, 1.5, SomeName. ue5.1+ objects: /Script/Engine.Class'/Game/A.A'
+_TOKEN = re.compile(r"""\s*(?:(?P<open>\()|(?P<close>\))|(?P<comma>,)|(?P<key>[A-Za-z_]\w*)=(?!=)"""
+                    r"""|(?P<object>[A-Za-z_/][\w/.]*)'"?(?P<path>[^'"]*)"?'|"(?P<string>(?:[^"\\]|\\.)*)"|(?P<bare>[^(),"\s][^(),]*))""")
+_KEY = re.compile(r"[A-Za-z_]\w*=")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NUMBER_FULL = re.compile(r"^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$")
+
+
+def _bare_value(text:str):
+    text = text.strip()
+    if text == "True":
+        return True
+    if text == "False":
+        return False
+    if text == "None":
+        return None
+    if _NUMBER_FULL.match(text):
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    return text
+
+
+def parse_ue_text(text:str):
+    # "(X=1,Y=2)" -> {"X": 1, "Y": 2}, "(1,2)" -> (1, 2), "Class'/Game/A.A'" -> "/Game/A.A", "" -> None
+    tokens = [m for m in _TOKEN.finditer(text) if m.group(0).strip()]
+    if not tokens:
+        return None
+    value, end = _parse_value(tokens, 0)
+    return value
+
+
+def _parse_value(tokens, i):
+    m = tokens[i]
+    if m.group("open"):
+        return _parse_group(tokens, i + 1)
+    if m.group("object") is not None:
+        return m.group("path"), i + 1
+    if m.group("string") is not None:
+        return m.group("string").replace('\\"', '"'), i + 1
+    return _bare_value(m.group(0)), i + 1
+
+
+def _parse_group(tokens, i):
+    keyed, items = {}, []
+    while i < len(tokens) and not tokens[i].group("close"):
+        m = tokens[i]
+        if m.group("comma"):
+            i += 1
+            continue
+        if m.group("key"):
+            keyed[m.group("key")], i = _parse_value(tokens, i + 1)
+        else:
+            value, i = _parse_value(tokens, i)
+            items.append(value)
+    return (keyed if keyed else tuple(items)), i + 1
+
+
+def _leaf_names(value, prefix=""):
+    # names of the numeric leaves, None if any leaf is not a number
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return [prefix]
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, tuple) and value:
+        items = ((str(i), v) for i, v in enumerate(value))
+    else:
+        return None
+    names = []
+    for key, v in items:
+        sub = _leaf_names(v, f"{prefix}.{key}" if prefix else key)
+        if sub is None:
+            return None
+        names.extend(sub)
+    return names
+
+
+def parse_column(texts:[str]):
+    # return: kind, values, fields
+    #   "bool"/"int"/"float": numpy array, "numeric": (rows, fields) float array for vectors, transforms...
+    #   "object": asset paths, "map": dicts, "value": parsed values
+    assert bNumpy, "Need 3rd package: numpy"
+    if texts and all(t in ("True", "False") for t in texts):
+        return "bool", np.array([t == "True" for t in texts], dtype=np.bool_), None
+    if texts and all(_NUMBER_FULL.match(t) for t in texts):
+        if all(not any(c in t for c in ".eE") for t in texts):
+            return "int", np.array([int(t) for t in texts], dtype=np.int64), None
+        return "float", np.array([float(t) for t in texts], dtype=np.float64), None
+
+    first = next((t for t in texts if t), "")
+    fields = _leaf_names(parse_ue_text(first)) if first.startswith("(") else None
+    if fields:
+        # fast path: same numbers in the same order in every cell, keys are dropped
+        rows = [_NUMBER.findall(_KEY.sub("", t)) for t in texts]
+        if all(len(row) == len(fields) for row in rows):
+            return "numeric", np.array(rows, dtype=np.float64).reshape(len(texts), len(fields)), fields
+
+    values = [parse_ue_text(t) for t in texts]
+    if any(values) and all(v is None or (isinstance(v, str) and v.startswith("/")) for v in values):
+        return "object", [v if v else "" for v in values], None
+    if any(values) and all(v is None or (isinstance(v, tuple) and all(isinstance(p, tuple) and len(p) == 2 and isinstance(p[0], str) for p in v)) for v in values):
+        return "map", [dict(v) if v else {} for v in values], None
+    return "value", values, None
+
+
+class TableView:
+    # a DataTable parsed once, typed columns for vectorized queries
+    def __init__(self, row_names:[str], columns:dict):
+        self.row_names = row_names
+        self.rows = {name: i for i, name in enumerate(row_names)}
+        self.columns = columns  # column name: (kind, values, fields)
+        self.parse_seconds = 0.0
+
+    def __len__(self):
+        return len(self.row_names)
+
+    @staticmethod
+    def from_texts(row_names:[str], column_texts:dict):
+        t = time.time()
+        view = TableView(row_names, {name: parse_column(texts) for name, texts in column_texts.items()})
+        view.parse_seconds = time.time() - t
+        return view
+
+    def kind(self, column:str) -> str:
+        return self.columns[column][0]
+
+    def column(self, column:str):
+        return self.columns[column][1]
+
+    def field(self, column:str, field_name:str):
+        # one field of a "numeric" column, e.g. field("my_transform_var", "Translation.Z")
+        kind, values, fields = self.columns[column]
+        return values[:, fields.index(field_name)]
+
+    def get(self, row_name:str, column:str):
+        kind, values, fields = self.columns[column]
+        v = values[self.rows[row_name]]
+        if kind == "numeric":
+            return tuple(v.tolist())
+        return v.item() if bNumpy and isinstance(v, np.generic) else v
+
+    def select(self, mask) -> [str]:
+        # row names of a boolean mask
+        return [self.row_names[i] for i in np.nonzero(mask)[0]]
+
+
+def _package_file(package_name:str):
+    if not package_name.startswith("/Game/"):
+        return None
+    return os.path.join(unreal.SystemLibrary.get_project_content_directory(), package_name[len("/Game/"):] + ".uasset")
+
+
+def _is_package_dirty(package_name:str) -> bool:
+    return any(package.get_path_name() == package_name for package in unreal.EditorLoadingAndSavingUtils.get_dirty_content_packages())
+
+
+class TableViewCache:
+    # Saved packages: the view is reused while the file mtime is the same, without reading the table.
+    # Dirty packages: the flattened table is read and the view is reused if the text is the same.
+    def __init__(self):
+        self.views = {}  # package name: (state, view)
+        self.hits = 0
+        self.parses = 0
+
+    def _read_texts(self, data_table):
+        lib = unreal.PythonDataTableLib
+        flatten = lib.get_flatten_data_table(data_table, include_header=True)
+        column_names = lib.get_column_names(data_table, friendly_name=True)
+        row_names = lib.get_row_names(data_table)
+        offset = len(flatten[0]) - len(column_names) if flatten else 0  # the first column is the row name, if there is one
+        rows = flatten[1:] if flatten else []
+        column_texts = {name: [row[c + offset] for row in rows] for c, name in enumerate(column_names)}
+        return [str(name) for name in row_names], column_texts
+
+    def get(self, data_table) -> TableView:
+        package_name = data_table.get_outermost().get_path_name()
+        file_path = _package_file(package_name)
+        texts = None
+        if not _is_package_dirty(package_name) and file_path and os.path.exists(file_path):
+            state = ("saved", os.path.getmtime(file_path))
+        else:
+            texts = self._read_texts(data_table)
+            state = ("dirty", hashlib.sha1(repr(texts).encode("utf-8")).hexdigest())
+
+        cached = self.views.get(package_name)
+        if cached and cached[0] == state:
+            self.hits += 1
+            return cached[1]
+        view = TableView.from_texts(*(texts if texts else self._read_texts(data_table)))
+        self.views[package_name] = (state, view)
+        self.parses += 1
+        return view
+
+    def invalidate(self, data_table=None):
+        if data_table is None:
+            self.views.clear()
+        else:
+            self.views.pop(data_table.get_outermost().get_path_name(), None)
@@ -0,0 +1,130 @@
+import contextlib
+import json
+import math
+import os
+import platform
+import time
+
+
+def percentile(values, p:float) -> float:
+    # nearest rank
+    assert values, "percentile of empty values"
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class DelayCalibration:
+    # Record the real duration of each push_call step per machine, and learn the delay before the next step from it.
+    # A step ends at an explicit end marker: its push_result, or the results of the sliced/async tasks it started.
+    # The end of a step without any result can't be observed(engine work may go on in the later ticks), its learned
+    # delay never goes below the static one.
+    def __init__(self, file_path:str, machine=None, p=95, margin_ratio=0.2, margin_seconds=0.05
+                 , min_delay=0.02, max_delay=10.0, min_samples=3, max_samples=20, clock=time.perf_counter):
+        self.file_path = file_path
+        self.machine = machine if machine else platform.node()
+        self.p = p
+        self.margin_ratio = margin_ratio
+        self.margin_seconds = margin_seconds
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.clock = clock
+        self.steps = {}  # step key: [seconds], of this machine
+        self.unobserved = set()  # the step keys recorded without an end marker at least once
+        self.all_machines = {}
+        self.records = {}  # step key: {"begin", "end", "bObserved", "bReturned", "tasks"}, the steps not committed yet
+        self.running_key = None  # the step whose command is running
+        self.load()
+
+    def load(self):
+        self.all_machines = {}
+        if os.path.exists(self.file_path):
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                self.all_machines = json.load(f)
+        machine_data = self.all_machines.setdefault(self.machine, {})
+        self.steps = machine_data.setdefault("steps", {})
+        self.unobserved = set(machine_data.get("unobserved", []))
+
+    def save(self):
+        self.all_machines[self.machine]["unobserved"] = sorted(self.unobserved)
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            json.dump(self.all_machines, f, indent=1, sort_keys=True)
+
+    # recording
+    def begin(self, key:str):
+        self.records[key] = {"begin": self.clock(), "end": None, "bObserved": False, "bReturned": False, "tasks": 0}
+        self.running_key = key
+
+    def end_of_call(self, key:str):
+        if self.running_key == key:
+            self.running_key = None
+        record = self.records.get(key)
+        if record:
+            record["bReturned"] = True
+            record["end"] = self.clock()
+            self._commit_if_done(key)
+
+    def mark_result(self, key=None):
+        # the end marker of a step, the result of the running command when key is None
+        record = self.records.get(key if key else self.running_key)
+        if record:
+            record["end"] = self.clock()
+            record["bObserved"] = True
+
+    def start_task(self, key=None):
+        # a sliced/async task started by the step, the step ends after the task. return the key for end_task
+        key = key if key else self.running_key
+        if key in self.records:
+            self.records[key]["tasks"] += 1
+        return key
+
+    def end_task(self, key, bResult=True):
+        # bResult: the task pushed the result of the step
+        record = self.records.get(key)
+        if record:
+            record["tasks"] -= 1
+            record["end"] = self.clock()
+            record["bObserved"] |= bResult
+            self._commit_if_done(key)
+
+    @contextlib.contextmanager
+    def running(self, key):
+        # the results pushed in the block belong to the step "key", not to the step running at that time
+        previous, self.running_key = self.running_key, key
+        try:
+            yield
+        finally:
+            self.running_key = previous
+
+    def _commit_if_done(self, key:str):
+        record = self.records[key]
+        if not record["bReturned"] or record["tasks"] > 0:
+            return
+        del self.records[key]
+        samples = self.steps.setdefault(key, [])
+        samples.append(round(record["end"] - record["begin"], 4))
+        del samples[:-self.max_samples]
+        if not record["bObserved"]:
+            self.unobserved.add(key)
+
+    # calibrated
+    def stats(self, key:str):
+        samples = self.steps.get(key)
+        if not samples:
+            return None
+        return {"count": len(samples), "p50": percentile(samples, 50), "p95": percentile(samples, 95), "max": max(samples)
+                , "observed": key not in self.unobserved}
+
+    def delay_for(self, previous_key, static_delay:float) -> float:
+        # the delay before a step is decided by the duration of the previous step
+        samples = self.steps.get(previous_key) if previous_key else None
+        if not samples or len(samples) < self.min_samples:
+            return static_delay
+        learned = percentile(samples, self.p) * (1 + self.margin_ratio) + self.margin_seconds
+        learned = min(max(learned, self.min_delay), self.max_delay)
+        if previous_key in self.unobserved:
+            learned = max(learned, static_delay)
+        return learned
@@ -0,0 +1,199 @@
+import base64
+import json
+import os
+import time
+from array import array
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # the graph itself works without the editor
+
+
+class DependencyGraph:
+    # Package dependencies with integer ids. Edges are kept in csr arrays: deps of node n are
+    # targets[offsets[n]: offsets[n+1]]. Changes after the last compact() are kept in overlay until the next compact().
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.overlay = {}  # node id: array of dep ids
+        self.swept = set()  # ids of the packages whose deps are known, the others are leaves out of the folders
+        self._reverse = None  # (offsets, targets), built when needed
+
+    def __len__(self):
+        return len(self.names)
+
+    def edge_count(self):
+        return sum(len(self._direct(n)) for n in range(len(self.names)))
+
+    def node_id(self, name:str, create=False) -> int:
+        node = self.ids.get(name, -1)
+        if node < 0 and create:
+            node = len(self.names)
+            self.names.append(name)
+            self.ids[name] = node
+        return node
+
+    def _direct(self, node:int):
+        if node in self.overlay:
+            return self.overlay[node]
+        if node + 1 < len(self.offsets):
+            return self.targets[self.offsets[node]: self.offsets[node + 1]]
+        return array("i")
+
+    # updates
+    def set_deps(self, name:str, dep_names:[str], swept=True):
+        node = self.node_id(name, create=True)
+        self.overlay[node] = array("i", sorted({self.node_id(dep, create=True) for dep in dep_names if dep != name}))
+        if swept:
+            self.swept.add(node)
+        self._reverse = None
+
+    def remove(self, name:str):
+        # the id is kept, the node has no edges any more and the edges to it are removed
+        node = self.node_id(name)
+        if node < 0:
+            return
+        for ref in self._neighbors(node, reverse=True):
+            self.overlay[ref] = array("i", (d for d in self._direct(ref) if d != node))
+        self.overlay[node] = array("i")
+        self.swept.discard(node)
+        self._reverse = None
+
+    def compact(self):
+        offsets, targets = array("i", [0]), array("i")
+        for node in range(len(self.names)):
+            targets.extend(self._direct(node))
+            offsets.append(len(targets))
+        self.offsets, self.targets = offsets, targets
+        self.overlay = {}
+        self._reverse = None
+        return self
+
+    # queries
+    def _build_reverse(self):
+        count = len(self.names)
+        in_degree = array("i", bytes(4 * (count + 1)))
+        for node in range(count):
+            for dep in self._direct(node):
+                in_degree[dep + 1] += 1
+        for i in range(count):
+            in_degree[i + 1] += in_degree[i]
+        offsets = array("i", in_degree)
+        fill = array("i", in_degree[:count])
+        targets = array("i", bytes(4 * offsets[count]))
+        for node in range(count):
+            for dep in self._direct(node):
+                targets[fill[dep]] = node
+                fill[dep] += 1
+        self._reverse = (offsets, targets)
+
+    def _neighbors(self, node:int, reverse=False):
+        if not reverse:
+            return self._direct(node)
+        if self._reverse is None:
+            self._build_reverse()
+        offsets, targets = self._reverse
+        return targets[offsets[node]: offsets[node + 1]] if node + 1 < len(offsets) else array("i")
+
+    def closure_ids(self, start_ids, reverse=False, max_depth=-1):
+        # breadth first, the start nodes are not in the result
+        visited = bytearray(len(self.names))
+        frontier = [node for node in start_ids if node >= 0]
+        for node in frontier:
+            visited[node] = 1
+        result = []
+        depth = 0
+        while frontier and depth != max_depth:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self._neighbors(node, reverse):
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        next_frontier.append(neighbor)
+            result.extend(next_frontier)
+            frontier = next_frontier
+            depth += 1
+        return result
+
+    def deps(self, names, recursive=True) -> [str]:
+        names = [names] if isinstance(names, str) else names
+        ids = self.closure_ids([self.node_id(n) for n in names], reverse=False, max_depth=-1 if recursive else 1)
+        return [self.names[i] for i in ids]
+
+    def refs(self, names, recursive=True) -> [str]:
+        names = [names] if isinstance(names, str) else names
+        ids = self.closure_ids([self.node_id(n) for n in names], reverse=True, max_depth=-1 if recursive else 1)
+        return [self.names[i] for i in ids]
+
+    def unreferenced(self, prefix="") -> [str]:
+        # swept packages which no one refers to, maps are roots and usually in this list
+        if self._reverse is None:
+            self._build_reverse()
+        offsets = self._reverse[0]
+        return sorted(self.names[n] for n in self.swept
+                      if offsets[n + 1] == offsets[n] and self.names[n].startswith(prefix))
+
+    def unused(self, root_names:[str], prefix="") -> [str]:
+        # swept packages which can't be reached from the roots(maps, game modes, primary assets...)
+        root_ids = [self.node_id(n) for n in root_names]
+        reachable = set(self.closure_ids(root_ids))
+        reachable.update(root_ids)
+        return sorted(self.names[n] for n in self.swept if n not in reachable and self.names[n].startswith(prefix))
+
+    # warm start
+    def save(self, file_path:str):
+        self.compact()
+        data = {"version": 1
+              , "names": self.names
+              , "swept": sorted(self.swept)
+              , "offsets": base64.b64encode(self.offsets.tobytes()).decode("ascii")
+              , "targets": base64.b64encode(self.targets.tobytes()).decode("ascii")}
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return file_path
+
+    @staticmethod
+    def load(file_path:str):
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        assert data.get("version") == 1, f"Unknown dependency graph version: {data.get('version')}"
+        graph = DependencyGraph()
+        graph.names = data["names"]
+        graph.ids = {name: i for i, name in enumerate(graph.names)}
+        graph.swept = set(data["swept"])
+        graph.offsets = array("i")
+        graph.offsets.frombytes(base64.b64decode(data["offsets"]))
+        graph.targets = array("i")
+        graph.targets.frombytes(base64.b64decode(data["targets"]))
+        return graph
+
+
+def _direct_deps(package_name:str) -> [str]:
+    deps, _ = unreal.PythonBPLib.get_all_deps(package_name, recursive=False)
+    return [dep for dep in deps if not dep.startswith("/Script/")]
+
+
+def build_from_registry(folders:[str], graph=None) -> DependencyGraph:
+    # one sweep: direct deps of each package in the folders, the closures are computed in memory
+    t = time.time()
+    graph = graph if graph else DependencyGraph()
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    packages = sorted({str(asset_data.package_name) for folder in folders
+                       for asset_data in registry.get_assets_by_path(folder, recursive=True)})
+    for package_name in packages:
+        graph.set_deps(package_name, _direct_deps(package_name))
+    graph.compact()
+    print(f"DependencyGraph: {len(packages)} packages, {len(graph)} nodes, {graph.edge_count()} edges in {time.time() - t:.2f}s")
+    return graph
+
+
+def update_package(graph:DependencyGraph, package_name:str):
+    # call after the package is saved, renamed(remove the old one) or created
+    if unreal.EditorAssetLibrary.does_asset_exist(package_name):
+        graph.set_deps(package_name, _direct_deps(package_name))
+    else:
+        graph.remove(package_name)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # FixtureCache works with a stub registry outside the editor
+
+
+HASH_TAG = "TAPythonFixtureHash"
+
+
+def spec_hash(spec) -> str:
+    # same spec, same hash: keys sorted, no spaces
+    text = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EditorAssetRegistry:
+    # the editor side of FixtureCache, the hash is kept in the metadata of the asset. snapshot: AssetSnapshot, told about
+    # the deleted assets
+    def __init__(self, snapshot=None):
+        self.snapshot = snapshot
+
+    def exists(self, asset_path:str) -> bool:
+        return unreal.EditorAssetLibrary.does_asset_exist(asset_path)
+
+    def load(self, asset_path:str):
+        return unreal.load_asset(asset_path)
+
+    def get_tag(self, asset, tag:str) -> str:
+        return unreal.EditorAssetLibrary.get_metadata_tag(asset, tag)
+
+    def set_tag(self, asset, tag:str, value:str):
+        unreal.EditorAssetLibrary.set_metadata_tag(asset, tag, value)
+
+    def save(self, asset_path:str):
+        unreal.EditorAssetLibrary.save_asset(asset_path, only_if_is_dirty=False)
+
+    def delete(self, asset_path:str):
+        asset = unreal.load_asset(asset_path)
+        if asset:
+            unreal.get_editor_subsystem(unreal.AssetEditorSubsystem).close_all_editors_for_asset(asset)
+        unreal.PythonBPLib.delete_asset(asset_path, show_confirmation=False)
+        if self.snapshot:
+            self.snapshot.on_asset_removed(asset_path)
+
+
+class MemoryAssetRegistry:
+    # a stub registry for the cache logic, assets are dicts and the tags are kept beside them
+    def __init__(self):
+        self.assets = {}
+        self.tags = {}
+        self.saved = []
+        self.deleted = []
+
+    def add(self, asset_path:str, asset):
+        self.assets[asset_path] = asset
+        self.tags[asset_path] = {}
+        return asset
+
+    def _path_of(self, asset):
+        return next(path for path, v in self.assets.items() if v is asset)
+
+    def exists(self, asset_path:str) -> bool:
+        return asset_path in self.assets
+
+    def load(self, asset_path:str):
+        return self.assets.get(asset_path)
+
+    def get_tag(self, asset, tag:str) -> str:
+        return self.tags[self._path_of(asset)].get(tag, "")
+
+    def set_tag(self, asset, tag:str, value:str):
+        self.tags[self._path_of(asset)][tag] = value
+
+    def save(self, asset_path:str):
+        self.saved.append(asset_path)
+
+    def delete(self, asset_path:str):
+        self.assets.pop(asset_path, None)
+        self.tags.pop(asset_path, None)
+        self.deleted.append(asset_path)
+
+
+class FixtureCache:
+    # Reuse a generated asset if the hash of its builder spec matches, otherwise delete it and build again.
+    def __init__(self, registry=None):
+        self.registry = registry if registry else EditorAssetRegistry()
+        self.hit_count = 0
+        self.build_count = 0
+
+    def is_valid(self, asset_path:str, spec) -> bool:
+        if not self.registry.exists(asset_path):
+            return False
+        asset = self.registry.load(asset_path)
+        return bool(asset) and self.registry.get_tag(asset, HASH_TAG) == spec_hash(spec)
+
+    def get_or_build(self, asset_path:str, spec, builder):
+        # builder(asset_path, spec) creates the asset from the spec only, so the hash covers every input of the build.
+        # Return: asset, bBuilt
+        if self.is_valid(asset_path, spec):
+            self.hit_count += 1
+            return self.registry.load(asset_path), False
+
+        if self.registry.exists(asset_path):
+            self.registry.delete(asset_path)
+        asset = builder(asset_path, spec)
+        assert asset, f"fixture builder returns None: {asset_path}"
+        self.registry.set_tag(asset, HASH_TAG, spec_hash(spec))
+        self.registry.save(asset_path)
+        self.build_count += 1
+        return asset, True
+
+    def invalidate(self, asset_path:str):
+        if self.registry.exists(asset_path):
+            asset = self.registry.load(asset_path)
+            self.registry.set_tag(asset, HASH_TAG, "")
+            self.registry.save(asset_path)
@@ -0,0 +1,82 @@
+import time
+
+import unreal
+
+
+class TimeSlicedTask:
+    # Run a generator across editor ticks, each tick resumes it until budget_ms is used up.
+    def __init__(self, work_units, budget_ms=8.0, on_finished=None):
+        self.work_units = iter(work_units)
+        self.budget_ms = budget_ms
+        self.on_finished = on_finished
+        self.tick_handle = None
+        self.unit_count = 0
+        self.tick_count = 0
+        self.unit_seconds = []
+        self.seconds = 0.0
+        self.result = None  # return value of the generator
+        self.error = None
+        self.bFinished = False
+
+    def start(self):
+        assert self.tick_handle is None, "task already started"
+        self.tick_handle = unreal.register_slate_post_tick_callback(self._tick)
+        return self
+
+    def _tick(self, delta_seconds):
+        self.tick_count += 1
+        t_begin = time.perf_counter()
+        t_unit = t_begin
+        try:
+            while True:  # one unit at least in each tick
+                next(self.work_units)
+                t = time.perf_counter()
+                self.unit_seconds.append(t - t_unit)
+                self.unit_count += 1
+                t_unit = t
+                if (t - t_begin) * 1000 >= self.budget_ms:
+                    break
+            self.seconds += time.perf_counter() - t_begin
+        except StopIteration as e:
+            self.seconds += time.perf_counter() - t_begin
+            self.result = e.value
+            self._finish()
+        except Exception as e:
+            self.seconds += time.perf_counter() - t_begin
+            self.error = e
+            unreal.log_error(f"TimeSlicedTask failed: {e}")
+            self._finish()
+
+    def _finish(self):
+        if self.tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+        self.bFinished = True
+        if self.on_finished:
+            self.on_finished(self)
+
+    def cancel(self, reason="cancelled"):
+        # stop without on_finished
+        if self.bFinished:
+            return
+        if self.tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+        self.error = RuntimeError(reason)
+        self.bFinished = True
+
+    def report(self):
+        unit_ms = [v * 1000 for v in self.unit_seconds]
+        result = {"units": self.unit_count
+                , "ticks": self.tick_count
+                , "seconds": self.seconds
+                , "max_unit_ms": max(unit_ms) if unit_ms else 0.0
+                , "mean_unit_ms": sum(unit_ms) / len(unit_ms) if unit_ms else 0.0
+                , "over_budget_units": sum(1 for v in unit_ms if v > self.budget_ms)}
+        print(f"TimeSlicedTask: {self.unit_count} units in {self.tick_count} ticks, {self.seconds:.3f}s"
+              f", unit max: {result['max_unit_ms']:.2f}ms, mean: {result['mean_unit_ms']:.2f}ms")
+        return result
+
+
+def run_time_sliced(work_units, budget_ms=8.0, on_finished=None) -> TimeSlicedTask:
+    return TimeSlicedTask(work_units, budget_ms, on_finished).start()
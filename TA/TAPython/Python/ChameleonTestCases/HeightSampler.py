@@ -0,0 +1,113 @@
+import math
+import os
+import time
+
+import unreal
+
+from .FrameBudget import run_time_sliced
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Tiled height sampler disabled")
+    bNumpy = False
+
+
+class TiledHeightSampler:
+    # Split a large area into tiles of sample_heights, one tile per work unit, and fill a preallocated height grid.
+    def __init__(self, world, center, width:float, height:float, grid_size:float, tile_samples=64, trace_depth=10_00
+                 , profile_name="BlockAll", default_height=0.0):
+        assert bNumpy, "Need 3rd package: numpy"
+        self.world = world
+        self.center = [center.x, center.y, center.z] if isinstance(center, unreal.Vector) else list(center)
+        self.grid_size = grid_size
+        self.tile_world_size = tile_samples * grid_size
+        self.tiles_x = max(1, math.ceil(width / self.tile_world_size))
+        self.tiles_y = max(1, math.ceil(height / self.tile_world_size))
+        self.area_min = [self.center[0] - width / 2, self.center[1] - height / 2]
+        self.trace_depth = trace_depth
+        self.profile_name = profile_name
+        self.default_height = default_height
+
+        self.x_count = int(math.floor(width / grid_size)) + 1
+        self.y_count = int(math.floor(height / grid_size)) + 1
+        self.heights = np.full((self.y_count, self.x_count), np.nan, dtype=np.float32)
+        self.sample_origin = None
+        self.tile_count = 0
+        self.sample_count = 0
+        self.trace_seconds = 0.0
+
+    def total_tiles(self):
+        return self.tiles_x * self.tiles_y
+
+    def sample_tile(self, tx:int, ty:int):
+        tile_center = unreal.Vector(self.area_min[0] + (tx + 0.5) * self.tile_world_size
+                                    , self.area_min[1] + (ty + 0.5) * self.tile_world_size
+                                    , self.center[2])
+        t = time.perf_counter()
+        x_count, y_count, hit_locs = unreal.PythonBPLib.sample_heights(self.world, tile_center, self.tile_world_size, self.tile_world_size
+                                                                     , self.grid_size, self.trace_depth, self.profile_name
+                                                                     , unreal.DrawDebugTrace.NONE, 0, self.default_height)
+        self.trace_seconds += time.perf_counter() - t
+        if self.sample_origin is None:
+            # the samples are centered in the tile: on the tile edges with tile_samples + 1 samples, in the cell centers
+            # with tile_samples. From the counts, not from the hits, which may miss in the first row or column
+            self.sample_origin = np.array([self.area_min[0] + (self.tile_world_size - (x_count - 1) * self.grid_size) / 2
+                                           , self.area_min[1] + (self.tile_world_size - (y_count - 1) * self.grid_size) / 2])
+        if not hit_locs:
+            return
+        locs = np.array([[loc.x, loc.y, loc.z] for loc in hit_locs], dtype=np.float64)
+        # place each sample by its own location, the seam samples shared by neighbour tiles overwrite the same cells
+        ixy = np.rint((locs[:, :2] - self.sample_origin) / self.grid_size).astype(np.int64)
+        inside = (ixy[:, 0] >= 0) & (ixy[:, 0] < self.x_count) & (ixy[:, 1] >= 0) & (ixy[:, 1] < self.y_count)
+        self.heights[ixy[inside, 1], ixy[inside, 0]] = locs[inside, 2]
+        self.sample_count += int(np.count_nonzero(inside))
+
+    def iter_tiles(self, on_progress=None):
+        total = self.total_tiles()
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                self.sample_tile(tx, ty)
+                self.tile_count += 1
+                if on_progress:
+                    on_progress(self.tile_count, total)
+                yield self.tile_count
+
+    def sample(self, on_progress=None):
+        for _ in self.iter_tiles(on_progress):
+            pass
+        return self.report()
+
+    def sample_time_sliced(self, budget_ms=8.0, on_progress=None, on_finished=None):
+        def _on_finished(task):
+            if on_finished:
+                on_finished(self.report(), task.error)
+        return run_time_sliced(self.iter_tiles(on_progress), budget_ms=budget_ms, on_finished=_on_finished)
+
+    def report(self):
+        filled = int(np.count_nonzero(~np.isnan(self.heights)))
+        result = {"tiles": self.tile_count
+                , "grid_shape": self.heights.shape
+                , "samples": self.sample_count
+                , "filled_cells": filled
+                , "trace_seconds": self.trace_seconds
+                , "min_height": float(np.nanmin(self.heights)) if filled else self.default_height
+                , "max_height": float(np.nanmax(self.heights)) if filled else self.default_height
+                  }
+        print(f"TiledHeightSampler: {self.tile_count} tiles, {filled} / {self.heights.size} cells, trace: {self.trace_seconds:.2f}s")
+        return result
+
+
+def heights_to_uint16(heights, z_scale=100.0, z_offset=0.0):
+    # same mapping with landscape: height 32768 is z 0, 128 height units per 1 z_scale
+    assert bNumpy, "Need 3rd package: numpy"
+    values = np.nan_to_num(heights, nan=z_offset)
+    return np.clip(np.rint((values - z_offset) / z_scale * 128 + 32768), 0, 65535).astype(np.uint16)
+
+
+def export_heightmap_r16(file_path:str, heights, z_scale=100.0, z_offset=0.0):
+    # little endian 16bit raw, can be read back with LandscapeTiles.RawHeightmap
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    heights_to_uint16(heights, z_scale, z_offset).astype("<u2").tofile(file_path)
+    return file_path
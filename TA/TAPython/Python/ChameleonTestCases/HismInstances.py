@@ -0,0 +1,183 @@
+import math
+import time
+
+import unreal
+
+from .FrameBudget import run_time_sliced
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Bulk instance builder disabled")
+    bNumpy = False
+
+
+class InstanceArrays:
+    # locations, rotations(roll, pitch, yaw in degree) and scales, all in shape (n, 3)
+    def __init__(self, locations, rotations=None, scales=None):
+        assert bNumpy, "Need 3rd package: numpy"
+        self.locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+        count = len(self.locations)
+        self.rotations = np.zeros((count, 3)) if rotations is None else np.asarray(rotations, dtype=np.float64).reshape(-1, 3)
+        self.scales = np.ones((count, 3)) if scales is None else np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+        assert len(self.rotations) == count and len(self.scales) == count, "locations, rotations and scales count not match"
+
+    def __len__(self):
+        return len(self.locations)
+
+    def to_transforms(self, start:int, stop:int) -> [unreal.Transform]:
+        # only one chunk of unreal.Transform exists at the same time
+        return [unreal.Transform(location=loc, rotation=rot, scale=scale)
+                for loc, rot, scale in zip(self.locations[start:stop].tolist()
+                                           , self.rotations[start:stop].tolist()
+                                           , self.scales[start:stop].tolist())]
+
+
+def grid_instances(count_x:int, count_y:int, spacing:float, z=0.0) -> InstanceArrays:
+    assert bNumpy, "Need 3rd package: numpy"
+    ys, xs = np.mgrid[0:count_y, 0:count_x]
+    locations = np.stack([xs.ravel() * spacing, ys.ravel() * spacing, np.full(count_x * count_y, z)], axis=1)
+    return InstanceArrays(locations)
+
+
+def random_instances(count:int, bounds_min, bounds_max, scale_range=(1.0, 1.0), random_yaw=True, seed=0) -> InstanceArrays:
+    assert bNumpy, "Need 3rd package: numpy"
+    rng = np.random.default_rng(seed)
+    locations = rng.uniform(bounds_min, bounds_max, size=(count, 3))
+    rotations = np.zeros((count, 3))
+    if random_yaw:
+        rotations[:, 2] = rng.uniform(0, 360, size=count)
+    scales = np.repeat(rng.uniform(scale_range[0], scale_range[1], size=(count, 1)), 3, axis=1)
+    return InstanceArrays(locations, rotations, scales)
+
+
+class BulkInstanceBuilder:
+    def __init__(self, hism_comp, chunk_size=10000):
+        self.hism_comp = hism_comp
+        self.chunk_size = chunk_size
+        self.added_count = 0
+        self.seconds = 0.0
+
+    def instances_per_second(self):
+        return self.added_count / self.seconds if self.seconds > 0 else 0.0
+
+    def iter_add(self, instances:InstanceArrays):
+        for start in range(0, len(instances), self.chunk_size):
+            t = time.perf_counter()
+            stop = min(start + self.chunk_size, len(instances))
+            self.hism_comp.add_instances(instances.to_transforms(start, stop), should_return_indices=False)
+            self.added_count += stop - start
+            self.seconds += time.perf_counter() - t
+            yield stop
+
+    def add(self, instances:InstanceArrays):
+        for _ in self.iter_add(instances):
+            pass
+        return self.report()
+
+    def add_time_sliced(self, instances:InstanceArrays, budget_ms=8.0, on_finished=None):
+        # one chunk at least per tick, use a small chunk_size for a smooth editor
+        def _on_finished(task):
+            if on_finished:
+                on_finished(self.report())
+        return run_time_sliced(self.iter_add(instances), budget_ms=budget_ms, on_finished=_on_finished)
+
+    def report(self):
+        result = {"instances": self.added_count
+                , "seconds": self.seconds
+                , "instances_per_sec": self.instances_per_second()}
+        print(f"BulkInstanceBuilder: {self.added_count} instances in {self.seconds:.3f}s, {result['instances_per_sec']:.0f} instances/sec")
+        return result
+
+
+def rotation_matrices(rotations):
+    # (roll, pitch, yaw) in degree -> (n, 3, 3), same as FRotationMatrix: row vectors, world = local @ m
+    roll, pitch, yaw = np.radians(np.asarray(rotations, dtype=np.float64).reshape(-1, 3)).T
+    sr, cr, sp, cp, sy, cy = np.sin(roll), np.cos(roll), np.sin(pitch), np.cos(pitch), np.sin(yaw), np.cos(yaw)
+    m = np.empty((len(roll), 3, 3))
+    m[:, 0] = np.stack([cp * cy, cp * sy, sp], axis=1)
+    m[:, 1] = np.stack([sr * sp * cy - cr * sy, sr * sp * sy + cr * cy, -sr * cp], axis=1)
+    m[:, 2] = np.stack([-(cr * sp * cy + sr * sy), cy * sr - cr * sp * sy, cr * cp], axis=1)
+    return m
+
+
+class InstanceGridIndex:
+    # Uniform grid on xy over the instance origins. Overlap rules are the same with get_overlapping_box_count(the mesh
+    # bounds box transformed by the scale, rotation and location of each instance, as an axis aligned box) and
+    # get_overlapping_sphere_count(the mesh bounds sphere, radius * max scale).
+    # Queries are in world space, component_location is the world location of an unrotated, unscaled hism component.
+    def __init__(self, instances:InstanceArrays, bounds_extent=(0, 0, 0), bounds_radius=0.0, cell_size=None
+                 , component_location=(0, 0, 0), bounds_origin=(0, 0, 0)):
+        assert bNumpy, "Need 3rd package: numpy"
+        self.locations = instances.locations
+        self.component_location = np.asarray(component_location, dtype=np.float64)
+        matrices = rotation_matrices(instances.rotations) * instances.scales[:, :, None]  # scale then rotate
+        bounds_origin = np.asarray(bounds_origin, dtype=np.float64)
+        self.centers = self.locations + np.einsum("j,njk->nk", bounds_origin, matrices)
+        self.extents = np.einsum("j,njk->nk", np.asarray(bounds_extent, dtype=np.float64), np.abs(matrices))
+        self.radii = bounds_radius * np.abs(instances.scales).max(axis=1) if len(instances) else np.zeros(0)
+        # how far a box or sphere of an instance reaches from its origin on xy
+        offsets = np.abs(self.centers - self.locations)[:, :2]
+        self.max_reach = float(max((offsets + self.extents[:, :2]).max(), (offsets.max(axis=1) + self.radii).max())) if len(instances) else 0.0
+
+        count = len(self.locations)
+        xy = self.locations[:, :2]
+        self.origin = xy.min(axis=0) if count else np.zeros(2)
+        span = (xy.max(axis=0) - self.origin) if count else np.ones(2)
+        if cell_size is None:
+            # about 4 instances per cell
+            cell_size = max(math.sqrt(max(span[0], 1.0) * max(span[1], 1.0) * 4 / max(count, 1)), 1.0)
+        self.cell_size = float(cell_size)
+        self.nx, self.ny = (np.floor(span / self.cell_size).astype(np.int64) + 1).tolist()
+
+        cells = self._cell_xy(xy)
+        keys = cells[:, 1] * self.nx + cells[:, 0]
+        self.order = np.argsort(keys, kind="stable")
+        # cell_start[k]: the first position in order of cell k, csr layout
+        self.cell_start = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.nx * self.ny), out=self.cell_start[1:])
+
+    def _cell_xy(self, xy):
+        cells = np.floor((np.asarray(xy) - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, [self.nx - 1, self.ny - 1])
+
+    def _candidates(self, lo_xy, hi_xy):
+        if np.any(np.asarray(hi_xy) < self.origin) or not len(self.order):
+            return self.order[:0]
+        (ix0, iy0), (ix1, iy1) = self._cell_xy(lo_xy).tolist(), self._cell_xy(hi_xy).tolist()
+        # cells from ix0 to ix1 in one row are contiguous in order
+        parts = [self.order[self.cell_start[iy * self.nx + ix0]: self.cell_start[iy * self.nx + ix1 + 1]] for iy in range(iy0, iy1 + 1)]
+        return np.concatenate(parts) if parts else self.order[:0]
+
+    def query_box(self, box_min, box_max):
+        box_min = np.asarray(box_min, dtype=np.float64) - self.component_location
+        box_max = np.asarray(box_max, dtype=np.float64) - self.component_location
+        candidates = self._candidates(box_min[:2] - self.max_reach, box_max[:2] + self.max_reach)
+        centers, extents = self.centers[candidates], self.extents[candidates]
+        mask = np.all((centers - extents <= box_max) & (centers + extents >= box_min), axis=1)
+        return np.sort(candidates[mask])
+
+    def query_sphere(self, center, radius:float):
+        center = np.asarray(center, dtype=np.float64) - self.component_location
+        reach = radius + self.max_reach
+        candidates = self._candidates(center[:2] - reach, center[:2] + reach)
+        delta = self.centers[candidates] - center
+        mask = np.einsum("ij,ij->i", delta, delta) <= (radius + self.radii[candidates]) ** 2
+        return np.sort(candidates[mask])
+
+    def count_boxes(self, box_mins, box_maxs):
+        box_mins, box_maxs = np.asarray(box_mins).reshape(-1, 3), np.asarray(box_maxs).reshape(-1, 3)
+        return np.array([len(self.query_box(lo, hi)) for lo, hi in zip(box_mins, box_maxs)], dtype=np.int64)
+
+    def count_spheres(self, centers, radii):
+        centers = np.asarray(centers).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+        return np.array([len(self.query_sphere(c, r)) for c, r in zip(centers, radii)], dtype=np.int64)
+
+
+def count_in_box(instances:InstanceArrays, box_min, box_max, bounds_extent=(0, 0, 0), component_location=(0, 0, 0)
+                 , bounds_origin=(0, 0, 0)) -> int:
+    # a single get_overlapping_box_count query, with the same rule of the grid index
+    index = InstanceGridIndex(instances, bounds_extent=bounds_extent, component_location=component_location, bounds_origin=bounds_origin)
+    return len(index.query_box(box_min, box_max))
@@ -0,0 +1,165 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import unreal
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Tiled heightmap writer disabled")
+    bNumpy = False
+
+
+HEIGHT_MAX = 65535
+
+
+class RawHeightmap:
+    # 16bit raw heightmap(.r16) on disk, only the windows of the tiles will be paged in.
+    def __init__(self, file_path:str, width:int, height:int, dtype="<u2"):
+        self.file_path = file_path
+        self.width = width
+        self.height = height
+        self.data = np.memmap(file_path, dtype=dtype, mode="r", shape=(height, width))
+
+    def iter_tile_windows(self, tile_w:int, tile_h:int, tiles_x:int, tiles_y:int):
+        for ty in range(tiles_y):
+            y0 = ty * (tile_h - 1)  # neighbour proxies share one edge
+            for tx in range(tiles_x):
+                x0 = tx * (tile_w - 1)
+                yield tx, ty, self.data[y0: y0 + tile_h, x0: x0 + tile_w]
+
+
+class HeightRows:
+    # rows from a generator, at most one band of tile_h rows is kept in memory
+    def __init__(self, rows, width:int, height:int):
+        self.rows = iter(rows)
+        self.width = width
+        self.height = height
+
+    def _read_band(self, band, start_row:int, row_count:int):
+        for i in range(start_row, row_count):
+            row = next(self.rows, None)
+            assert row is not None, f"HeightRows ended before row: {i}"
+            band[i] = row
+
+    def iter_tile_windows(self, tile_w:int, tile_h:int, tiles_x:int, tiles_y:int):
+        band = np.empty((tile_h, self.width), dtype=np.float64)
+        self._read_band(band, 0, tile_h)
+        for ty in range(tiles_y):
+            if ty > 0:
+                # the last row of previous band is the seam row of this band
+                seam = band[-1].copy()
+                band = np.empty((tile_h, self.width), dtype=np.float64)
+                band[0] = seam
+                self._read_band(band, 1, tile_h)
+            for tx in range(tiles_x):
+                x0 = tx * (tile_w - 1)
+                yield tx, ty, band[:, x0: x0 + tile_w]
+
+
+def rows_from_function(func, width:int, height:int, x_offset=0, y_offset=0):
+    # func(xs: ndarray, y: int) -> ndarray of heights, in range [0, 65535]
+    xs = np.arange(width, dtype=np.float64) + x_offset
+    for y in range(height):
+        yield func(xs, y + y_offset)
+
+
+def write_raw_heightmap(file_path:str, rows, width:int, height:int) -> RawHeightmap:
+    # rows to a 16bit raw heightmap(.r16) one by one, then paged back in tiles by RawHeightmap
+    assert bNumpy, "Need 3rd package: numpy"
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    count = 0
+    with open(file_path, "wb") as f:
+        for row in rows:
+            assert count < height, f"more rows than height: {height}"
+            assert len(row) == width, f"row {count} width: {len(row)} != {width}"
+            np.clip(np.rint(row), 0, HEIGHT_MAX).astype("<u2").tofile(f)
+            count += 1
+    assert count == height, f"rows count: {count} != {height}"
+    return RawHeightmap(file_path, width, height)
+
+
+def read_back_tiles(proxies, tile_w:int, tile_h:int, tiles_x:int, tiles_y:int) -> dict:
+    # get_heightmap_data of each proxy -> {(tx, ty): (tile_h, tile_w) uint16}. The proxies with the same guid may
+    # return the heightmap of the whole landscape, then the window of the proxy is taken
+    world_w, world_h = tiles_x * (tile_w - 1) + 1, tiles_y * (tile_h - 1) + 1
+    tiles = {}
+    for ty in range(tiles_y):
+        for tx in range(tiles_x):
+            data = np.asarray(unreal.PythonLandscapeLib.get_heightmap_data(proxies[tx + ty * tiles_x]), dtype=np.uint16)
+            if data.size == world_w * world_h:
+                y0, x0 = ty * (tile_h - 1), tx * (tile_w - 1)
+                data = data.reshape(world_h, world_w)[y0: y0 + tile_h, x0: x0 + tile_w]
+            assert data.size == tile_w * tile_h, f"heightmap of proxy ({tx}, {ty}): {data.size} != {tile_w} * {tile_h}"
+            tiles[(tx, ty)] = data.reshape(tile_h, tile_w)
+    return tiles
+
+
+def seam_mismatches(tiles:dict, tiles_x:int, tiles_y:int) -> [str]:
+    # the last column/row of a tile is the first column/row of its right/bottom neighbour
+    errors = []
+    for (tx, ty), tile in tiles.items():
+        if tx + 1 < tiles_x and not np.array_equal(tile[:, -1], tiles[(tx + 1, ty)][:, 0]):
+            errors.append(f"seam column between ({tx}, {ty}) and ({tx + 1}, {ty})")
+        if ty + 1 < tiles_y and not np.array_equal(tile[-1, :], tiles[(tx, ty + 1)][0, :]):
+            errors.append(f"seam row between ({tx}, {ty}) and ({tx}, {ty + 1})")
+    return errors
+
+
+def _prepare_tile(window, tile_w:int, tile_h:int):
+    assert window.shape == (tile_h, tile_w), f"tile window shape: {window.shape} != {(tile_h, tile_w)}"
+    tile = np.clip(np.rint(window), 0, HEIGHT_MAX).astype(np.uint16)
+    return tile.ravel().tolist()
+
+
+def write_heightmap_tiles(proxies, source, section_size:int, sections_per_component:int, component_count_x:int
+                          , component_count_y:int, tiles_x:int, tiles_y:int, max_workers=2):
+    assert bNumpy, "Need 3rd package: numpy"
+    assert len(proxies) == tiles_x * tiles_y, f"proxies count: {len(proxies)} != {tiles_x} * {tiles_y}"
+
+    tile_w, tile_h = unreal.PythonLandscapeLib.cal_landscape_size(section_size
+                                                               , sections_per_component=sections_per_component
+                                                               , component_count_x=component_count_x
+                                                               , component_count_y=component_count_y)
+    need_w = tiles_x * (tile_w - 1) + 1
+    need_h = tiles_y * (tile_h - 1) + 1
+    assert source.width >= need_w and source.height >= need_h\
+        , f"heightmap size: {source.width}x{source.height} < {need_w}x{need_h}"
+
+    submit_seconds, apply_seconds = 0.0, 0.0
+    t_begin = time.time()
+    # at most max_workers + 1 prepared tiles wait in the queue, so the memory is bounded by tile size.
+    max_in_flight = max_workers + 1
+    pending = deque()
+
+    def apply_oldest():
+        nonlocal apply_seconds
+        proxy_index, future = pending.popleft()
+        height_data = future.result()
+        t = time.time()
+        unreal.PythonLandscapeLib.set_heightmap_data(proxies[proxy_index], height_data=height_data)
+        apply_seconds += time.time() - t
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for tx, ty, window in source.iter_tile_windows(tile_w, tile_h, tiles_x, tiles_y):
+            t = time.time()
+            pending.append((tx + ty * tiles_x, pool.submit(_prepare_tile, window, tile_w, tile_h)))
+            submit_seconds += time.time() - t
+            while len(pending) >= max_in_flight:
+                apply_oldest()
+        while pending:
+            apply_oldest()
+
+    result = {"tiles": tiles_x * tiles_y
+            , "tile_size": (tile_w, tile_h)
+            , "total_seconds": time.time() - t_begin
+            , "apply_seconds": apply_seconds
+            , "submit_seconds": submit_seconds
+            , "peak_tile_bytes": max_in_flight * tile_w * tile_h * 2
+              }
+    print(f"write_heightmap_tiles: {result['tiles']} tiles of {tile_w}x{tile_h} in {result['total_seconds']:.2f}s"
+          f", set_heightmap_data: {apply_seconds:.2f}s")
+    return result
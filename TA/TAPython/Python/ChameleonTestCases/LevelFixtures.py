@@ -0,0 +1,87 @@
+import json
+import time
+
+import unreal
+
+
+BASELINE_TAG = "TAPythonLevelBaseline"
+DEFAULT_TEMPLATE = "/Engine/Maps/Templates/Template_Default.Template_Default"
+SAFE_LEVEL = "/Game/StarterContent/Maps/StarterMap"
+
+
+def current_level_path() -> str:
+    world = unreal.EditorLevelLibrary.get_editor_world()
+    return world.get_outermost().get_path_name() if world else ""
+
+
+def is_level_dirty(level_path:str) -> bool:
+    dirty_packages = unreal.EditorLoadingAndSavingUtils.get_dirty_map_packages()
+    return any(package.get_path_name() == level_path for package in dirty_packages)
+
+
+class LevelFixtures:
+    # Skip load_level when the level is already current and clean. Empty levels from template are created once,
+    # then reset by destroying the actors which are not in its baseline(saved as metadata of the level).
+    def __init__(self, template_path=DEFAULT_TEMPLATE, snapshot=None):
+        self.template_path = template_path
+        self.snapshot = snapshot  # AssetSnapshot, told about the deleted level
+        self.skipped_loads = 0
+        self.loads = 0
+        self.resets = 0
+        self.creates = 0
+
+    def load_level(self, level_path:str) -> bool:
+        # return True if the level is really loaded
+        if current_level_path() == level_path and not is_level_dirty(level_path):
+            self.skipped_loads += 1
+            return False
+        unreal.EditorLevelLibrary.load_level(level_path)
+        self.loads += 1
+        return True
+
+    def _baseline(self, level_path:str):
+        world_asset = unreal.load_asset(level_path)
+        value = unreal.EditorAssetLibrary.get_metadata_tag(world_asset, BASELINE_TAG) if world_asset else ""
+        return set(json.loads(value)) if value else None
+
+    def _create_empty_level(self, level_path:str):
+        if current_level_path() == level_path:
+            unreal.EditorLevelLibrary.load_level(SAFE_LEVEL)  # can't delete the current level
+        if unreal.EditorAssetLibrary.does_asset_exist(level_path):
+            unreal.PythonBPLib.delete_asset(level_path, show_confirmation=False)
+            if self.snapshot:
+                self.snapshot.on_asset_removed(level_path)
+        unreal.EditorLevelLibrary.new_level_from_template(asset_path=level_path, template_asset_path=self.template_path)
+        unreal.EditorLevelLibrary.load_level(level_path)
+
+        baseline = sorted(actor.get_name() for actor in unreal.EditorLevelLibrary.get_all_level_actors())
+        world_asset = unreal.load_asset(level_path)
+        unreal.EditorAssetLibrary.set_metadata_tag(world_asset, BASELINE_TAG, json.dumps(baseline))
+        unreal.EditorLevelLibrary.save_current_level()
+        self.creates += 1
+
+    def _reset_level(self, level_path:str, baseline:set) -> int:
+        if current_level_path() != level_path:
+            self.load_level(level_path)
+        spawned = [actor for actor in unreal.EditorLevelLibrary.get_all_level_actors() if actor.get_name() not in baseline]
+        for actor in spawned:
+            actor.destroy_actor()
+        if spawned or is_level_dirty(level_path):
+            unreal.EditorLevelLibrary.save_current_level()
+        self.resets += 1
+        return len(spawned)
+
+    def prepare_empty_level(self, level_path:str):
+        # return: "created" or "reset", seconds
+        t = time.time()
+        baseline = self._baseline(level_path) if unreal.EditorAssetLibrary.does_asset_exist(level_path) else None
+        if baseline is None:
+            self._create_empty_level(level_path)
+            result = "created"
+        else:
+            self._reset_level(level_path, baseline)
+            result = "reset"
+        return result, time.time() - t
+
+    def report(self):
+        return {"loads": self.loads, "skipped_loads": self.skipped_loads, "creates": self.creates, "resets": self.resets}
@@ -0,0 +1,144 @@
+import time
+
+import unreal
+
+from .FrameBudget import run_time_sliced
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Batched line trace disabled")
+    bNumpy = False
+
+
+if bNumpy:
+    HIT_DTYPE = np.dtype([("hit", np.bool_), ("location", np.float64, (3,)), ("distance", np.float32)])
+
+
+def vertical_rays(xs, ys, z_top:float, z_bottom:float):
+    # rays on the grid of xs * ys, from z_top to z_bottom, row major(y, x)
+    assert bNumpy, "Need 3rd package: numpy"
+    grid_y, grid_x = np.meshgrid(np.asarray(ys, dtype=np.float64), np.asarray(xs, dtype=np.float64), indexing="ij")
+    count = grid_x.size
+    starts = np.stack([grid_x.ravel(), grid_y.ravel(), np.full(count, z_top)], axis=1)
+    ends = starts.copy()
+    ends[:, 2] = z_bottom
+    return starts, ends
+
+
+def _to_vectors(points):
+    return [unreal.Vector(x, y, z) for x, y, z in points.tolist()]
+
+
+class BatchedLineTracer:
+    # multi_line_trace_at_once_by_profile in chunks, chunk_size follows the measured cost to keep each call under latency_ms.
+    def __init__(self, world, profile_name="BlockAll", latency_ms=16.0, chunk_size=1000, min_chunk=256, max_chunk=100_000
+                 , adaptive=True):
+        assert bNumpy, "Need 3rd package: numpy"
+        self.world = world
+        self.profile_name = profile_name
+        self.latency_ms = latency_ms
+        self.chunk_size = chunk_size
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.adaptive = adaptive
+        self.ray_count = 0
+        self.call_count = 0
+        self.seconds = 0.0
+
+    def rays_per_second(self):
+        return self.ray_count / self.seconds if self.seconds > 0 else 0.0
+
+    def _trace_chunk(self, starts, ends, results):
+        t = time.perf_counter()  # the conversion of vectors is counted in, it's a part of the cost of each chunk
+        bHit, hit_locs = unreal.PythonBPLib.multi_line_trace_at_once_by_profile(self.world, _to_vectors(starts), _to_vectors(ends)
+                                                                              , self.profile_name, unreal.DrawDebugTrace.NONE, 0)
+        assert len(hit_locs) == len(starts), f"hit locations count: {len(hit_locs)} != rays count: {len(starts)}"
+        locs = np.array([[v.x, v.y, v.z] for v in hit_locs], dtype=np.float64).reshape(-1, 3)
+
+        # there is no hit flag for each ray, bHit is true when any ray of the chunk hits. A ray is hit when its location
+        # lies on the segment and before the end, misses return the end or the zero vector. The zero vector is a miss
+        # even on a segment through the origin, a real hit at exactly the origin is lost
+        segments = ends - starts
+        lengths = np.linalg.norm(segments, axis=1)
+        offsets = locs - starts
+        along = np.einsum("ij,ij->i", offsets, segments) / np.maximum(lengths, 1e-6)
+        off_line = np.linalg.norm(offsets - segments * (along / np.maximum(lengths, 1e-6))[:, None], axis=1)
+        zero = np.all(locs == 0, axis=1)
+        hits = bHit & ~zero & (off_line < 0.1) & (along >= 0) & (along < lengths - 0.01)
+
+        results["hit"] = hits
+        results["location"] = locs
+        results["distance"] = np.where(hits, along, np.inf)
+        return time.perf_counter() - t
+
+    def iter_trace(self, starts, ends, results):
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        assert len(starts) == len(ends), f"starts count: {len(starts)} != ends count: {len(ends)}"
+        begin = 0
+        while begin < len(starts):
+            stop = min(begin + self.chunk_size, len(starts))
+            seconds = self._trace_chunk(starts[begin:stop], ends[begin:stop], results[begin:stop])
+            self.ray_count += stop - begin
+            self.call_count += 1
+            self.seconds += seconds
+            if self.adaptive and seconds > 0:
+                per_ray = seconds / (stop - begin)
+                self.chunk_size = int(min(max(self.latency_ms / 1000 / per_ray, self.min_chunk), self.max_chunk))
+            begin = stop
+            yield stop
+
+    def trace(self, starts, ends):
+        results = np.zeros(len(starts), dtype=HIT_DTYPE)
+        for _ in self.iter_trace(starts, ends, results):
+            pass
+        return results
+
+    def trace_time_sliced(self, starts, ends, budget_ms=8.0, on_finished=None):
+        # one chunk at least per tick, latency_ms should not be larger than budget_ms
+        results = np.zeros(len(starts), dtype=HIT_DTYPE)
+
+        def _on_finished(task):
+            if on_finished:
+                on_finished(results, task.error)
+        return run_time_sliced(self.iter_trace(starts, ends, results), budget_ms=budget_ms, on_finished=_on_finished)
+
+    def report(self):
+        result = {"rays": self.ray_count
+                , "calls": self.call_count
+                , "seconds": self.seconds
+                , "rays_per_sec": self.rays_per_second()
+                , "chunk_size": self.chunk_size}
+        print(f"BatchedLineTracer: {self.ray_count} rays in {self.call_count} calls, {result['rays_per_sec']:.0f} rays/sec")
+        return result
+
+
+def rasterize_hits(results, origin, cell_size:float, shape, mode="max_z"):
+    # shape: (rows, cols) on xy from origin. mode "max_z": highest hit z of each cell, nan for empty; "count": hit count
+    assert bNumpy, "Need 3rd package: numpy"
+    hits = results[results["hit"]]
+    cells = np.floor((hits["location"][:, :2] - np.asarray(origin, dtype=np.float64)[:2]) / cell_size).astype(np.int64)
+    inside = (cells[:, 0] >= 0) & (cells[:, 0] < shape[1]) & (cells[:, 1] >= 0) & (cells[:, 1] < shape[0])
+    cells, hits = cells[inside], hits[inside]
+    if mode == "count":
+        hit_map = np.zeros(shape, dtype=np.int32)
+        np.add.at(hit_map, (cells[:, 1], cells[:, 0]), 1)
+    else:
+        assert mode == "max_z", f"Unknown mode: {mode}"
+        hit_map = np.full(shape, -np.inf)
+        np.maximum.at(hit_map, (cells[:, 1], cells[:, 0]), hits["location"][:, 2])
+        hit_map[np.isneginf(hit_map)] = np.nan
+    return hit_map
+
+
+def benchmark(world, starts, ends, chunk_sizes=(1000, 10_000, 100_000), profile_name="BlockAll"):
+    # fixed chunk sizes, rays/sec of each
+    result = {}
+    for chunk_size in chunk_sizes:
+        tracer = BatchedLineTracer(world, profile_name, chunk_size=chunk_size, adaptive=False)
+        tracer.trace(starts, ends)
+        result[chunk_size] = tracer.rays_per_second()
+        print(f"\tchunk_size: {chunk_size}, {result[chunk_size]:.0f} rays/sec")
+    return result
@@ -0,0 +1,160 @@
+import json
+import os
+import time
+
+import unreal
+
+from .FixtureCache import spec_hash
+
+# spec:
+# {"properties": {"two_sided": True},                                           # editor properties of the material
+#  "nodes": {"Blue": {"class": "MaterialExpressionVectorParameter", "props": {"parameter_name": "Blue", "default_value": [0, 0, 1, 1]}},
+#            "UseBlue": {"class": "MaterialExpressionStaticSwitchParameter", "props": {"parameter_name": "UseBlue"}}},
+#  "connections": [["Blue", "", "UseBlue", "True"]],                           # from node, output name, to node, input name
+#  "outputs": {"MP_BaseColor": ["UseBlue", ""]}}                                # material property: from node, output name
+
+GRAPH_TAG = "TAPythonMaterialGraph"  # the built spec and the names of the expressions, in the metadata of the material
+
+
+def _set_property(obj, name:str, value):
+    # lists to the struct type of the current value, asset paths to assets, strings to enum values. No notification,
+    # the material is compiled once after all the edits
+    current = obj.get_editor_property(name)
+    if isinstance(value, (list, tuple)) and current is not None and not isinstance(current, (list, tuple, unreal.Array)):
+        value = type(current)(*value)
+    elif isinstance(value, str) and isinstance(current, unreal.EnumBase):
+        value = getattr(type(current), value)
+    elif isinstance(value, str) and value.startswith("/") and (current is None or isinstance(current, unreal.Object)):
+        value = unreal.load_asset(value)
+    obj.set_editor_property(name, value, notify_mode=unreal.PropertyAccessChangeNotifyMode.NEVER)
+
+
+def _node_hash(node:dict) -> str:
+    return spec_hash({"class": node["class"], "props": node.get("props", {})})
+
+
+def plan_graph(built:dict, spec:dict) -> dict:
+    # built: the metadata of the last build {"nodes": {key: {"name", "class", "hash"}}, "connections", "outputs", "properties"}
+    built_nodes = built.get("nodes", {})
+    nodes = spec.get("nodes", {})
+    create = [key for key in nodes if key not in built_nodes or built_nodes[key]["class"] != nodes[key]["class"]]
+    update = [key for key in nodes if key not in create and built_nodes[key]["hash"] != _node_hash(nodes[key])]
+    delete = [key for key in built_nodes if key not in nodes or key in create]
+
+    connections = {tuple(c) for c in spec.get("connections", [])}
+    built_connections = {tuple(c) for c in built.get("connections", [])}
+    # an input can't be disconnected, the node which loses an input is created again
+    for from_node, from_output, to_node, to_input in built_connections - connections:
+        if to_node in nodes and to_node not in create and not any(c[2] == to_node and c[3] == to_input for c in connections):
+            create.append(to_node)
+            delete.append(to_node)
+            update = [key for key in update if key != to_node]
+    new_nodes = set(create)
+    connect = sorted(c for c in connections if c not in built_connections or c[0] in new_nodes or c[2] in new_nodes)
+
+    outputs = {k: tuple(v) for k, v in spec.get("outputs", {}).items()}
+    built_outputs = {k: tuple(v) for k, v in built.get("outputs", {}).items()}
+    connect_outputs = sorted(k for k, v in outputs.items() if built_outputs.get(k) != v or v[0] in new_nodes)
+    disconnect_outputs = sorted(k for k in built_outputs if k not in outputs)
+
+    properties = spec.get("properties", {})
+    set_properties = sorted(k for k, v in properties.items() if built.get("properties", {}).get(k) != v)
+    return {"create": create, "update": update, "delete": delete, "connect": connect
+            , "connect_outputs": connect_outputs, "disconnect_outputs": disconnect_outputs, "properties": set_properties}
+
+
+def is_empty_plan(plan:dict) -> bool:
+    return not any(plan.values())
+
+
+class MaterialGraphBuilder:
+    # Build a material from a spec in one transaction: properties are set without notification, nodes and connections
+    # are created, then the material is compiled once. Building again only applies the difference to the last build.
+    def __init__(self, material):
+        self.material = material
+        self.report = {}
+
+    def _built(self) -> dict:
+        value = unreal.EditorAssetLibrary.get_metadata_tag(self.material, GRAPH_TAG)
+        return json.loads(value) if value else {}
+
+    def build(self, spec:dict, compile=True) -> dict:
+        mat = self.material
+        built = self._built()
+        existing = unreal.PythonMaterialLib.get_material_expressions(mat)
+        # the nodes not built from a spec are unknown to the plan, they would stay under the new ones
+        assert built or not existing, f"{mat.get_name()} has {len(existing)} expressions and no {GRAPH_TAG}, only empty or built materials can be built"
+        plan = plan_graph(built, spec)
+        self.report = {k: len(v) for k, v in plan.items()}
+        self.report.update({"changed": not is_empty_plan(plan), "edit_seconds": 0.0, "compile_seconds": 0.0, "compiles": 0})
+        if not self.report["changed"]:
+            return self.report
+
+        t = time.time()
+        nodes = spec.get("nodes", {})
+        expressions = {exp.get_name(): exp for exp in existing}
+        names = {key: v["name"] for key, v in built.get("nodes", {}).items()}
+        by_key = {key: expressions.get(name) for key, name in names.items()}
+
+        with unreal.ScopedEditorTransaction(f"Build material graph: {mat.get_name()}"):
+            for name in plan["properties"]:
+                _set_property(mat, name, spec["properties"][name])
+
+            for key in plan["delete"]:
+                if by_key.get(key):
+                    unreal.MaterialEditingLibrary.delete_material_expression(mat, by_key[key])
+                by_key.pop(key, None)
+            for key in plan["create"]:
+                node = nodes[key]
+                by_key[key] = unreal.MaterialEditingLibrary.create_material_expression(mat, getattr(unreal, node["class"]))
+                assert by_key[key], f"Create expression failed: {key}, {node['class']}"
+            for key in plan["create"] + plan["update"]:
+                for name, value in nodes[key].get("props", {}).items():
+                    _set_property(by_key[key], name, value)
+
+            for from_node, from_output, to_node, to_input in plan["connect"]:
+                unreal.PythonMaterialLib.connect_material_expressions(by_key[from_node], from_output, by_key[to_node], to_input)
+            for property_str in plan["disconnect_outputs"]:
+                unreal.PythonMaterialLib.disconnect_material_property(mat, property_str)
+            for property_str in plan["connect_outputs"]:
+                from_node, from_output = spec["outputs"][property_str]
+                unreal.PythonMaterialLib.connect_material_property(by_key[from_node], from_output, property_str)
+
+            if plan["create"]:
+                unreal.MaterialEditingLibrary.layout_material_expressions(mat)
+
+            built = {"nodes": {key: {"name": by_key[key].get_name(), "class": node["class"], "hash": _node_hash(node)} for key, node in nodes.items()}
+                     , "connections": spec.get("connections", []), "outputs": spec.get("outputs", {}), "properties": spec.get("properties", {})}
+            unreal.EditorAssetLibrary.set_metadata_tag(mat, GRAPH_TAG, json.dumps(built))
+        self.report["edit_seconds"] = time.time() - t
+
+        if compile:
+            t = time.time()
+            unreal.MaterialEditingLibrary.recompile_material(mat)
+            self.report["compile_seconds"] = time.time() - t
+            self.report["compiles"] += 1
+        return self.report
+
+
+def build_materials(specs:dict):
+    # specs: {material path: spec}. All the edits first, then one compile for each changed material and one save for all
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    reports, changed = {}, []
+    for path, spec in specs.items():
+        mat = unreal.load_asset(path) if unreal.EditorAssetLibrary.does_asset_exist(path) else None
+        if not mat:
+            mat = asset_tools.create_asset(os.path.basename(path), os.path.dirname(path), unreal.Material, unreal.MaterialFactoryNew())
+            assert mat, f"Create material failed: {path}"
+        builder = MaterialGraphBuilder(mat)
+        reports[path] = builder.build(spec, compile=False)
+        if reports[path]["changed"]:
+            changed.append((path, mat))
+
+    for path, mat in changed:
+        t = time.time()
+        unreal.MaterialEditingLibrary.recompile_material(mat)
+        reports[path]["compile_seconds"] = time.time() - t
+        reports[path]["compiles"] += 1
+    if changed:
+        unreal.EditorAssetLibrary.save_loaded_assets([mat for _, mat in changed], only_if_is_dirty=False)
+    return reports
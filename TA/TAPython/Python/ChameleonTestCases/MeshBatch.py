@@ -0,0 +1,162 @@
+import json
+import os
+import time
+
+import unreal
+
+from . import FrameBudget
+from .AssetSnapshot import get_class_name
+from .FixtureCache import spec_hash
+
+SETTINGS_TAG = "TAPythonMeshBatchSettings"  # the hash of the applied settings, in the metadata of the mesh
+
+# triangle count: group name, the small meshes first and the huge ones in their own ticks at the end
+SIZE_GROUPS = [(1000, "small"), (50_000, "medium"), (500_000, "large"), (float("inf"), "huge")]
+
+
+def size_group(triangles:int) -> str:
+    return next(name for limit, name in SIZE_GROUPS if triangles < limit)
+
+
+def _triangles(asset_data) -> int:
+    value = unreal.AssetRegistryHelpers.get_tag_value(asset_data, "Triangles")
+    try:
+        return int(str(value).replace(",", "")) if value else 0
+    except ValueError:
+        return 0
+
+
+def find_meshes(folders:[str]) -> [dict]:
+    # static meshes of the folders from one registry query for each folder, with the triangle count in the tags
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    meshes = []
+    for folder in folders:
+        for asset_data in registry.get_assets_by_path(folder.rstrip("/"), recursive=True):
+            if get_class_name(asset_data) == "StaticMesh":
+                triangles = _triangles(asset_data)
+                meshes.append({"path": str(asset_data.package_name), "triangles": triangles, "group": size_group(triangles)})
+    group_order = [name for _, name in SIZE_GROUPS]
+    meshes.sort(key=lambda m: (group_order.index(m["group"]), m["triangles"], m["path"]))
+    return meshes
+
+
+class MeshBatchProcessor:
+    # LOD and Nanite settings of many meshes, one mesh for each work unit of a time-sliced task.
+    # settings: {"lods": [(percent_triangles, screen_size), ...], "nanite": True/False/None(unchanged)}
+    # The editor apis run on the game thread only, the batches are spread over the ticks instead of threads.
+    def __init__(self, folders:[str], settings:dict, save=True):
+        self.folders = folders
+        self.settings = settings
+        self.settings_hash = spec_hash(settings)
+        self.save = save
+        self.meshes = []
+        self.results = []
+        self.bCancelled = False
+        self.on_progress = None  # on_progress(done, total, result)
+
+    def cancel(self):
+        self.bCancelled = True
+
+    def _lod_options(self):
+        reduction_settings = [unreal.StaticMeshReductionSettings(percent_triangles, screen_size)
+                              for percent_triangles, screen_size in self.settings.get("lods", [])]
+        return unreal.StaticMeshReductionOptions(auto_compute_lod_screen_size=False, reduction_settings=reduction_settings)
+
+    def _nanite_enabled(self, mesh):
+        if unreal.PythonBPLib.get_unreal_version()["major"] != 5:
+            return None
+        return mesh.get_editor_property("nanite_settings").enabled
+
+    def matches(self, mesh) -> bool:
+        lods = self.settings.get("lods", [])
+        mesh_subsystem = unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem)
+        if unreal.EditorAssetLibrary.get_metadata_tag(mesh, SETTINGS_TAG) != self.settings_hash:
+            return False
+        if lods and mesh_subsystem.get_lod_count(mesh) != len(lods):
+            return False
+        nanite = self.settings.get("nanite")
+        return nanite is None or self._nanite_enabled(mesh) in (None, nanite)
+
+    def verify(self, mesh, original_lod_count:int) -> [str]:
+        errors = []
+        lods = self.settings.get("lods", [])
+        if lods:
+            mesh_subsystem = unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem)
+            if mesh_subsystem.get_lod_count(mesh) != len(lods):
+                errors.append(f"lod count: {mesh_subsystem.get_lod_count(mesh)} != {len(lods)}")
+            reduced = [unreal.PythonMeshLib.is_this_lod_generated_by_mesh_reduction(mesh, i) for i in range(len(lods))]
+            if not all(reduced):
+                errors.append(f"lods not reduced: {[i for i, r in enumerate(reduced) if not r]}")
+        # the imported lod data is kept, the reduced lods are built from it
+        if unreal.PythonMeshLib.get_original_lod_data_count(mesh) != original_lod_count:
+            errors.append(f"original lod data: {unreal.PythonMeshLib.get_original_lod_data_count(mesh)} != {original_lod_count}")
+        nanite = self.settings.get("nanite")
+        if nanite is not None and self._nanite_enabled(mesh) not in (None, nanite):
+            errors.append(f"nanite enabled != {nanite}")
+        return errors
+
+    def process_mesh(self, mesh_info:dict) -> dict:
+        t = time.perf_counter()
+        result = dict(mesh_info, status="skipped", errors=[], seconds=0.0)
+        mesh = unreal.load_asset(mesh_info["path"])
+        if not mesh:
+            result.update(status="failed", errors=["load failed"])
+        elif not self.matches(mesh):
+            original_lod_count = unreal.PythonMeshLib.get_original_lod_data_count(mesh)
+            if self.settings.get("lods"):
+                unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem).set_lods(mesh, self._lod_options())
+            if self.settings.get("nanite") is not None and self._nanite_enabled(mesh) is not None:
+                unreal.PythonMeshLib.apply_nanite(mesh, self.settings["nanite"])
+            result["errors"] = self.verify(mesh, original_lod_count)
+            result["status"] = "failed" if result["errors"] else "applied"
+            if not result["errors"]:
+                unreal.EditorAssetLibrary.set_metadata_tag(mesh, SETTINGS_TAG, self.settings_hash)
+        result["seconds"] = time.perf_counter() - t
+        return result
+
+    def iter_process(self):
+        # generator: one mesh for each step, return the results
+        self.bCancelled = False
+        self.meshes = find_meshes(self.folders)
+        self.results = []
+        changed = []
+        for mesh_info in self.meshes:
+            if self.bCancelled:
+                self.results.append(dict(mesh_info, status="cancelled", errors=[], seconds=0.0))
+                continue
+            result = self.process_mesh(mesh_info)
+            self.results.append(result)
+            if result["status"] != "skipped":
+                changed.append(mesh_info["path"])
+            if self.on_progress:
+                self.on_progress(len(self.results), len(self.meshes), result)
+            yield
+        if self.save and changed:
+            unreal.EditorAssetLibrary.save_loaded_assets([unreal.load_asset(path) for path in changed], only_if_is_dirty=True)
+        return self.results
+
+    def run(self, budget_ms=16.0, on_finished=None) -> FrameBudget.TimeSlicedTask:
+        return FrameBudget.run_time_sliced(self.iter_process(), budget_ms=budget_ms, on_finished=on_finished)
+
+    def summary(self) -> dict:
+        result = {"meshes": len(self.results), "seconds": sum(r["seconds"] for r in self.results)}
+        for status in ("applied", "skipped", "failed", "cancelled"):
+            result[status] = sum(1 for r in self.results if r["status"] == status)
+        result["groups"] = {}
+        for r in self.results:
+            group = result["groups"].setdefault(r["group"], {"meshes": 0, "seconds": 0.0})
+            group["meshes"] += 1
+            group["seconds"] += r["seconds"]
+        return result
+
+    def write_report(self, file_path:str):
+        # per mesh timing, json with the summary, or csv
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            if file_path.lower().endswith(".csv"):
+                f.write("path,group,triangles,status,seconds,errors\n")
+                for r in self.results:
+                    f.write(f"{r['path']},{r['group']},{r['triangles']},{r['status']},{r['seconds']:.4f},\"{'; '.join(r['errors'])}\"\n")
+            else:
+                json.dump({"settings": self.settings, "summary": self.summary(), "meshes": self.results}, f, indent=2)
+        return file_path
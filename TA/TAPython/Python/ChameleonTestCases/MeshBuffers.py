@@ -0,0 +1,166 @@
+import itertools
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # the buffers and their math work without the editor
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    if unreal:
+        unreal.log_warning("No module numpy. Mesh buffers disabled")
+    bNumpy = False
+
+
+def _normalize(vectors, fallback=(0.0, 0.0, 1.0)):
+    lengths = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    degenerate = lengths < 1e-12
+    vectors = vectors / np.where(degenerate, 1.0, lengths)[:, None]
+    vectors[degenerate] = fallback
+    return vectors
+
+
+def _accumulate(indices, values, count:int):
+    # sum of the rows of values for each index, bincount is much faster than np.add.at
+    return np.stack([np.bincount(indices, weights=values[:, c], minlength=count) for c in range(values.shape[1])], axis=1)
+
+
+class MeshBuffers:
+    # vertices/normals/tangents (n, 3) float32, uvs (n, 2) float32, triangles (m, 3) int32
+    def __init__(self, vertices, triangles, uvs=None, normals=None, tangents=None):
+        assert bNumpy, "Need 3rd package: numpy"
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3)
+        count = len(self.vertices)
+        self.uvs = np.zeros((count, 2), dtype=np.float32) if uvs is None else np.ascontiguousarray(uvs, dtype=np.float32).reshape(-1, 2)
+        self.normals = None if normals is None else np.ascontiguousarray(normals, dtype=np.float32).reshape(-1, 3)
+        self.tangents = None if tangents is None else np.ascontiguousarray(tangents, dtype=np.float32).reshape(-1, 3)
+        assert len(self.uvs) == count, f"uvs count: {len(self.uvs)} != vertices count: {count}"
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.triangles)
+
+    @staticmethod
+    def from_unreal(vertices, triangles, uvs=None, normals=None):
+        # the lists of generate_box_mesh, get_section_from_static_mesh...
+        to_array = lambda vs, n: np.array([[getattr(v, c) for c in "xyz"[:n]] for v in vs], dtype=np.float32).reshape(-1, n)
+        return MeshBuffers(to_array(vertices, 3), np.asarray(triangles, dtype=np.int32)
+                           , to_array(uvs, 2) if uvs else None, to_array(normals, 3) if normals else None)
+
+    def compute_normals(self):
+        # area weighted: the cross product of a triangle is twice its area
+        v = self.vertices.astype(np.float64)
+        t = self.triangles
+        face_normals = np.cross(v[t[:, 1]] - v[t[:, 0]], v[t[:, 2]] - v[t[:, 0]])
+        # front faces are clockwise in unreal, same sign as CalculateTangentsForMesh
+        face_normals = -face_normals
+        normals = _accumulate(t.ravel(), np.repeat(face_normals, 3, axis=0), self.vertex_count)
+        self.normals = _normalize(normals).astype(np.float32)
+        return self.normals
+
+    def compute_tangents(self):
+        # tangent along +u, from the uv derivatives of each triangle, then orthogonal to the normal
+        if self.normals is None:
+            self.compute_normals()
+        v = self.vertices.astype(np.float64)
+        uv = self.uvs.astype(np.float64)
+        t = self.triangles
+        e1, e2 = v[t[:, 1]] - v[t[:, 0]], v[t[:, 2]] - v[t[:, 0]]
+        d1, d2 = uv[t[:, 1]] - uv[t[:, 0]], uv[t[:, 2]] - uv[t[:, 0]]
+        det = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+        r = np.where(np.abs(det) < 1e-20, 0.0, 1.0 / np.where(det == 0, 1.0, det))
+        face_tangents = (e1 * d2[:, 1:2] - e2 * d1[:, 1:2]) * r[:, None]
+        tangents = _accumulate(t.ravel(), np.repeat(face_tangents, 3, axis=0), self.vertex_count)
+        n = self.normals.astype(np.float64)
+        tangents -= n * np.einsum("ij,ij->i", n, tangents)[:, None]
+        # no uv: any direction orthogonal to the normal
+        axis = np.where(np.abs(n[:, 0:1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+        fallback = np.cross(n, axis)
+        lengths = np.sqrt(np.einsum("ij,ij->i", tangents, tangents))
+        tangents = np.where((lengths < 1e-12)[:, None], fallback, tangents)
+        self.tangents = _normalize(tangents, fallback=(1.0, 0.0, 0.0)).astype(np.float32)
+        return self.tangents
+
+    def split(self, max_vertices=65535) -> ["MeshBuffers"]:
+        # sections with at most max_vertices, the shared vertices of a chunk of triangles are kept once
+        if self.vertex_count <= max_vertices:
+            return [self]
+        sections = []
+        chunk = max(1, max_vertices * 3 // 2)  # less than 2 triangles for each vertex in a regular mesh, halved when over
+        pending = [(i, min(i + chunk, self.triangle_count)) for i in range(0, self.triangle_count, chunk)]
+        while pending:
+            start, stop = pending.pop(0)
+            used, local = np.unique(self.triangles[start:stop].ravel(), return_inverse=True)
+            if len(used) > max_vertices and stop - start > 1:
+                middle = (start + stop) // 2
+                pending[0:0] = [(start, middle), (middle, stop)]
+                continue
+            pick = lambda a: None if a is None else a[used]
+            sections.append(MeshBuffers(self.vertices[used], local.reshape(-1, 3), self.uvs[used], pick(self.normals), pick(self.tangents)))
+        return sections
+
+    # editor side
+    def section_args(self, with_tangents=True) -> dict:
+        # the arguments of create_mesh_section, tolist() converts the whole array at once
+        args = {"vertices": list(itertools.starmap(unreal.Vector, self.vertices.tolist()))
+                , "triangles": self.triangles.ravel().tolist()
+                , "normals": list(itertools.starmap(unreal.Vector, self.normals.tolist())) if self.normals is not None else []
+                , "uv0": list(itertools.starmap(unreal.Vector2D, self.uvs.tolist()))
+                , "tangents": []}
+        if with_tangents and self.tangents is not None:
+            args["tangents"] = [unreal.ProcMeshTangent(unreal.Vector(*t), False) for t in self.tangents.tolist()]
+        return args
+
+    def create_sections(self, mesh_comp, first_section=0, max_vertices=65535, create_collision=False) -> dict:
+        sections = self.split(max_vertices)
+        convert_seconds, create_seconds = 0.0, 0.0
+        for i, section in enumerate(sections):
+            t = time.perf_counter()
+            args = section.section_args()
+            t2 = time.perf_counter()
+            mesh_comp.create_mesh_section(first_section + i, vertex_colors=[], create_collision=create_collision, **args)
+            convert_seconds += t2 - t
+            create_seconds += time.perf_counter() - t2
+        return {"sections": len(sections), "vertices": sum(s.vertex_count for s in sections)
+                , "convert_seconds": convert_seconds, "create_seconds": create_seconds}
+
+
+def grid(count_x:int, count_y:int, spacing=10.0, height=None) -> MeshBuffers:
+    # a height field of count_x * count_y vertices, height(xs, ys) -> zs
+    assert bNumpy, "Need 3rd package: numpy"
+    ys, xs = np.mgrid[0:count_y, 0:count_x].astype(np.float32)
+    zs = np.zeros_like(xs) if height is None else height(xs * spacing, ys * spacing)
+    vertices = np.stack([xs.ravel() * spacing, ys.ravel() * spacing, np.ravel(zs)], axis=1)
+    uvs = np.stack([xs.ravel() / max(1, count_x - 1), ys.ravel() / max(1, count_y - 1)], axis=1)
+    i = (np.arange(count_y - 1)[:, None] * count_x + np.arange(count_x - 1)[None, :]).ravel()
+    # two clockwise triangles(seen from +z) for each quad
+    triangles = np.stack([i, i + count_x, i + 1, i + 1, i + count_x, i + count_x + 1], axis=1).reshape(-1, 3)
+    return MeshBuffers(vertices, triangles, uvs)
+
+
+def benchmark(mesh_comp, sizes=(10_000, 100_000, 1_000_000), max_vertices=65535) -> [dict]:
+    # vertices per second from numpy buffers into create_mesh_section, the sections are cleared after each size
+    results = []
+    for size in sizes:
+        side = max(2, int(round(size ** 0.5)))
+        t = time.perf_counter()
+        buffers = grid(side, side, spacing=10.0, height=lambda x, y: np.sin(x * 0.01) * np.cos(y * 0.01) * 50)
+        buffers.compute_tangents()
+        build_seconds = time.perf_counter() - t
+        mesh_comp.clear_all_mesh_sections()
+        created = buffers.create_sections(mesh_comp, max_vertices=max_vertices)
+        total = build_seconds + created["convert_seconds"] + created["create_seconds"]
+        result = dict(created, build_seconds=build_seconds, verts_per_second=buffers.vertex_count / total if total else 0.0)
+        results.append(result)
+        print(f"MeshBuffers {buffers.vertex_count:>8} verts in {created['sections']} sections: build {build_seconds:.2f}s, "
+              f"convert {created['convert_seconds']:.2f}s, create {created['create_seconds']:.2f}s, {result['verts_per_second']:,.0f} verts/s")
+    mesh_comp.clear_all_mesh_sections()
+    return results
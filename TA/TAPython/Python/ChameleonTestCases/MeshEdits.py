@@ -0,0 +1,145 @@
+import time
+
+import unreal
+
+
+class _MeshEdits:
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.section_materials = {}  # (lod, section): material slot index
+        self.cast_shadows = {}  # (lod, section): bool
+        self.slot_materials = {}  # slot index: material
+        self.sockets = None  # the whole socket list, None: not changed
+        self.section_counts = {}  # lod: section count, for the checks when an edit is staged
+        self.slot_count = None
+
+    def count(self):
+        return len(self.section_materials) + len(self.cast_shadows) + len(self.slot_materials) + (self.sockets is not None)
+
+    def check_section(self, lod_index:int, section_index:int):
+        if lod_index not in self.section_counts:
+            self.section_counts[lod_index] = len(unreal.PythonBPLib.get_static_mesh_section_info(self.mesh, lod_index)) if lod_index >= 0 else 0
+        assert 0 <= section_index < self.section_counts[lod_index] \
+            , f"{self.mesh.get_path_name()}: no section {section_index} in lod {lod_index}, section count: {self.section_counts[lod_index]}"
+
+    def check_slot(self, slot_index:int):
+        if self.slot_count is None:
+            self.slot_count = len(self.mesh.get_editor_property("static_materials"))
+        assert 0 <= slot_index < self.slot_count, f"{self.mesh.get_path_name()}: no material slot {slot_index}, slot count: {self.slot_count}"
+
+
+class MeshEditTransaction:
+    # Section/LOD material, cast shadow, slot material and socket edits of many meshes, staged then applied in commit.
+    # For each mesh: the no-op edits are dropped, the section material ids are set with modify_immediately=False and
+    # only the last edit of the mesh builds it and calls PostEditChange.
+    def __init__(self):
+        self.meshes = {}  # mesh path: _MeshEdits
+        self.report = {}
+
+    def _edits(self, mesh) -> _MeshEdits:
+        path = mesh.get_path_name()
+        if path not in self.meshes:
+            self.meshes[path] = _MeshEdits(mesh)
+        return self.meshes[path]
+
+    # the indices are checked when the edit is staged, an AssertionError with the mesh path, nothing fails in commit
+    def set_section_material(self, mesh, lod_index:int, section_index:int, material_slot_index:int):
+        edits = self._edits(mesh)
+        edits.check_section(lod_index, section_index)
+        edits.check_slot(material_slot_index)
+        edits.section_materials[(lod_index, section_index)] = material_slot_index
+
+    def set_cast_shadow(self, mesh, lod_index:int, section_index:int, cast_shadow:bool):
+        edits = self._edits(mesh)
+        edits.check_section(lod_index, section_index)
+        edits.cast_shadows[(lod_index, section_index)] = bool(cast_shadow)
+
+    def set_slot_material(self, mesh, slot_index:int, material):
+        edits = self._edits(mesh)
+        edits.check_slot(slot_index)
+        edits.slot_materials[slot_index] = material
+
+    def set_sockets(self, mesh, sockets:[unreal.StaticMeshSocket]):
+        self._edits(mesh).sockets = list(sockets)
+
+    def remap_materials(self, meshes, mapping:dict):
+        # mapping: {old material path: new material}, for the material slots of all the meshes
+        for mesh in meshes:
+            for i, static_material in enumerate(mesh.get_editor_property("static_materials")):
+                material = static_material.get_editor_property("material_interface")
+                if material and material.get_path_name() in mapping:
+                    self.set_slot_material(mesh, i, mapping[material.get_path_name()])
+
+    def edit_count(self) -> int:
+        return sum(edits.count() for edits in self.meshes.values())
+
+    def rollback(self):
+        self.meshes = {}
+
+    def _drop_unchanged(self, edits:_MeshEdits):
+        mesh = edits.mesh
+        section_infos = {}
+        for lod_index, section_index in list(edits.section_materials):
+            if lod_index not in section_infos:
+                section_infos[lod_index] = list(unreal.PythonBPLib.get_static_mesh_section_info(mesh, lod_index))
+            current = section_infos[lod_index]
+            if section_index < len(current) and current[section_index] == edits.section_materials[(lod_index, section_index)]:
+                del edits.section_materials[(lod_index, section_index)]
+        for key, cast_shadow in list(edits.cast_shadows.items()):
+            if unreal.PythonMeshLib.get_section_cast_shadow(mesh, lod_level=key[0], section_id=key[1]) == cast_shadow:
+                del edits.cast_shadows[key]
+        if edits.slot_materials:
+            static_materials = mesh.get_editor_property("static_materials")
+            for slot_index, material in list(edits.slot_materials.items()):
+                if static_materials[slot_index].get_editor_property("material_interface") == material:
+                    del edits.slot_materials[slot_index]
+
+    def _apply(self, edits:_MeshEdits) -> (int, int):
+        # return: engine calls, rebuilds
+        mesh = edits.mesh
+        calls, rebuilds = 0, 0
+        if edits.slot_materials:
+            static_materials = mesh.get_editor_property("static_materials")
+            materials = [edits.slot_materials.get(i, m.get_editor_property("material_interface")) for i, m in enumerate(static_materials)]
+            slot_names = [m.get_editor_property("material_slot_name") for m in static_materials]
+            unreal.PythonMeshLib.set_static_mesh_materials(mesh, materials=materials, slot_names=slot_names)
+            calls += 1
+        if edits.sockets is not None:
+            unreal.PythonMeshLib.set_static_mesh_sockets(mesh, edits.sockets)
+            calls += 1
+
+        # enable_section_cast_shadow builds the mesh each time, when there is one the material ids are all deferred
+        section_materials = sorted(edits.section_materials.items())
+        for i, ((lod_index, section_index), material_index) in enumerate(section_materials):
+            bLast = i == len(section_materials) - 1 and not edits.cast_shadows
+            unreal.PythonBPLib.set_static_mesh_lod_material_id(mesh, lod_index, section_index, material_index, modify_immediately=bLast)
+            calls += 1
+            if bLast:
+                rebuilds += 1
+        if edits.cast_shadows:
+            mesh_subsystem = unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem)
+            for (lod_index, section_index), cast_shadow in sorted(edits.cast_shadows.items()):
+                mesh_subsystem.enable_section_cast_shadow(mesh, cast_shadow, lod_index, section_index)
+                calls += 1
+                rebuilds += 1
+        return calls, rebuilds
+
+    def commit(self, save=False) -> dict:
+        t = time.time()
+        staged = self.edit_count()
+        calls, rebuilds, changed = 0, 0, []
+        for edits in self.meshes.values():
+            self._drop_unchanged(edits)
+            if not edits.count():
+                continue
+            mesh_calls, mesh_rebuilds = self._apply(edits)
+            calls += mesh_calls
+            rebuilds += mesh_rebuilds
+            changed.append(edits.mesh)
+        applied = sum(edits.count() for edits in self.meshes.values())
+        if save and changed:
+            unreal.EditorAssetLibrary.save_loaded_assets(changed, only_if_is_dirty=False)
+        self.report = {"meshes": len(self.meshes), "changed_meshes": len(changed), "staged": staged, "applied": applied
+                       , "skipped": staged - applied, "engine_calls": calls, "rebuilds": rebuilds, "seconds": time.time() - t}
+        self.meshes = {}
+        return self.report
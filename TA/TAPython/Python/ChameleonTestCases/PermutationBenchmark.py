@@ -0,0 +1,158 @@
+import itertools
+import json
+import os
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # specs, tables and baselines work without the editor
+
+from . import Coroutines
+from .ShaderMapStats import parse_shader_map_info
+
+
+def switch_names(switch_count:int) -> [str]:
+    return [f"Switch_{i}" for i in range(switch_count)]
+
+
+def master_spec(switch_count:int, defaults=None) -> dict:
+    # a chain of static switches, each one adds its color or not, so every permutation is a different shader.
+    # defaults: the default value of each switch, the permutation compiled in the master itself
+    defaults = defaults if defaults else [False] * switch_count
+    nodes = {"Base": {"class": "MaterialExpressionVectorParameter", "props": {"parameter_name": "Base", "default_value": [0.1, 0.1, 0.1, 1]}}}
+    connections = []
+    previous = "Base"
+    for i, name in enumerate(switch_names(switch_count)):
+        nodes[f"Color_{i}"] = {"class": "MaterialExpressionVectorParameter"
+                               , "props": {"parameter_name": f"Color_{i}", "default_value": [0.1 * (i % 10), 0.2, 0.05 * (i % 20), 1]}}
+        nodes[f"Add_{i}"] = {"class": "MaterialExpressionAdd"}
+        nodes[name] = {"class": "MaterialExpressionStaticSwitchParameter", "props": {"parameter_name": name, "default_value": bool(defaults[i])}}
+        connections.extend([[previous, "", f"Add_{i}", "A"], [f"Color_{i}", "", f"Add_{i}", "B"]
+                            , [f"Add_{i}", "", name, "True"], [previous, "", name, "False"]])
+        previous = name
+    return {"nodes": nodes, "connections": connections, "outputs": {"MP_BaseColor": [previous, ""]}}
+
+
+def permutations(switch_count:int, limit=None) -> [tuple]:
+    # all the switch values, or "limit" of them evenly spaced
+    count = 2 ** switch_count
+    step = max(1, count // limit) if limit else 1
+    return [tuple(bool(i >> bit & 1) for bit in range(switch_count)) for i in range(0, count, step)][:limit]
+
+
+def permutation_name(values) -> str:
+    return "".join("1" if v else "0" for v in values)
+
+
+def summarize(rows:[dict]) -> [dict]:
+    # rows: one for each permutation {"switches", "permutation", "shaders", "compile_seconds", "instance_seconds"}
+    summary = []
+    for switch_count, group in itertools.groupby(sorted(rows, key=lambda r: r["switches"]), key=lambda r: r["switches"]):
+        group = list(group)
+        shaders = [r["shaders"] for r in group]
+        compile_seconds = [r["compile_seconds"] for r in group]
+        summary.append({"switches": switch_count, "permutations": len(group), "possible": 2 ** switch_count
+                        , "shaders_min": min(shaders), "shaders_max": max(shaders), "shaders_total": sum(shaders)
+                        , "compile_mean": sum(compile_seconds) / len(group), "compile_total": sum(compile_seconds)
+                        , "instance_mean": sum(r["instance_seconds"] for r in group) / len(group)})
+    return summary
+
+
+def scaling_table(summary:[dict]) -> str:
+    lines = [f"{'switches':>8} {'perms':>9} {'shaders/perm':>13} {'shaders':>8} {'compile/perm':>13} {'compile':>9} {'mi set':>9}"]
+    for s in summary:
+        lines.append(f"{s['switches']:>8} {s['permutations']:>4}/{s['possible']:<4} {s['shaders_min']:>6}-{s['shaders_max']:<6}"
+                     f" {s['shaders_total']:>8} {s['compile_mean']:>12.2f}s {s['compile_total']:>8.2f}s {s['instance_mean'] * 1000:>7.1f}ms")
+    return "\n".join(lines)
+
+
+def load_baseline(file_path:str) -> dict:
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(file_path:str, summary:[dict], platform:str):
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({"platform": platform, "summary": summary}, f, indent=2)
+
+
+def _comparable(summary:[dict], baseline:dict):
+    previous = {s["switches"]: s for s in baseline.get("summary", [])}
+    for s in summary:
+        base = previous.get(s["switches"])
+        if base and base["permutations"] == s["permutations"]:
+            yield s, base
+
+
+def compare_baseline(summary:[dict], baseline:dict) -> [str]:
+    # more shaders than the baseline is a regression. Compile times are not compared here, a warm or cold DDC
+    # changes them more than any regression, see compile_deltas
+    return [f"{s['switches']} switches: shaders {base['shaders_total']} -> {s['shaders_total']}"
+            for s, base in _comparable(summary, baseline) if s["shaders_total"] > base["shaders_total"]]
+
+
+def compile_deltas(summary:[dict], baseline:dict) -> [str]:
+    # for the report only
+    return [f"{s['switches']} switches: compile {base['compile_total']:.2f}s -> {s['compile_total']:.2f}s"
+            f" ({s['compile_total'] - base['compile_total']:+.2f}s)" for s, base in _comparable(summary, baseline)]
+
+
+# editor side
+def compile_and_wait(material) -> float:
+    # get_statistics calls FinishCompilation on the material resource, so it returns after the shaders of the new
+    # shader map are compiled, not with the stale or partial one. return the seconds of the compile
+    t = time.perf_counter()
+    if isinstance(material, unreal.Material):
+        unreal.MaterialEditingLibrary.recompile_material(material)
+    unreal.MaterialEditingLibrary.get_statistics(material)
+    return time.perf_counter() - t
+
+
+def _load_or_create(folder:str, name:str, asset_class, factory):
+    path = f"{folder}/{name}"
+    asset = unreal.load_asset(path) if unreal.EditorAssetLibrary.does_asset_exist(path) else None
+    if not asset:
+        asset = unreal.AssetToolsHelpers.get_asset_tools().create_asset(name, folder, asset_class, factory)
+        assert asset, f"Create {asset_class.__name__} failed: {path}"
+    return asset
+
+
+async def sweep(folder:str, switch_counts=(1, 2, 3, 4), limit=16, platform="PCD3D_SM5"):
+    # one master for each switch count, each permutation is compiled in the master(switch defaults) for its shader
+    # count and compile time. After the master sweep, each permutation is set on a material instance of another
+    # master, which is not recompiled by the sweep, for the cost of a static permutation update
+    from .MaterialGraphBuilder import MaterialGraphBuilder
+    rows = []
+    for switch_count in switch_counts:
+        mat = _load_or_create(folder, f"M_Permutation_{switch_count}", unreal.Material, unreal.MaterialFactoryNew())
+        builder = MaterialGraphBuilder(mat)
+        names = switch_names(switch_count)
+        group = []
+        for values in permutations(switch_count, limit):
+            builder.build(master_spec(switch_count, values), compile=False)
+            compile_seconds = compile_and_wait(mat)
+            stats = parse_shader_map_info(unreal.PythonMaterialLib.get_shader_map_info(mat, platform))
+            group.append({"switches": switch_count, "permutation": permutation_name(values), "shaders": stats["total"]
+                          , "by_vertex_factory": stats["by_vertex_factory"], "compile_seconds": compile_seconds, "instance_seconds": 0.0})
+            await Coroutines.next_frame()
+
+        instance_master = _load_or_create(folder, f"M_PermutationInstances_{switch_count}", unreal.Material, unreal.MaterialFactoryNew())
+        MaterialGraphBuilder(instance_master).build(master_spec(switch_count), compile=False)
+        compile_and_wait(instance_master)
+        for row, values in zip(group, permutations(switch_count, limit)):
+            mi = _load_or_create(folder, f"MI_Permutation_{switch_count}_{row['permutation']}", unreal.MaterialInstanceConstant
+                                 , unreal.MaterialInstanceConstantFactoryNew())
+            unreal.MaterialEditingLibrary.set_material_instance_parent(mi, instance_master)
+            t = time.perf_counter()
+            unreal.PythonMaterialLib.set_static_switch_parameters_values(mi, switch_names=names, values=list(values), overrides=[True] * switch_count)
+            unreal.MaterialEditingLibrary.get_statistics(mi)
+            row["instance_seconds"] = time.perf_counter() - t
+            print(f"PermutationBenchmark {switch_count} switches, {row['permutation']}: {row['shaders']} shaders, "
+                  f"compile {row['compile_seconds']:.2f}s, mi {row['instance_seconds'] * 1000:.1f}ms")
+            await Coroutines.next_frame()
+        rows.extend(group)
+    return rows
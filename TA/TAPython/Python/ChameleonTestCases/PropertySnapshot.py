@@ -0,0 +1,183 @@
+import time
+
+import unreal
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Property snapshot disabled")
+    bNumpy = False
+
+
+KINDS = ("bool", "int", "float", "str", "vector", "object")
+
+_layouts = {}  # (class path, property names): PropertyLayout
+
+
+def _kind_of(value):
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int) and not isinstance(value, unreal.EnumBase):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, unreal.Vector):
+        return "vector"
+    if value is None or isinstance(value, unreal.Object):
+        return "object"
+    return None  # structs, enums, arrays... have no typed getter in PythonBPLib
+
+
+def _to_python(v):
+    # numpy scalars and vector rows to python values
+    if isinstance(v, np.ndarray):
+        return tuple(v.tolist())
+    return v.item() if isinstance(v, np.generic) else v
+
+
+class PropertyLayout:
+    # names of the properties which can be captured, grouped by kind. Resolved once per class
+    def __init__(self, class_path:str, names_by_kind:dict, skipped:[str]):
+        self.class_path = class_path
+        self.names_by_kind = names_by_kind
+        self.skipped = skipped
+
+    def __len__(self):
+        return sum(len(names) for names in self.names_by_kind.values())
+
+    @staticmethod
+    def resolve(sample_actor, property_names=None):
+        actor_class = sample_actor.get_class()
+        key = (actor_class.get_path_name(), tuple(property_names) if property_names else None)
+        if key not in _layouts:
+            names = property_names if property_names else unreal.PythonBPLib.get_all_property_names(actor_class)
+            names_by_kind = {kind: [] for kind in KINDS}
+            skipped = []
+            for name in names:
+                try:
+                    kind = _kind_of(sample_actor.get_editor_property(name))
+                except Exception as e:
+                    kind = None
+                if kind:
+                    names_by_kind[kind].append(name)
+                else:
+                    skipped.append(name)
+            _layouts[key] = PropertyLayout(key[0], names_by_kind, skipped)
+        return _layouts[key]
+
+
+def _capture_columns(actors, layout:PropertyLayout):
+    count = len(actors)
+    bp_lib = unreal.PythonBPLib
+    columns = {}
+    for kind, names in layout.names_by_kind.items():
+        if not names:
+            continue
+        convert = None
+        if kind == "bool":
+            column = np.zeros((count, len(names)), dtype=np.bool_)
+            getter = bp_lib.get_bool_property
+        elif kind == "int":
+            column = np.zeros((count, len(names)), dtype=np.int64)
+            getter = bp_lib.get_int_property
+        elif kind == "float":
+            column = np.zeros((count, len(names)), dtype=np.float64)
+            getter = bp_lib.get_float_property
+        elif kind == "vector":
+            column = np.zeros((count, len(names), 3), dtype=np.float64)
+            getter = bp_lib.get_vector_property
+            convert = lambda v: (v.x, v.y, v.z)
+        else:
+            column = np.empty((count, len(names)), dtype=object)
+            getter = bp_lib.get_string_property if kind == "str" else bp_lib.get_object_property
+            if kind == "object":
+                convert = lambda v: v.get_path_name() if v else ""
+
+        for row, actor in enumerate(actors):
+            for col, name in enumerate(names):
+                v = getter(actor, name)
+                column[row, col] = convert(v) if convert else v
+        columns[kind] = column
+    return columns
+
+
+class ClassColumns:
+    def __init__(self, layout:PropertyLayout, actor_keys:[str], columns:dict):
+        self.layout = layout
+        self.actor_keys = actor_keys
+        self.rows = {key: i for i, key in enumerate(actor_keys)}
+        self.columns = columns
+
+
+class PropertySnapshot:
+    # Property values of many actors in columns: one numpy array per (class, kind), rows are actors.
+    # Names and kinds come from get_all_property_names once per class, the values from the typed PythonBPLib getters.
+    def __init__(self):
+        self.groups = {}  # class path: ClassColumns
+        self.capture_seconds = 0.0
+        self.value_count = 0
+
+    @staticmethod
+    def capture(actors, property_names=None):
+        assert bNumpy, "Need 3rd package: numpy"
+        t = time.time()
+        snapshot = PropertySnapshot()
+        by_class = {}
+        for actor in actors:
+            if actor:
+                by_class.setdefault(actor.get_class().get_path_name(), []).append(actor)
+
+        for class_path, class_actors in by_class.items():
+            layout = PropertyLayout.resolve(class_actors[0], property_names)
+            keys = [actor.get_path_name() for actor in class_actors]
+            snapshot.groups[class_path] = ClassColumns(layout, keys, _capture_columns(class_actors, layout))
+            snapshot.value_count += len(class_actors) * len(layout)
+        snapshot.capture_seconds = time.time() - t
+        return snapshot
+
+    def actor_keys(self):
+        return {key for group in self.groups.values() for key in group.actor_keys}
+
+    def get(self, actor_key:str, property_name:str):
+        for group in self.groups.values():
+            row = group.rows.get(actor_key)
+            if row is None:
+                continue
+            for kind, names in group.layout.names_by_kind.items():
+                if property_name in names:
+                    return _to_python(group.columns[kind][row, names.index(property_name)])
+        return None
+
+    def diff(self, other, float_tolerance=1e-4):
+        # return: {"added": [actor key], "removed": [actor key], "changed": [(actor key, property name, self value, other value)]}
+        assert bNumpy, "Need 3rd package: numpy"
+        keys_a, keys_b = self.actor_keys(), other.actor_keys()
+        result = {"added": sorted(keys_b - keys_a), "removed": sorted(keys_a - keys_b), "changed": []}
+        for class_path, group_a in self.groups.items():
+            group_b = other.groups.get(class_path)
+            if group_b is None or group_a.layout is not group_b.layout:
+                continue
+            common = [key for key in group_a.actor_keys if key in group_b.rows]
+            if not common:
+                continue
+            rows_a = np.array([group_a.rows[key] for key in common])
+            rows_b = np.array([group_b.rows[key] for key in common])
+            for kind, a in group_a.columns.items():
+                a, b = a[rows_a], group_b.columns[kind][rows_b]
+                if kind == "float":
+                    changed = np.abs(a - b) > float_tolerance
+                elif kind == "vector":
+                    changed = np.any(np.abs(a - b) > float_tolerance, axis=2)
+                else:
+                    changed = a != b
+                names = group_a.layout.names_by_kind[kind]
+                for row, col in zip(*np.nonzero(changed)):
+                    result["changed"].append((common[row], names[col], _to_python(a[row, col]), _to_python(b[row, col])))
+        return result
+
+    def report(self):
+        return {"classes": len(self.groups), "actors": sum(len(g.actor_keys) for g in self.groups.values())
+                , "values": self.value_count, "capture_seconds": self.capture_seconds}
@@ -0,0 +1,113 @@
+import os
+import struct
+import zlib
+
+import unreal
+
+bNumpy = True
+try:
+    import numpy as np
+except Exception as e:
+    unreal.log_warning("No module numpy. Render target readback helper disabled")
+    bNumpy = False
+
+bOpenExr = True
+try:
+    import OpenEXR
+    import Imath
+except Exception as e:
+    bOpenExr = False
+
+
+# pixel layout of get_render_target_raw_data is fixed: bgra
+CHANNEL_INDEX = {"B": 0, "G": 1, "R": 2, "A": 3}
+
+
+def as_bgra_array(raw_data, width:int, height:int):
+    assert bNumpy, "Need 3rd package: numpy"
+    assert len(raw_data) == width * height * 4, f"len(raw_data): {len(raw_data)} != {width} * {height} * 4"
+    if isinstance(raw_data, (bytes, bytearray, memoryview)):
+        pixels = np.frombuffer(raw_data, dtype=np.uint8)  # no copy, read only for bytes
+    else:
+        pixels = np.asarray(raw_data, dtype=np.uint8)  # a list from the api, one copy can't be avoided
+    return pixels.reshape(height, width, 4)
+
+
+class RenderTargetReadback:
+    def __init__(self, rt, raw_data=None):
+        self.rt = rt
+        self.width = rt.get_editor_property("size_x")
+        self.height = rt.get_editor_property("size_y")
+        if raw_data is None:
+            raw_data = unreal.PythonTextureLib.get_render_target_raw_data(rt)
+        self.raw_data = raw_data  # keep the buffer alive, bgra is a view of it
+        self.bgra = as_bgra_array(raw_data, self.width, self.height)
+
+    def channel(self, name:str):
+        return self.bgra[:, :, CHANNEL_INDEX[name.upper()]]  # view
+
+    def rgb(self):
+        return self.bgra[:, :, 2::-1]  # view with negative stride
+
+    def reorder(self, order="RGBA"):
+        return np.ascontiguousarray(self.bgra[:, :, [CHANNEL_INDEX[c] for c in order.upper()]])
+
+    def pixel(self, x:int, y:int, order="BGRA"):
+        return tuple(int(self.bgra[y, x, CHANNEL_INDEX[c]]) for c in order.upper())
+
+    def histogram(self, order="RGBA"):
+        flat = self.bgra.reshape(-1, 4)
+        return {c: np.bincount(flat[:, CHANNEL_INDEX[c]], minlength=256) for c in order.upper()}
+
+    def statistics(self, order="RGBA"):
+        result = {}
+        flat = self.bgra.reshape(-1, 4)
+        for c in order.upper():
+            values = flat[:, CHANNEL_INDEX[c]]
+            result[c] = {"min": int(values.min()), "max": int(values.max())
+                        , "mean": float(values.mean()), "std": float(values.std())}
+        return result
+
+    def save_png(self, file_path:str, with_alpha=True):
+        save_png(file_path, self.reorder("RGBA" if with_alpha else "RGB"))
+        return file_path
+
+    def save_exr(self, file_path:str):
+        save_exr(file_path, self.reorder("RGBA").astype(np.float16) / np.float16(255))
+        return file_path
+
+
+def _png_chunk(chunk_type:bytes, data:bytes):
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+
+
+def save_png(file_path:str, pixels, compress_level=6):
+    # pixels: (h, w, 3 or 4) uint8 in rgb(a) order
+    height, width, channel_num = pixels.shape
+    assert channel_num in (3, 4), f"channel_num: {channel_num} not in (3, 4)"
+    rows = np.zeros((height, width * channel_num + 1), dtype=np.uint8)  # filter type 0 at the head of each row
+    rows[:, 1:] = pixels.reshape(height, -1)
+
+    color_type = 6 if channel_num == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", header))
+        f.write(_png_chunk(b"IDAT", zlib.compress(rows.tobytes(), compress_level)))
+        f.write(_png_chunk(b"IEND", b""))
+    return file_path
+
+
+def save_exr(file_path:str, pixels):
+    # pixels: (h, w, 4) float16 in rgba order
+    assert bOpenExr, "Need 3rd package: OpenEXR"
+    height, width, _ = pixels.shape
+    header = OpenEXR.Header(width, height)
+    half = Imath.Channel(Imath.PixelType(Imath.PixelType.HALF))
+    header["channels"] = {c: half for c in "RGBA"}
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    exr_file = OpenEXR.OutputFile(file_path, header)
+    exr_file.writePixels({c: np.ascontiguousarray(pixels[:, :, i]).tobytes() for i, c in enumerate("RGBA")})
+    exr_file.close()
+    return file_path
@@ -0,0 +1,267 @@
+import json
+import time
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # plan_enum/plan_struct work without the editor
+
+
+SCHEMA_TAG = "TAPythonSchema"  # the variable types and defaults written by the builder, in the metadata of the struct
+
+# schema:
+# {"folder": "/Game/Data",
+#  "enums": [{"name": "E_Weapon", "bitflags": False, "description": "", "items": ["Sword", {"display_name": "Bow", "description": "..."}]}],
+#  "structs": [{"name": "S_Weapon", "variables": [
+#       {"name": "damage", "category": "float", "default": "10"},
+#       {"name": "kind", "category": "byte", "sub_object": "E_Weapon"},            # asset in the schema, or an object path
+#       {"name": "meshes", "category": "object", "sub_object": "/Script/Engine.StaticMesh", "container": 1},
+#       {"name": "lookup", "category": "name", "map_value": {"category": "object", "sub_object": "/Script/Engine.StaticMesh"}}]}]}
+
+
+def load_schema(file_path:str) -> dict:
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise AssertionError("Need 3rd package: pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _enum_items(spec:dict):
+    items = []
+    for item in spec.get("items", []):
+        item = {"display_name": item} if isinstance(item, str) else item
+        items.append((item["display_name"], item.get("description", "")))
+    return items
+
+
+def plan_enum(current:dict, spec:dict) -> list:
+    # current: {"display_names", "descriptions", "bitflags", "description"}, from read_enum_state
+    ops = []
+    display_names, descriptions = list(current["display_names"]), list(current["descriptions"])
+    items = _enum_items(spec)
+    target_names = [name for name, _ in items]
+
+    if display_names != target_names:
+        if sorted(display_names) == sorted(target_names) and len(set(target_names)) == len(target_names):
+            # same items in another order, moving keeps the enumerator names(and the saved values)
+            for i, name in enumerate(target_names):
+                j = display_names.index(name)
+                if j != i:
+                    ops.append(("move_enum_item", j, i))
+                    display_names.insert(i, display_names.pop(j))
+                    descriptions.insert(i, descriptions.pop(j))
+        elif len(display_names) == len(target_names):
+            for i, name in enumerate(target_names):
+                if display_names[i] != name:
+                    ops.append(("set_display_name", i, name))
+        else:
+            ops.append(("set_enum_items", target_names))
+            ops.extend(("set_display_name", i, name) for i, name in enumerate(target_names))
+            descriptions = [""] * len(target_names)
+
+    for i, (_, description) in enumerate(items):
+        if descriptions[i] != description:
+            ops.append(("set_description_by_index", i, description))
+    if bool(spec.get("bitflags", False)) != bool(current["bitflags"]):
+        ops.append(("set_bitflags_type", bool(spec.get("bitflags", False))))
+    if spec.get("description", "") != current["description"]:
+        ops.append(("set_enum_description", spec.get("description", "")))
+    return ops
+
+
+def _var_type(var:dict):
+    # the part of a variable spec which can't be changed in place
+    map_value = var.get("map_value")
+    return (var.get("category"), var.get("sub_category", ""), var.get("sub_object", "")
+            , var.get("container", 0), json.dumps(map_value, sort_keys=True) if map_value else "")
+
+
+def _default_changed(existing:dict, var:dict) -> bool:
+    # the engine keeps its own text of the default("10" -> "10.000000"), compare with the one written last time
+    default = str(var["default"])
+    if existing["written"] and existing["written"].get("default") == default:
+        return existing["written"].get("engine_default") != existing["default"]
+    return default != existing["default"]
+
+
+def plan_struct(current:dict, spec:dict, prune=True) -> list:
+    # current: {"variables": {friendly name: {"default", "written"}}, "names": {friendly name: variable name}}
+    # "written": {"type", "default", "engine_default"} from the last build, None if the variable is not built by the schema
+    ops = []
+    target = {var["name"]: var for var in spec.get("variables", [])}
+    for name, var in target.items():
+        existing = current["variables"].get(name)
+        if existing and existing["written"] and tuple(existing["written"]["type"]) != _var_type(var):
+            ops.append(("remove_variable_by_name", current["names"][name]))
+            existing = None
+        if not existing:
+            ops.append(("add_variable", var))
+            if "default" in var:
+                ops.append(("change_variable_default_value", name, str(var["default"])))
+        elif "default" in var and _default_changed(existing, var):
+            ops.append(("change_variable_default_value", name, str(var["default"])))
+    if prune:
+        for name in current["variables"]:
+            if name not in target:
+                ops.append(("remove_variable_by_name", current["names"][name]))
+    return ops
+
+
+# the state of an asset which is not created yet, for the plan of a dry run
+EMPTY_ENUM_STATE = {"display_names": [], "descriptions": [], "bitflags": False, "description": ""}
+EMPTY_STRUCT_STATE = {"variables": {}, "names": {}}
+
+
+# editor side
+def read_enum_state(enum_asset) -> dict:
+    lib = unreal.PythonEnumLib
+    count = lib.get_enum_len(enum_asset)
+    return {"display_names": [str(lib.get_display_name_by_index(enum_asset, i)) for i in range(count)]
+            , "descriptions": [str(lib.get_description_by_index(enum_asset, i)) for i in range(count)]
+            , "bitflags": lib.is_bitflags_type(enum_asset)
+            , "description": str(enum_asset.get_editor_property("enum_description"))}
+
+
+def read_struct_state(struct_asset) -> dict:
+    # the type of a variable is not readable in a stable form, the types written by the builder are kept in the metadata
+    lib = unreal.PythonStructLib
+    written = json.loads(unreal.EditorAssetLibrary.get_metadata_tag(struct_asset, SCHEMA_TAG) or "{}")
+    state = {"variables": {}, "names": {}}
+    for friendly_name, var_name in zip(lib.get_friendly_names(struct_asset), lib.get_variable_names(struct_asset)):
+        friendly_name = str(friendly_name)
+        guid = lib.get_guid_from_friendly_name(struct_asset, friendly_name)
+        state["variables"][friendly_name] = {"default": str(lib.get_variable_default_value(struct_asset, guid))
+                                             , "written": written.get(friendly_name)}
+        state["names"][friendly_name] = var_name
+    return state
+
+
+def write_struct_state(struct_asset, spec:dict):
+    lib = unreal.PythonStructLib
+    written = {}
+    for var in spec.get("variables", []):
+        guid = lib.get_guid_from_friendly_name(struct_asset, var["name"])
+        written[var["name"]] = {"type": list(_var_type(var)), "default": str(var["default"]) if "default" in var else None
+                                , "engine_default": str(lib.get_variable_default_value(struct_asset, guid))}
+    unreal.EditorAssetLibrary.set_metadata_tag(struct_asset, SCHEMA_TAG, json.dumps(written))
+
+
+class SchemaBuilder:
+    # Enums and structs from a schema: missing assets are created, existing ones get only the edits in their plan,
+    # all the modified packages are saved once at the end.
+    def __init__(self, schema:dict, prune=True):
+        self.schema = schema
+        self.folder = schema["folder"].rstrip("/")
+        self.prune = prune
+        self.report = []
+
+    def asset_path(self, name:str) -> str:
+        return f"{self.folder}/{name}"
+
+    def _resolve_object(self, path_or_name:str):
+        if not path_or_name:
+            return None
+        path = path_or_name if path_or_name.startswith("/") else self.asset_path(path_or_name)
+        obj = unreal.load_object(None, path) if path.startswith("/Script/") else unreal.load_asset(path)
+        assert obj, f"Can't load sub object: {path}"
+        return obj
+
+    def _category(self, var:dict):
+        category, sub_category = var.get("category"), var.get("sub_category", "")
+        if category == "float" and unreal.PythonBPLib.get_unreal_version()["major"] == 5:
+            category, sub_category = "real", "double"
+        return category, sub_category
+
+    def _add_variable(self, struct_asset, var:dict):
+        category, sub_category = self._category(var)
+        sub_object = self._resolve_object(var.get("sub_object", ""))
+        map_value = var.get("map_value")
+        if map_value:
+            terminal_category, terminal_sub_category = self._category(map_value)
+            unreal.PythonStructLib.add_directory_variable(struct_asset, category=category, sub_category=sub_category, sub_category_object=sub_object
+                                                          , terminal_category=terminal_category, terminal_sub_category=terminal_sub_category
+                                                          , terminal_sub_category_object=self._resolve_object(map_value.get("sub_object", ""))
+                                                          , is_reference=False, friendly_name=var["name"])
+        else:
+            unreal.PythonStructLib.add_variable(struct_asset, category, sub_category, sub_object, var.get("container", 0), False, friendly_name=var["name"])
+
+    def _apply_enum_op(self, enum_asset, op):
+        lib = unreal.PythonEnumLib
+        name, args = op[0], op[1:]
+        if name == "set_enum_description":
+            enum_asset.set_editor_property("enum_description", args[0])
+        else:
+            getattr(lib, name)(enum_asset, *args)
+
+    def _apply_struct_op(self, struct_asset, op):
+        lib = unreal.PythonStructLib
+        name, args = op[0], op[1:]
+        if name == "add_variable":
+            self._add_variable(struct_asset, args[0])
+        elif name == "change_variable_default_value":
+            lib.change_variable_default_value(struct_asset, lib.get_guid_from_friendly_name(struct_asset, args[0]), args[1])
+        else:
+            getattr(lib, name)(struct_asset, *args)
+
+    def _get_or_create(self, name:str, asset_class, factory, dry_run=False):
+        # dry run: a missing asset is reported as created, but the asset is None
+        path = self.asset_path(name)
+        if unreal.EditorAssetLibrary.does_asset_exist(path):
+            return unreal.load_asset(path), False
+        if dry_run:
+            return None, True
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        asset = asset_tools.create_asset(name, self.folder, asset_class, factory)
+        assert asset, f"Create asset failed: {path}"
+        return asset, True
+
+    def build(self, dry_run=False):
+        # return: the report of each asset, {"asset", "created", "ops", "plan_seconds", "apply_seconds"}
+        self.report = []
+        modified = []
+        # assets first, the struct variables may refer to the enums and the other structs
+        enums = [(spec,) + self._get_or_create(spec["name"], unreal.UserDefinedEnum, unreal.EnumFactory(), dry_run)
+                 for spec in self.schema.get("enums", [])]
+        structs = [(spec,) + self._get_or_create(spec["name"], unreal.UserDefinedStruct, unreal.StructureFactory(), dry_run)
+                   for spec in self.schema.get("structs", [])]
+
+        for spec, asset, created in enums:
+            t = time.time()
+            ops = plan_enum(read_enum_state(asset) if asset else EMPTY_ENUM_STATE, spec)
+            plan_seconds = time.time() - t
+            t = time.time()
+            if not dry_run:
+                for op in ops:
+                    self._apply_enum_op(asset, op)
+            self._add_report(spec["name"], created, ops, plan_seconds, time.time() - t)
+            if asset and (ops or created):
+                modified.append(asset)
+
+        for spec, asset, created in structs:
+            t = time.time()
+            ops = plan_struct(read_struct_state(asset) if asset else EMPTY_STRUCT_STATE, spec, self.prune)
+            plan_seconds = time.time() - t
+            t = time.time()
+            if not dry_run and ops:
+                for op in ops:
+                    self._apply_struct_op(asset, op)
+                write_struct_state(asset, spec)
+            self._add_report(spec["name"], created, ops, plan_seconds, time.time() - t)
+            if asset and (ops or created):
+                modified.append(asset)
+
+        t = time.time()
+        if modified and not dry_run:
+            unreal.EditorAssetLibrary.save_loaded_assets(modified, only_if_is_dirty=False)
+        save_seconds = time.time() - t
+        total_ops = sum(len(r["ops"]) for r in self.report)
+        print(f"SchemaBuilder: {len(self.report)} assets, {total_ops} ops, {len(modified)} saved in {save_seconds:.2f}s")
+        return self.report
+
+    def _add_report(self, name, created, ops, plan_seconds, apply_seconds):
+        self.report.append({"asset": self.asset_path(name), "created": created, "ops": ops
+                            , "plan_seconds": plan_seconds, "apply_seconds": apply_seconds})
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+
+try:
+    import unreal
+except ImportError:
+    unreal = None  # the parser works without the editor
+
+
+def _walk(value):
+    if isinstance(value, dict):
+        yield value
+        for v in value.values():
+            yield from _walk(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _walk(v)
+
+
+def parse_shader_map_info(text:str) -> dict:
+    # the json of get_shader_map_info -> {"name", "total", "by_vertex_factory": {vf: count}, "by_type": {shader type: count}}
+    # every object with a "VFType" is one shader, the type is in "ShaderType" or "Type"
+    info = json.loads(text) if text else {}
+    stats = {"name": "", "total": 0, "by_vertex_factory": {}, "by_type": {}}
+    for node in _walk(info):
+        if "ShaderMapName" in node and not stats["name"]:
+            stats["name"] = str(node["ShaderMapName"])
+        if "VFType" not in node:
+            continue
+        vf_type = str(node["VFType"]) or "None"
+        shader_type = str(node.get("ShaderType", node.get("Type", "")))
+        stats["total"] += 1
+        stats["by_vertex_factory"][vf_type] = stats["by_vertex_factory"].get(vf_type, 0) + 1
+        stats["by_type"][shader_type] = stats["by_type"].get(shader_type, 0) + 1
+    return stats
+
+
+def merge_counts(target:dict, counts:dict, scale=1):
+    for k, v in counts.items():
+        target[k] = target.get(k, 0) + v * scale
+    return target
+
+
+def switch_key(switch_values:[dict]) -> tuple:
+    # get_static_switch_parameter_values -> the overridden switches, one key for each static permutation
+    return tuple(sorted((str(v["name"]), bool(v["value"])) for v in switch_values if v.get("override", True)))
+
+
+def find_explosions(permutations:dict, max_permutations=8, max_shaders=5000) -> [dict]:
+    # permutations: {parent path: {"unique": n, "estimated_shaders": n, ...}}
+    flags = []
+    for parent, p in permutations.items():
+        if p["unique"] > max_permutations or p["estimated_shaders"] > max_shaders:
+            flags.append({"parent": parent, "unique": p["unique"], "estimated_shaders": p["estimated_shaders"]
+                          , "reason": "permutations" if p["unique"] > max_permutations else "shaders"})
+    return sorted(flags, key=lambda f: -f["estimated_shaders"])
+
+
+# editor side
+def _state_key(material, text_getter):
+    # UMaterial.StateId changes with each edit of the material. When it is not readable from python, saved packages
+    # use the file mtime and dirty ones the hash of the info text.
+    try:
+        return ("state_id", str(material.get_editor_property("state_id")))
+    except Exception:
+        pass
+    package_name = material.get_outermost().get_path_name()
+    dirty = any(package.get_path_name() == package_name for package in unreal.EditorLoadingAndSavingUtils.get_dirty_content_packages())
+    if not dirty and package_name.startswith("/Game/"):
+        file_path = os.path.join(unreal.SystemLibrary.get_project_content_directory(), package_name[len("/Game/"):] + ".uasset")
+        if os.path.exists(file_path):
+            return ("mtime", os.path.getmtime(file_path))
+    return ("text", hashlib.sha1(text_getter().encode("utf-8")).hexdigest())
+
+
+class ShaderStatsCache:
+    def __init__(self, platform="PCD3D_SM5"):
+        self.platform = platform
+        self.stats = {}  # material path: (state key, stats)
+        self.hits = 0
+        self.parses = 0
+
+    def get(self, material) -> dict:
+        path = material.get_path_name()
+        texts = []
+
+        def get_text():
+            if not texts:
+                texts.append(unreal.PythonMaterialLib.get_shader_map_info(material, self.platform) or "")
+            return texts[0]
+
+        key = _state_key(material, get_text)
+        cached = self.stats.get(path)
+        if cached and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        stats = parse_shader_map_info(get_text())
+        self.stats[path] = (key, stats)
+        self.parses += 1
+        return stats
+
+
+def analyze_folder(folder:str, cache:ShaderStatsCache=None, max_permutations=8, max_shaders=5000) -> dict:
+    # shader counts of the materials in a folder, the instances are grouped by parent material and static switches.
+    # get_shader_map_info reads the shader map of a UMaterial, so each static permutation is estimated with the
+    # shader count of its parent.
+    from .AssetSnapshot import get_class_name
+    cache = cache if cache else ShaderStatsCache()
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    report = {"materials": {}, "permutations": {}, "total_shaders": 0, "by_vertex_factory": {}, "by_type": {}}
+    instances = []
+    for asset_data in registry.get_assets_by_path(folder.rstrip("/"), recursive=True):
+        class_name = get_class_name(asset_data)
+        if class_name == "Material":
+            material = unreal.load_asset(str(asset_data.package_name))
+            report["materials"][material.get_path_name()] = cache.get(material)
+        elif class_name == "MaterialInstanceConstant":
+            instances.append(unreal.load_asset(str(asset_data.package_name)))
+
+    for mi in instances:
+        base = mi.get_base_material()
+        if not base:
+            continue
+        parent_path = base.get_path_name()
+        if parent_path not in report["materials"]:
+            report["materials"][parent_path] = cache.get(base)
+        p = report["permutations"].setdefault(parent_path, {"instances": 0, "keys": {}})
+        p["instances"] += 1
+        p["keys"].setdefault(switch_key(unreal.PythonMaterialLib.get_static_switch_parameter_values(mi)), []).append(mi.get_path_name())
+
+    for parent_path, p in report["permutations"].items():
+        # the instances without overridden switches share the shader map of the parent
+        p["unique"] = len([key for key in p["keys"] if key])
+        p["estimated_shaders"] = p["unique"] * report["materials"][parent_path]["total"]
+    for path, stats in report["materials"].items():
+        scale = 1 + report["permutations"].get(path, {}).get("unique", 0)
+        report["total_shaders"] += stats["total"] * scale
+        merge_counts(report["by_vertex_factory"], stats["by_vertex_factory"], scale)
+        merge_counts(report["by_type"], stats["by_type"], scale)
+    report["explosions"] = find_explosions(report["permutations"], max_permutations, max_shaders)
+    return report
@@ -4,12 +4,37 @@ import re
 import inspect
 import struct
 import json
+import time
 from typing import List
 
 from Utilities.Utils import EObjectFlags
 
 from .Utilities import get_latest_snaps, editor_snapshot, assert_ocr_text, py_task
-from .Utilities import get_ocr_from_file
+from .Utilities import get_ocr_from_file, get_screenshots_folder
+from . import LandscapeTiles
+from . import RenderTargetUtils
+from . import FrameBudget
+from . import Coroutines
+from . import DelayCalibration
+from . import FixtureCache
+from . import LevelFixtures
+from . import AssetSnapshot
+from . import AssetCleanup
+from . import HismInstances
+from . import HeightSampler
+from . import LineTraces
+from . import DependencyGraph
+from . import PropertySnapshot
+from . import DataTableBulk
+from . import DataTableSync
+from . import DataTableView
+from . import SchemaBuilder
+from . import MaterialGraphBuilder
+from . import ShaderMapStats
+from . import PermutationBenchmark
+from . import MeshEdits
+from . import MeshBatch
+from . import MeshBuffers
 
 
 import unreal
@@ -30,6 +55,17 @@ class TestPythonAPIs(metaclass=Singleton):
         self.temp_assets_folder = "/Game/_AssetsForTAPythonTestCase"
         self.temp_asset = None
         self.output_logs = ""
+        self.coroutine_runner = None
+        self.running_tasks = []  # the sliced and async test cases, TimeSlicedTask or CoroutineTask
+        # the deletes made by the fixtures are told to the snapshot, no stale asset data
+        self.asset_snapshot = AssetSnapshot.AssetSnapshot([self.temp_assets_folder])
+        self.fixture_cache = FixtureCache.FixtureCache(FixtureCache.EditorAssetRegistry(snapshot=self.asset_snapshot))
+        self.level_fixtures = LevelFixtures.LevelFixtures(snapshot=self.asset_snapshot)
+        self.step_index = 0
+        self.last_step_key = None
+        self.delay_mode = "static"
+        self.delay_calibration = DelayCalibration.DelayCalibration(os.path.join(unreal.SystemLibrary.get_project_directory()
+                                                                                , "Saved/TAPythonTestCase/DelayCalibration.json"))
 
     @staticmethod
     def get_instance_name():
@@ -169,7 +205,10 @@ class TestPythonAPIs(metaclass=Singleton):
         assert id >= 0
         self.current_task_id = id
         self.current_task_sum = 0
+        self.step_index = 0
+        self.last_step_key = None
         self.test_results = []
+        self.asset_snapshot.refresh()
         self.data.set_text(f"ResultBox_{id}", "-")
         unreal.PythonTestLib.clear_log_buffer()
         print("log buffer cleared")
@@ -178,8 +217,11 @@ class TestPythonAPIs(metaclass=Singleton):
         return True
 
 
-    def push_result(self, succ, msg=""):
+    def push_result(self, succ, msg="", bTaskResult=False):
+        # bTaskResult: the result of a sliced/async task, its step is ended in the task callback
         print("push_result call...")
+        if self.delay_mode == "record" and not bTaskResult:
+            self.delay_calibration.mark_result()
 
         self.test_results.append("PASS" if succ else "FAILED")
 
@@ -208,14 +250,111 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.add_log("PASS" if succ else "FAILED", level=-1 if succ else 2) # -1 green, 2 red
 
-    def push_call(self, py_cmd, delay_seconds:float):
+    def set_delay_mode(self, mode:str):
+        # "static": delays as written, "record": static delays and record step durations, "calibrated": learned delays
+        assert mode in ("static", "record", "calibrated"), f"Unknown delay mode: {mode}"
+        self.delay_mode = mode
+        if mode != "static":
+            self.delay_calibration.load()
+
+    def push_call(self, py_cmd, delay_seconds:float, bFixedDelay=False):
+        # bFixedDelay: the delay waits for something can't be recorded, like a notification fading in or a screenshot file
+        step_key = f"{self.current_task_id}/{self.step_index}:{py_cmd.split('(', 1)[0]}"
+        self.step_index += 1
+        if self.delay_mode == "calibrated" and not bFixedDelay:
+            delay_seconds = self.delay_calibration.delay_for(self.last_step_key, delay_seconds)
+        self.last_step_key = step_key
+
         self.current_task_sum += delay_seconds
         time_from_zero = self.current_task_sum
-        set_cmd = f"chameleon_general_test.set_output('process: {time_from_zero} / ' + str(round(chameleon_general_test.current_task_sum*10)/10) + '...')"
+        set_cmd = f"chameleon_general_test.set_output('process: {time_from_zero:.2f} / ' + str(round(chameleon_general_test.current_task_sum*10)/10) + '...')"
 
         unreal.PythonTestLib.delay_call(set_cmd, time_from_zero - delay_seconds)
+        if self.delay_mode == "record":
+            unreal.PythonTestLib.delay_call(f"chameleon_general_test.delay_calibration.begin({step_key!r})", time_from_zero)
         unreal.PythonTestLib.delay_call(py_cmd, time_from_zero)
-
+        if self.delay_mode == "record":
+            unreal.PythonTestLib.delay_call(f"chameleon_general_test.delay_calibration.end_of_call({step_key!r})", time_from_zero)
+
+
+    def run_sliced(self, method_name:str, budget_ms=8.0):
+        # method is a generator: yield between work units, return (succ, msgs) at the end
+        def _on_finished(task):
+            succ, msgs = task.result if task.result else (False, [])
+            if task.error:
+                succ = False
+                msgs.append(f"{method_name} failed: {task.error}")
+            report = task.report()
+            msgs.append(f"{report['units']} units in {report['ticks']} ticks, unit max: {report['max_unit_ms']:.2f}ms"
+                        f", mean: {report['mean_unit_ms']:.2f}ms")
+            self.delay_calibration.end_task(step_key)
+            self.push_result(succ, msgs, bTaskResult=True)
+
+        step_key = self.delay_calibration.start_task()
+        self.running_tasks.append(FrameBudget.run_time_sliced(getattr(self, method_name)(), budget_ms=budget_ms, on_finished=_on_finished))
+
+    def push_sliced_call(self, method, delay_seconds:float, budget_ms=8.0):
+        self.push_call(py_task(self.run_sliced, method_name=method.__name__, budget_ms=budget_ms), delay_seconds=delay_seconds)
+
+    def run_async(self, method_name:str):
+        # method is an "async def", awaits the waits in Coroutines and returns (succ, msgs)
+        def _on_finished(task):
+            succ, msgs = task.result if task.result else (False, [])
+            if task.error:
+                succ = False
+                msgs.append(f"{method_name} failed: {task.error}")
+            self.delay_calibration.end_task(step_key)
+            self.push_result(succ, msgs, bTaskResult=True)
+
+        step_key = self.delay_calibration.start_task()
+        self.spawn_task(getattr(self, method_name)(), on_finished=_on_finished)
+
+    def push_async_call(self, method, delay_seconds:float):
+        self.push_call(py_task(self.run_async, method_name=method.__name__), delay_seconds=delay_seconds)
+
+    def spawn_task(self, coro, on_finished=None, bRunning=True):
+        if self.coroutine_runner is None:
+            self.coroutine_runner = Coroutines.CoroutineRunner()
+        task = self.coroutine_runner.spawn(coro, on_finished=on_finished)
+        if bRunning:
+            self.running_tasks.append(task)
+        return task
+
+    def has_running_tasks(self) -> bool:
+        self.running_tasks = [task for task in self.running_tasks if not task.bFinished]
+        return bool(self.running_tasks)
+
+    def cancel_running_tasks(self, reason:str) -> int:
+        # the hung cases are stopped without result, so the cases and categories after them are not blocked
+        count = 0
+        for task in self.running_tasks:
+            if not task.bFinished:
+                task.cancel(reason)
+                count += 1
+        self.running_tasks = []
+        return count
+
+    def run_after_running(self, method_name:str, wait_timeout=300.0, **kwargs):
+        # wait for the sliced/async cases started before this step, the steps waiting in a row keep their order
+        previous = [task for task in self.running_tasks if not task.bFinished]
+        step_key = self.delay_calibration.start_task()
+
+        async def _wait_and_call():
+            try:
+                await Coroutines.wait_until(lambda: all(task.bFinished for task in previous), timeout=wait_timeout)
+            except TimeoutError:
+                count = self.cancel_running_tasks(f"timeout before {method_name}")
+                self.delay_calibration.end_task(step_key)
+                self.push_result(False, f"{method_name} skipped, {count} running cases not finished in {wait_timeout}s", bTaskResult=True)
+                return
+            with self.delay_calibration.running(step_key):
+                getattr(self, method_name)(**kwargs)
+            self.delay_calibration.end_task(step_key, bResult=False)
+
+        self.spawn_task(_wait_and_call())
+
+    def push_call_after_running(self, method, delay_seconds:float, wait_timeout=300.0, **kwargs):
+        self.push_call(py_task(self.run_after_running, method_name=method.__name__, wait_timeout=wait_timeout, **kwargs), delay_seconds=delay_seconds)
 
     def test_end(self, id:int):
         logs = unreal.PythonTestLib.get_logs()
@@ -224,13 +363,31 @@ class TestPythonAPIs(metaclass=Singleton):
                 self.add_log(line, level=2)
         assert id == self.current_task_id, f"id: {id} != self.current_task_id: {self.current_task_id}"
 
+        if self.delay_mode == "record":
+            self.delay_calibration.save()
+            self.add_log(f"Step durations saved: {self.delay_calibration.file_path}")
         self.set_output(f"Done. ID {id}")
         self.add_log(f"<-------------- TEST CATEGORY {id} FINISH\n\n", level=0)
 
         self.current_task_id = -1
 
-    def test_finish(self, id):
-        self.push_call(py_task(self.test_end, id=id), 0.1)
+    def test_finish(self, id, delay_seconds=0.1):
+        self.push_call(py_task(self.test_end, id=id), delay_seconds)
+
+    def test_finish_after_async(self, id, delay_seconds=0.1, wait_timeout=600.0):
+        # the sliced/async cases may run longer than the delays, the category ends after the last of them
+        self.push_call(py_task(self.end_after_async, id=id, wait_timeout=wait_timeout), delay_seconds)
+
+    def end_after_async(self, id:int, wait_timeout=600.0):
+        async def _wait_and_end():
+            try:
+                await Coroutines.wait_until(lambda: not self.has_running_tasks(), timeout=wait_timeout)
+            except TimeoutError:
+                count = self.cancel_running_tasks(f"timeout of category {id}")
+                self.push_result(False, f"{count} running cases not finished in {wait_timeout}s, cancelled", bTaskResult=True)
+            self.test_end(id)
+
+        self.spawn_task(_wait_and_end(), bRunning=False)
 
     def add_test_log(self, msg):
         self.add_log("\t> " + msg)
@@ -249,33 +406,54 @@ class TestPythonAPIs(metaclass=Singleton):
         label = 'This is a notification'
         self.push_call(py_task(unreal.PythonBPLib.notification, message=label, expire_duration=1.0, log_to_console=False), delay_seconds=0.1)
         self.push_call(py_task(self.add_test_log, msg="PythonBPLib.notification"),delay_seconds=0.01)
-        self.push_call(py_task(self.task_notification_snapshot), 1)
-        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2)
+        self.push_call(py_task(self.task_notification_snapshot), 1, bFixedDelay=True)
+        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2, bFixedDelay=True)
 
         # case 2, warning
         label = "This is a warning"
         self.push_call(py_task(unreal.PythonBPLib.notification, message=label, info_level=warning, log_to_console=False), delay_seconds=1)
         self.push_call(py_task(self.add_test_log, msg="PythonBPLib.notification warning"), delay_seconds=0.01)
-        self.push_call(py_task(self.task_notification_snapshot), 1)
-        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2)
+        self.push_call(py_task(self.task_notification_snapshot), 1, bFixedDelay=True)
+        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2, bFixedDelay=True)
 
         # case 3, Error
         label = "This is a Error message"
         self.push_call(py_task(unreal.PythonBPLib.notification, message=label, info_level=error, log_to_console=False), delay_seconds=1)
         self.push_call(py_task(self.add_test_log, msg="PythonBPLib.notification error"), delay_seconds=0.01)
-        self.push_call(py_task(self.task_notification_snapshot), 1)
-        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2)
+        self.push_call(py_task(self.task_notification_snapshot), 1, bFixedDelay=True)
+        self.push_call(py_task(self.check_notification_result, target_str=label, bStrict=True), 0.2, bFixedDelay=True)
 
         # case 4, hyperlink
         label = "This is a message with hyper link"  # ocr may break the label into 2 or more strings.
         self.push_call(py_task( unreal.PythonBPLib.notification, message=label, log_to_console=False, hyperlink_text="TAPython", on_hyperlink_click_command="print('link clicked.')"), delay_seconds=1)
         self.push_call(py_task(self.add_test_log, msg="PythonBPLib.notification with hyperlink"), delay_seconds=0.01)
-        self.push_call(py_task(self.task_notification_snapshot), 1)
-        self.push_call(py_task(self.assert_last_snap, assert_count=2, assert_strings=[label, "*"]), 0.2)
+        self.push_call(py_task(self.task_notification_snapshot), 1, bFixedDelay=True)
+        self.push_call(py_task(self.assert_last_snap, assert_count=2, assert_strings=[label, "*"]), 0.2, bFixedDelay=True)
+
+        # case 5, async: waits end as soon as the log and the snapshot file appear
+        self.push_async_call(self._testcase_notification_async, delay_seconds=1)
 
-        self.test_finish(category_id)
+        self.test_finish_after_async(category_id)
 
 
+    async def _testcase_notification_async(self):
+        succ, msgs = False, []
+        try:
+            label = "This is an async notification"
+            self.add_test_log("PythonBPLib.notification async")
+            unreal.PythonBPLib.notification(message=label, expire_duration=3.0, log_to_console=True)
+            line = await Coroutines.wait_for_log(label, timeout=3)
+            msgs.append(f"log: {line.strip()}")
+            await Coroutines.sleep(0.5)  # fade in of the notification
+            snap_image = await Coroutines.snapshot(get_screenshots_folder(), lambda: editor_snapshot(window_name=""), timeout=5)
+            result = assert_ocr_text(snap_image, label, bStrict=True)
+            msgs.append(result)
+            assert result == "PASS" or result.startswith("Warning"), f"ocr result: {result}"
+            succ = True
+        except (AssertionError, TimeoutError) as e:
+            msgs.append(str(e))
+        return succ, msgs
+
     def check_log_by_str(self, logs_target:[str]):
         succ, msg = False, ""
         try:
@@ -672,7 +850,7 @@ class TestPythonAPIs(metaclass=Singleton):
         self.test_being(id=id)
         # 1
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_get_all_worlds), delay_seconds=0.5)
         self.push_call(py_task(self.check_log_by_str, logs_target=[f"Test Result: StarterMap"]), delay_seconds=0.1)
         # 2
@@ -684,23 +862,24 @@ class TestPythonAPIs(metaclass=Singleton):
 
         # 5 get object by name
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_find_actor), delay_seconds=0.1)
 
         # 6 prerequisite pass #5 _testcase_find_actor
         self.push_call(py_task(self._testcase_create_folder_in_outliner), delay_seconds=0.1)
         # 7 world composition
         level_path = '/Game/_AssetsForTAPythonTestCase/Maps/DefaultMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
 
         level_path = '/Game/StarterContent/Maps/StarterMap'
         self.push_call(py_task(self._testcase_world_composition), delay_seconds=0.1)
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
 
-        self.push_call(py_task(self._testcase_capture), delay_seconds=0.1)
+        self.push_sliced_call(self._testcase_gc, delay_seconds=0.1, budget_ms=8)
+        self.push_call_after_running(self._testcase_capture, delay_seconds=0.1)
 
 
-        self.test_finish(id=id)
+        self.test_finish_after_async(id=id)
 
     def _testcase_fov(self):
         succ, msg = True, ""
@@ -842,7 +1021,7 @@ class TestPythonAPIs(metaclass=Singleton):
         self.test_being(id=id)
 
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.add_test_log("select_named_actor")
         self.push_call(py_task(unreal.PythonBPLib.select_named_actor, name="Floor_43"), delay_seconds=0.1)
         self.add_test_log("request_viewport_focus_on_selection")
@@ -994,6 +1173,51 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_dependency_graph(self):
+        succ, msgs = False, []
+        folder = "/Game/StarterContent"
+        mesh_asset_path = '/Game/StarterContent/Props/SM_Chair'
+        level_path = '/Game/StarterContent/Maps/StarterMap'
+        try:
+            t = time.time()
+            graph = DependencyGraph.build_from_registry([folder])
+            build_seconds = time.time() - t
+            assert len(graph) > 100, f"DependencyGraph nodes: {len(graph)} <= 100"
+
+            # same closures as get_all_deps/get_all_refs, in the swept folder
+            self.add_test_log("get_all_deps")
+            t = time.time()
+            deps, _ = unreal.PythonBPLib.get_all_deps(mesh_asset_path, recursive=True)
+            refs, _ = unreal.PythonBPLib.get_all_refs(mesh_asset_path, recursive=True)
+            api_seconds = time.time() - t
+
+            t = time.time()
+            graph_deps = graph.deps(mesh_asset_path)
+            graph_refs = graph.refs(mesh_asset_path)
+            graph_seconds = time.time() - t
+            in_folder = lambda paths: {p for p in paths if p.startswith(folder + "/")}
+            assert in_folder(graph_deps) == in_folder(deps), f"deps diff: {in_folder(graph_deps) ^ in_folder(deps)}"
+            assert in_folder(graph_refs) == in_folder(refs), f"refs diff: {in_folder(graph_refs) ^ in_folder(refs)}"
+            assert level_path in graph_refs, f"Can't find level: {level_path} in graph refs"
+            msgs.append(f"build: {build_seconds:.2f}s, closures api: {api_seconds * 1000:.1f}ms vs graph: {graph_seconds * 1000:.1f}ms")
+
+            unused = graph.unused([level_path], prefix=folder + "/Props/")
+            assert mesh_asset_path not in unused, f"{mesh_asset_path} used by {level_path} is in unused"
+            msgs.append(f"{len(unused)} assets in Props are not used by {level_path}")
+
+            # warm start
+            file_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/TAPythonTestCase/DependencyGraph.json")
+            loaded = DependencyGraph.DependencyGraph.load(graph.save(file_path))
+            assert loaded.deps(mesh_asset_path) == graph_deps, "deps of loaded graph are different"
+            DependencyGraph.update_package(loaded, mesh_asset_path)
+            assert set(loaded.deps(mesh_asset_path)) == set(graph_deps), "deps after update_package are different"
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
     def _testcase_asset_exists(self):
         succ, msgs = False, []
         texture_asset_path = "/Game/StarterContent/Textures/T_Shelf_M"
@@ -1042,6 +1266,7 @@ class TestPythonAPIs(metaclass=Singleton):
             if unreal.EditorAssetLibrary.does_asset_exist(math_path):
                 self.add_test_log("delete_asset")
                 unreal.PythonBPLib.delete_asset(math_path, show_confirmation=False)
+                self.asset_snapshot.on_asset_removed(math_path)
 
             my_mat = asset_tools.create_asset(mat_name, folder, unreal.Material, unreal.MaterialFactoryNew())
             unreal.EditorAssetLibrary.save_asset(my_mat.get_path_name())
@@ -1250,6 +1475,57 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_property_snapshot(self):
+        succ, msgs = False, []
+        bp_actors = []
+        try:
+            assert PropertySnapshot.bNumpy, "Need 3rd package: numpy"
+            test_bp = unreal.load_asset('/Game/_AssetsForTAPythonTestCase/BP/BP_C')
+            assert test_bp, "test_bp assert None"
+            mesh = unreal.load_asset('/Game/StarterContent/Props/SM_Lamp_Ceiling')
+            assert mesh, f"mesh: SM_Lamp_Ceiling None"
+
+            bp_actors = [unreal.PythonBPLib.spawn_actor_from_object(test_bp, unreal.Vector(i * 100, -1000, 0)) for i in range(100)]
+            assert all(bp_actors), "spawn bp_actors failed"
+            property_names = ["AStringValue", "ABoolValue", "AIntValue", "AFloatValue", "AVectorValue", "AMeshValue"]
+            self.add_test_log("get_all_property_names")
+            before = PropertySnapshot.PropertySnapshot.capture(bp_actors, property_names)
+            layout = before.groups[bp_actors[0].get_class().get_path_name()].layout
+            assert len(layout) == len(property_names), f"resolved properties: {len(layout)} != {len(property_names)}, skipped: {layout.skipped}"
+
+            unreal.PythonBPLib.set_string_property(bp_actors[1], "AStringValue", "SomeValueFromPython")
+            unreal.PythonBPLib.set_bool_property(bp_actors[2], "ABoolValue", True)
+            unreal.PythonBPLib.set_int_property(bp_actors[3], "AIntValue", 45678)
+            unreal.PythonBPLib.set_float_property(bp_actors[4], "AFloatValue", 123.45)
+            unreal.PythonBPLib.set_vector_property(bp_actors[5], "AVectorValue", unreal.Vector.ONE)
+            unreal.PythonBPLib.set_object_property(bp_actors[6], "AMeshValue", mesh)
+            expected = {(bp_actors[i].get_path_name(), name) for i, name in enumerate(property_names, start=1)}
+
+            after = PropertySnapshot.PropertySnapshot.capture(bp_actors, property_names)
+            diff = before.diff(after)
+            changed = {(actor_key, name) for actor_key, name, _, _ in diff["changed"]}
+            assert changed == expected, f"diff: {changed ^ expected}"
+            assert not diff["added"] and not diff["removed"], f"added: {diff['added']}, removed: {diff['removed']}"
+            assert after.get(bp_actors[6].get_path_name(), "AMeshValue") == mesh.get_path_name(), "AMeshValue in snapshot != mesh"
+            msgs.append(f"{after.report()['values']} values in {after.capture_seconds * 1000:.1f}ms, {len(diff['changed'])} changes")
+
+            # all the resolvable properties of the level actors
+            level_actors = unreal.EditorLevelLibrary.get_all_level_actors()
+            level_snapshot = PropertySnapshot.PropertySnapshot.capture(level_actors)
+            report = level_snapshot.report()
+            assert not level_snapshot.diff(PropertySnapshot.PropertySnapshot.capture(level_actors))["changed"], "level changed without edit"
+            msgs.append(f"level: {report['actors']} actors, {report['classes']} classes, {report['values']} values in {report['capture_seconds']:.2f}s")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+        finally:
+            for actor in bp_actors:
+                if actor:
+                    actor.destroy_actor()
+
+        self.push_result(succ, msgs)
+
     def _testcase_save_thumbnail(self):
         succ, msgs = False, []
         try:
@@ -1296,8 +1572,9 @@ class TestPythonAPIs(metaclass=Singleton):
         self.push_call(py_task(self.check_error_in_log), delay_seconds=0.2)
 
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_select_assets), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_dependency_graph), delay_seconds=0.1)
         # self.push_call(py_task(self._testcase_content_browser), delay_seconds=0.3)
 
         texture_asset_path = "/Game/StarterContent/Textures/T_Shelf_M"
@@ -1351,13 +1628,14 @@ class TestPythonAPIs(metaclass=Singleton):
         self.push_call(py_task(self._testcase_close_bp_diff_window), delay_seconds=0.5)
 
         self.push_call(py_task(self._testcase_function_and_property), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_property_snapshot), delay_seconds=0.1)
 
         self.push_call(py_task(self.check_error_in_log), delay_seconds=0.2)
 
         self.push_call(py_task(self._testcase_save_thumbnail), delay_seconds=0.1)
 
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_export_map), delay_seconds=0.5)
 
         self.test_finish(id=id)
@@ -1407,15 +1685,19 @@ class TestPythonAPIs(metaclass=Singleton):
         self.push_result(succ, msgs)
 
     def _testcase_gc(self):
+        # run with push_sliced_call
         succ, msgs = False, []
         try:
             for i in range(10000):
                 o = unreal.Actor()
+                if i % 500 == 499:
+                    yield
+            self.add_test_log("gc")
             unreal.PythonBPLib.gc(0)
             succ = True
         except AssertionError as e:
             msgs.append(str(e))
-        self.push_result(succ, msgs)
+        return succ, msgs
 
     def _testcase_redirectors(self):
         succ, msgs = False, []
@@ -1457,6 +1739,7 @@ class TestPythonAPIs(metaclass=Singleton):
                         asset = None
                         self.add_test_log("delete_asset")
                         unreal.PythonBPLib.delete_asset(path, show_confirmation=False)
+                        self.asset_snapshot.on_asset_removed(path)
             succ = True
             msgs.append("ori material deleted")
         except AssertionError as e:
@@ -1475,6 +1758,7 @@ class TestPythonAPIs(metaclass=Singleton):
 
             if unreal.EditorAssetLibrary.does_asset_exist(mat_path):
                 unreal.PythonBPLib.delete_asset(mat_path, show_confirmation=False)
+                self.asset_snapshot.on_asset_removed(mat_path)
 
             my_mat = asset_tools.create_asset(mat_name, folder, unreal.Material, unreal.MaterialFactoryNew())
             unreal.EditorAssetLibrary.save_asset(my_mat.get_path_name())
@@ -1534,11 +1818,11 @@ class TestPythonAPIs(metaclass=Singleton):
     def test_category_redirector(self, id):
         self.test_being(id=id)
         level_path = '/Game/_AssetsForTAPythonTestCase/Maps/NewMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_clearup_material), delay_seconds=0.1)
 
         level_path = '/Game/_AssetsForTAPythonTestCase/Maps/NewMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
 
         self.push_call(py_task(self._testcase_create_mat_redirector), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_fixup_redirector), delay_seconds=0.5)
@@ -1547,61 +1831,68 @@ class TestPythonAPIs(metaclass=Singleton):
 
 
     def _delete_assets(self, asset_paths : List[str]):
-        for path in asset_paths:
-            if unreal.EditorAssetLibrary.does_asset_exist(path):
-                unreal.PythonBPLib.delete_asset(path, show_confirmation=False)
-                print(f"== Delete: {path}")
+        result = AssetCleanup.delete_assets_batched(asset_paths, snapshot=self.asset_snapshot)
+        for path in result["targets"]:
+            print(f"== Delete: {path}")
+
+    def _user_enum_spec(self) -> dict:
+        items = ["A", "BB", "CCC", "DDDD", "EEEEE"]
+        return {"items": items, "move": [1, 3], "bitflags": True
+                , "display_names": [f"iAmItem_{i}" for i in range(len(items))]
+                , "descriptions": [f"item description {i}" for i in range(len(items))]
+                , "enum_description": "Enum Description"}
+
+    def _build_user_enum(self, enum_path, spec):
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        folder, enum_name = enum_path.rsplit("/", 1)
+        created_enum = asset_tools.create_asset(enum_name, folder, unreal.UserDefinedEnum, unreal.EnumFactory())
+        assert created_enum, "created_enum_failed"
+
+        self.add_test_log("set_enum_items")
+        unreal.PythonEnumLib.set_enum_items(created_enum, spec["items"])
+
+        self.add_test_log("move_enum_item")
+        unreal.PythonEnumLib.move_enum_item(created_enum, *spec["move"])
+
+        self.add_test_log("is_bitflags_type")
+        bBitFlats = unreal.PythonEnumLib.is_bitflags_type(created_enum)
+        assert bBitFlats == False, f"created_enum bitflags assert failed,  current: {bBitFlats}"
+        self.add_test_log("set_bitflags_typ")
+        unreal.PythonEnumLib.set_bitflags_type(created_enum, spec["bitflags"])
+        return created_enum
 
     def _testcase_user_defined_enum(self):
         succ, msgs = False, []
         try:
-            asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
-            # 1 create a enum
+            # 1 create a enum, or reuse the one built from the same spec
             enum_name = "IAmAEnum"
             enum_path = f"{self.temp_assets_folder}/{enum_name}"
-            # assert False == unreal.EditorAssetLibrary.does_asset_exist(enum_path), f"enum has already exists: {enum_path}"
-            created_enum = asset_tools.create_asset(enum_name, self.temp_assets_folder, unreal.UserDefinedEnum, unreal.EnumFactory())
-            assert created_enum, "created_enum_failed"
-            msgs.append("Enum created.")
+            spec = self._user_enum_spec()
+            created_enum, bBuilt = self.fixture_cache.get_or_build(enum_path, spec, self._build_user_enum)
+            assert created_enum, "created_enum None"
+            msgs.append("Enum created." if bBuilt else "Enum cached.")
             self.add_test_log("set_selected_assets_by_paths")
             unreal.PythonBPLib.set_selected_assets_by_paths([enum_path])
-            # unreal.EditorAssetLibrary.save_asset(created_enum.get_path_name())
-
-            # 2 Set items
-            assert created_enum, "created_enum None"
-            items = ["A", "BB", "CCC", "DDDD", "EEEEE"]
-            self.add_test_log("set_enum_items")
-            unreal.PythonEnumLib.set_enum_items(created_enum, items)
-            msgs.append(f"Enum items set.")
 
-            # 3 move item
-            self.add_test_log("move_enum_item")
-            unreal.PythonEnumLib.move_enum_item(created_enum, 1, 3)
-            msgs.append(f"Enum item moved.")
-
-            # 4 bigflags
+            # 2 bigflags, set in the build
             self.add_test_log("is_bitflags_type")
             bBitFlats = unreal.PythonEnumLib.is_bitflags_type(created_enum)
-            assert bBitFlats == False, f"created_enum bitflags assert failed,  current: {bBitFlats}"
-
-            self.add_test_log("set_bitflags_typ")
-            unreal.PythonEnumLib.set_bitflags_type(created_enum, True)
-            assert bBitFlats == False, f"created_enum bitflags assert failed, after set,  current: {bBitFlats}"
+            assert bBitFlats == spec["bitflags"], f"created_enum bitflags assert failed, after set,  current: {bBitFlats}"
             msgs.append(f"Enum bitflags set.")
-            # 5
+            # 3 names, set again on a cached enum, the same values
             self.add_test_log("set_display_name")
             self.add_test_log("set_description_by_index")
-            for i in range(len(items)):
-                unreal.PythonEnumLib.set_display_name(created_enum, i, "iAmItem_{}".format(i))
-                unreal.PythonEnumLib.set_description_by_index(created_enum, i, f"item description {i}")
+            for i in range(len(spec["items"])):
+                unreal.PythonEnumLib.set_display_name(created_enum, i, spec["display_names"][i])
+                unreal.PythonEnumLib.set_description_by_index(created_enum, i, spec["descriptions"][i])
 
-            created_enum.set_editor_property("enum_description", "Enum Description")
+            created_enum.set_editor_property("enum_description", spec["enum_description"])
             msgs.append(f"Enum names set.")
 
-            # 6 check
-            moved_order = [i for i in range(5)]
-            temp = moved_order.pop(1)
-            moved_order.insert(3, temp)
+            # 4 check
+            moved_order = [i for i in range(len(spec["items"]))]
+            temp = moved_order.pop(spec["move"][0])
+            moved_order.insert(spec["move"][1], temp)
 
             for i in range(unreal.PythonEnumLib.get_enum_len(created_enum)):
                 if i == 0:
@@ -1646,44 +1937,108 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _user_struct_spec(self) -> dict:
+        # [category, sub category, sub category object, container type, is reference, friendly name], 1: array
+        if unreal.PythonBPLib.get_unreal_version()["major"] == 5:
+            float_var = ["real", "double", None, 1, False, "my_float_vars"]
+        else:
+            float_var = ["float", "", None, 1, False, "my_float_vars"]
+        return {"variables": [float_var
+                            , ["bool", "", None, 0, False, "my_bool_var"]
+                            , ["struct", "", "Transform", 0, False, "my_transform_var"]
+                            , ["object", "", "StaticMesh", 0, False, "my_mesh_var"]
+                            , ["object", "", "StaticMesh", 0, False, "another_mesh_var"]]
+                # [key category, sub category, sub category object, value category, sub category, sub category object, is reference, friendly name]
+                , "map_variables": [["name", "", None, "object", "", "StaticMesh", False, "name_to_mesh_dict"]]
+                , "remove": ["another_mesh_var"]
+                , "defaults": {"my_transform_var": "0, 1, 2|20, 30, 10|1, 2, 3"}
+                , "rename_prefix": "renamed_"}
+
+    def _build_user_struct(self, struct_path, spec):
+        def _type_object(name):
+            if not name:
+                return None
+            t = getattr(unreal, name)
+            return t.static_struct() if hasattr(t, "static_struct") else t.static_class()
+
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        folder, struct_name = struct_path.rsplit("/", 1)
+        created_struct = asset_tools.create_asset(struct_name, folder, unreal.UserDefinedStruct, unreal.StructureFactory())
+        assert created_struct, "created_struct_failed"
+        # 1 add items
+        self.add_test_log("add_variable")
+        for category, sub_category, sub_category_object, container_type_value, is_reference, friendly_name in spec["variables"]:
+            unreal.PythonStructLib.add_variable(created_struct, category=category, sub_category=sub_category
+                                                , sub_category_object=_type_object(sub_category_object)
+                                                , container_type_value=container_type_value
+                                                , is_reference=is_reference, friendly_name=friendly_name)
+        self.add_test_log("add_directory_variable")
+        for category, sub_category, sub_category_object, terminal_category, terminal_sub_category, terminal_sub_category_object \
+                , is_reference, friendly_name in spec["map_variables"]:
+            unreal.PythonStructLib.add_directory_variable(created_struct, category=category, sub_category=sub_category
+                                                          , sub_category_object=_type_object(sub_category_object)
+                                                          , terminal_category=terminal_category, terminal_sub_category=terminal_sub_category
+                                                          , terminal_sub_category_object=_type_object(terminal_sub_category_object)
+                                                          , is_reference=is_reference, friendly_name=friendly_name)
+
+        # 2.remove the default bool variable
+        self.add_test_log("remove_variable_by_name")
+        unreal.PythonStructLib.remove_variable_by_name(created_struct, unreal.PythonStructLib.get_variable_names(created_struct)[0])
+
+        # 3. default value of var
+        for friendly_name, value in spec["defaults"].items():
+            self.add_test_log("get_guid_from_friendly_name")
+            guid = unreal.PythonStructLib.get_guid_from_friendly_name(created_struct, friendly_name)
+            self.add_test_log("get_variable_default_value")
+            default_value = unreal.PythonStructLib.get_variable_default_value(created_struct, guid)
+            print(f"default_value: {default_value}")
+            if friendly_name == "my_transform_var":
+                if unreal.PythonBPLib.get_unreal_version()["major"] == 5:
+                    assert default_value == '0.000000,0.000000,0.000000|0.000000,0.000000,-0.000000|1.000000,1.000000,1.000000', f"default_value: {default_value} assert failed"
+                else:
+                    # unreal 4 default value is ""
+                    assert default_value == '', f"default_value: {default_value} assert failed"
+            self.add_test_log("change_variable_default_value")
+            unreal.PythonStructLib.change_variable_default_value(created_struct, guid, value)
+
+        # 4. remove
+        friend_names = unreal.PythonStructLib.get_friendly_names(created_struct)
+        for friendly_name in spec["remove"]:
+            assert friendly_name in friend_names, f"{friendly_name} not in friend names"
+            need_remove_var_name = None
+            for name in unreal.PythonStructLib.get_variable_names(created_struct):
+                if str(name).startswith(friendly_name):
+                    need_remove_var_name = name
+            assert need_remove_var_name, f"Can't find {friendly_name}"
+            self.add_test_log("remove_variable_by_name")
+            unreal.PythonStructLib.remove_variable_by_name(created_struct, need_remove_var_name)
+
+        # 5. rename
+        for i, name in enumerate(unreal.PythonStructLib.get_friendly_names(created_struct)):
+            if i == 0:
+                self.add_test_log("get_guid_from_property_name")
+            guid = unreal.PythonStructLib.get_guid_from_property_name(name)
+            if i == 0:
+                self.add_test_log("rename_variable")
+            unreal.PythonStructLib.rename_variable(created_struct, guid, f"{spec['rename_prefix']}{name}")
+        return created_struct
+
     def _testcase_user_defined_struct(self):
         succ, msgs = False, []
         try:
-            asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
-            # 1 create a struct
+            # 1 create a struct, or reuse the one built from the same spec
             struct_name = "IAmAStruct"
             struct_path = f"{self.temp_assets_folder}/{struct_name}"
             msgs.append(f"struct_path: {struct_path}")
-            created_struct = asset_tools.create_asset(struct_name, self.temp_assets_folder, unreal.UserDefinedStruct, unreal.StructureFactory())
-            assert created_struct, "created_struct_failed"
-            msgs.append("Struct created.")
-            # 2 add items
-            self.add_test_log("add_variable")
-            if unreal.PythonBPLib.get_unreal_version()["major"]==5:
-                unreal.PythonStructLib.add_variable(created_struct, category="real", sub_category="double" ,
-                                                sub_category_object=None, container_type_value=1, # array
-                                                is_reference=False, friendly_name="my_float_vars")
-            else:
-                unreal.PythonStructLib.add_variable(created_struct, category="float", sub_category="",
-                                                    sub_category_object=None, container_type_value=1,  # array
-                                                    is_reference=False, friendly_name="my_float_vars")
-
-            unreal.PythonStructLib.add_variable(created_struct, "bool", "", None, 0, False, friendly_name="my_bool_var")
-            unreal.PythonStructLib.add_variable(created_struct, "struct", "", unreal.Transform.static_struct(), 0, False, "my_transform_var")
-            unreal.PythonStructLib.add_variable(created_struct, "object", "", unreal.StaticMesh.static_class(), 0, False, "my_mesh_var")
-            unreal.PythonStructLib.add_variable(created_struct, "object", "", unreal.StaticMesh.static_class(), 0, False, "another_mesh_var")
-            self.add_test_log("add_directory_variable")
-            unreal.PythonStructLib.add_directory_variable(created_struct, category="name", sub_category="", sub_category_object=None
-                                                          , terminal_category="object", terminal_sub_category="",
-                                                          terminal_sub_category_object=unreal.StaticMesh.static_class()
-                                                          , is_reference=False, friendly_name="name_to_mesh_dict")
-
-            # 3.remove the default bool variable, and save the struct
-            self.add_test_log("remove_variable_by_name")
-            unreal.PythonStructLib.remove_variable_by_name(created_struct, unreal.PythonStructLib.get_variable_names(created_struct)[0])
-            msgs.append("Remove default bool var.")
-
-            # 4. log_var_desc
+            spec = self._user_struct_spec()
+            if not self.fixture_cache.is_valid(struct_path, spec):
+                # the datatable of the struct is built again too, delete them in one batch
+                AssetCleanup.delete_assets_batched([f"{self.temp_assets_folder}/IAmADataTable", struct_path], snapshot=self.asset_snapshot)
+            created_struct, bBuilt = self.fixture_cache.get_or_build(struct_path, spec, self._build_user_struct)
+            assert created_struct, "created_struct None"
+            msgs.append("Struct created." if bBuilt else "Struct cached.")
+
+            # 2. log_var_desc
             self.add_test_log("clear_log_buffer")
             unreal.PythonTestLib.clear_log_buffer()
             self.add_test_log("log_var_desc")
@@ -1694,7 +2049,7 @@ class TestPythonAPIs(metaclass=Singleton):
             assert "Var 0: my_float_vars" in logs[0], "Can't find: Var 0: my_float_vars"
 
             print("-" * 80)
-            # 5
+            # 3
             unreal.PythonTestLib.clear_log_buffer()
             self.add_test_log("log_var_desc_by_friendly_name")
             unreal.PythonStructLib.log_var_desc_by_friendly_name(created_struct, "my_transform_var")
@@ -1707,67 +2062,37 @@ class TestPythonAPIs(metaclass=Singleton):
             assert "FriendlyName" in description, "FriendlyName not in get_variable_description()"
             assert description["FriendlyName"] == "my_transform_var", "Friendly Name != my_transform_var"
             msgs.append("Get var desc.")
-            # 6
+            # 4
             self.add_test_log("get_guid_from_friendly_name")
             guid = unreal.PythonStructLib.get_guid_from_friendly_name(created_struct, "my_transform_var")
             assert description["VarGuid"] == guid.to_string(), f"VarGuid in description: {description['VarGuid']} != {str(guid)}"
             msgs.append("get_guid_from_friendly_name.")
 
-            #7
+            #5
             self.add_test_log("is_unique_friendly_name")
             assert False == unreal.PythonStructLib.is_unique_friendly_name(created_struct, "my_transform_var"), "my_transform_var not unique friendly name"
             assert unreal.PythonStructLib.is_unique_friendly_name(created_struct, "my_dict_var"), "my_transform_var is not unique friendly name"
-            # 8 default value of var
-            self.add_test_log("get_guid_from_friendly_name")
-            transform_guid = unreal.PythonStructLib.get_guid_from_friendly_name(created_struct, "my_transform_var")
-            print(f"get_guid_from_friendly_name: {transform_guid}")
-            self.add_test_log("get_variable_default_value by transform_guid")
-            defualt_value = unreal.PythonStructLib.get_variable_default_value(created_struct, transform_guid)
-            self.add_test_log("get_variable_default_value")
-            print(f"defualt_value: {defualt_value}")
-            if unreal.PythonBPLib.get_unreal_version()["major"] == 5:
-                assert defualt_value == '0.000000,0.000000,0.000000|0.000000,0.000000,-0.000000|1.000000,1.000000,1.000000', f"default_value: {defualt_value} assert failed"
-            else:
-                # unreal 4 default value is ""
-                assert defualt_value == '', f"default_value: {defualt_value} assert failed"
-            self.add_test_log("change_variable_default_value")
-            unreal.PythonStructLib.change_variable_default_value(created_struct, transform_guid
-                                                            , "0, 1, 2|20, 30, 10|1, 2, 3")
+            # 6 default value of var, changed in the build
             self.add_test_log("get_variable_default_value 2")
-            new_defualt_value = unreal.PythonStructLib.get_variable_default_value(created_struct, transform_guid)
+            new_defualt_value = unreal.PythonStructLib.get_variable_default_value(created_struct, guid)
             assert new_defualt_value == '0.000000,1.000000,2.000000|20.000000,30.000000,10.000000|1.000000,2.000000,3.000000' or new_defualt_value == "0, 1, 2|20, 30, 10|1, 2, 3"\
                     , f"new_defualt_value assert failed: {new_defualt_value} len:{len(new_defualt_value)}"
 
             msgs.append("log var. ")
 
-            # 9. names
+            # 7. names
             self.add_test_log("get_friendly_names")
             friend_names = unreal.PythonStructLib.get_friendly_names(created_struct)
             self.add_test_log("get_variable_names")
             var_names = unreal.PythonStructLib.get_variable_names(created_struct)
             assert len(friend_names) == len(var_names), f"len(friend_names): {len(friend_names)} != len(var_names): {len(var_names)}"
+            assert len(friend_names) == len(spec["variables"]) + len(spec["map_variables"]) - len(spec["remove"]) \
+                , f"var count: {len(friend_names)}, after remove: {spec['remove']}"
 
-            assert "another_mesh_var" in friend_names, "another_mesh_var not in friend names"
-
-            # 10. remove
-            need_remove_var_name = None
-            for name in unreal.PythonStructLib.get_variable_names(created_struct):
-                if str(name).startswith("another_mesh_var"):
-                    need_remove_var_name = name
-            assert need_remove_var_name, "Can't find another mesh var"
-            self.add_test_log("remove_variable_by_name")
-            unreal.PythonStructLib.remove_variable_by_name(created_struct, need_remove_var_name)
-            assert "another_mesh_var" not in unreal.PythonStructLib.get_friendly_names(created_struct), "Still 'another_mesh_var' var in struct"
+            # 8. removed in the build
+            assert "another_mesh_var" not in friend_names, "Still 'another_mesh_var' var in struct"
             msgs.append("remove var.")
 
-            for i, name in enumerate(unreal.PythonStructLib.get_friendly_names(created_struct)):
-                if i == 0:
-                    self.add_test_log("get_guid_from_property_name")
-                guid = unreal.PythonStructLib.get_guid_from_property_name(name)
-                if i == 0:
-                    self.add_test_log("rename_variable")
-                unreal.PythonStructLib.rename_variable(created_struct, guid, f"renamed_{name}")
-
             unreal.EditorAssetLibrary.save_asset(struct_path)
 
             succ = True
@@ -1775,66 +2100,114 @@ class TestPythonAPIs(metaclass=Singleton):
             msgs.append(str(e))
         self.push_result(succ, msgs)
 
+    def _user_datatable_spec(self) -> dict:
+        value_str = '(("Chair", StaticMesh\'"/Game/StarterContent/Props/SM_Chair.SM_Chair"\'),("Cube", StaticMesh\'"/Engine/BasicShapes/Cube.Cube"\'))'
+        # the struct spec in it: a changed struct builds the datatable again
+        return {"struct": f"{self.temp_assets_folder}/IAmAStruct", "struct_spec": self._user_struct_spec()
+                , "rows": ["MyRow_0", "MyRow_1", "MyRow_2"]
+                # [row name, up, rows to move by, row names after]
+                , "moves": [["MyRow_0", False, 2, ["MyRow_1", "MyRow_2", "MyRow_0"]]
+                          , ["MyRow_2", False, 1, ["MyRow_1", "MyRow_0", "MyRow_2"]]
+                          , ["MyRow_0", True, 1, ["MyRow_0", "MyRow_1", "MyRow_2"]]]
+                , "remove": "MyRow_1", "rename": ["MyRow_2", "MyRow_1"]
+                , "values_at": [[0, 0, '(1.1, 2.2, 3.3)'], [1, 1, 'True']]
+                , "values": [["MyRow_0", "my_bool_var", 'True']
+                           , ["MyRow_0", "my_mesh_var", "StaticMesh'/Game/StarterContent/Props/SM_TableRound.SM_TableRound'"]
+                           , ["MyRow_0", "my_transform_var", '(Rotation=(X=0,Y=0,Z=0,W=1),Translation=(X=7,Y=7,Z=7),Scale3D=(X=1,Y=1,Z=1))']
+                           , ["MyRow_1", "name_to_mesh_dict", value_str]]
+                , "duplicate": ["MyRow_1", "DuplicatedRow_2"]}
+
+    def _set_user_datatable_values(self, datatable, spec):
+        self.add_test_log("set_property_by_string_at")
+        for row_index, column_index, value in spec["values_at"]:
+            unreal.PythonDataTableLib.set_property_by_string_at(datatable, row_index=row_index, column_index=column_index, value_as_string=value)
+        self.add_test_log("set_property_by_string")
+        for row_name, column_name, value in spec["values"]:
+            unreal.PythonDataTableLib.set_property_by_string(datatable, row_name=row_name, column_name=column_name, value_as_string=value)
+
+    def _build_user_datatable(self, datatable_path, spec):
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        folder, datatable_name = datatable_path.rsplit("/", 1)
+        factory = unreal.DataTableFactory()
+        factory.struct = unreal.load_asset(spec["struct"])
+        created_datatable = asset_tools.create_asset(datatable_name, folder, unreal.DataTable, factory)
+        assert created_datatable, "created_datatable_failed"
+
+        # 1. add row
+        for i, row_name in enumerate(spec["rows"]):
+            if i == 0:
+                self.add_test_log("add_row")
+            unreal.PythonDataTableLib.add_row(created_datatable, row_name)
+
+        self.add_test_log("get_row_names")
+        row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
+        assert len(row_names) == len(spec["rows"]), f"len(row_names): {len(row_names)} != {len(spec['rows'])}"
+        for i in range(len(row_names)):
+            if i == 0:
+                self.add_test_log("get_row_name")
+            _row_name = unreal.PythonDataTableLib.get_row_name(created_datatable, i)
+            assert _row_name == row_names[i], f"get_row_name: {_row_name} != get_row_names[i]: {row_names[i]}"
+
+        # 2. move row, back to 0, 1, 2
+        self.add_test_log("move_row")
+        for row_name, up, num_rows_to_move_by, names_after in spec["moves"]:
+            unreal.PythonDataTableLib.move_row(created_datatable, row_name, up=up, num_rows_to_move_by=num_rows_to_move_by)
+            assert unreal.PythonDataTableLib.get_row_names(created_datatable) == names_after \
+                , f"Row not match after move {row_name} {'up' if up else 'down'} {num_rows_to_move_by}"
+
+        # 3. remove row
+        self.add_test_log("remove_row")
+        unreal.PythonDataTableLib.remove_row(created_datatable, spec["remove"])
+        row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
+        assert row_names == ["MyRow_0", "MyRow_2"], "row name assert failed: {}".format(" ,".join(row_names))
+
+        # 4. rename
+        self.add_test_log("rename_row")
+        unreal.PythonDataTableLib.rename_row(created_datatable, *spec["rename"])
+        row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
+        assert row_names == ["MyRow_0", "MyRow_1"], "row name assert failed: {}".format(" ,".join(row_names))
+
+        # 5. property
+        self.add_test_log("get_property_as_string_at")
+        ori_property = unreal.PythonDataTableLib.get_property_as_string_at(created_datatable, row_id=0, column_id=0)
+        assert ori_property == "", f"ori_property: != empty"
+        self._set_user_datatable_values(created_datatable, spec)
+
+        # 6. duplicate
+        from_row, to_row = spec["duplicate"]
+        self.add_test_log("duplicate_row")
+        unreal.PythonDataTableLib.duplicate_row(created_datatable, from_row, to_row)
+        self.add_test_log("get_property_as_string")
+        value_str = unreal.PythonDataTableLib.get_property_as_string(created_datatable, row_name=from_row, column_name="name_to_mesh_dict")
+        after_duplicate_str = unreal.PythonDataTableLib.get_property_as_string(created_datatable, row_name=to_row, column_name="name_to_mesh_dict")
+        assert value_str == after_duplicate_str, f"value as str not same after duplicate set. {value_str} vs {after_duplicate_str}"
+        self.add_test_log("reset_row")
+        unreal.PythonDataTableLib.reset_row(created_datatable, to_row)
+        return created_datatable
+
     def _testcase_user_datatable(self):
         # need struct
         succ, msgs = False, []
-        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
         try:
-            # 1. create
+            # 1. create, or reuse the one built from the same spec
             datatable_name = "IAmADataTable"
             datatable_path = f"{self.temp_assets_folder}/{datatable_name}"
-            struct_name = "IAmAStruct"
-            struct_path = f"{self.temp_assets_folder}/{struct_name}"
-
-            factory = unreal.DataTableFactory()
-            factory.struct = unreal.load_asset(struct_path)
+            spec = self._user_datatable_spec()
+            struct_path = spec["struct"]
 
-            created_datatable = asset_tools.create_asset(datatable_name, self.temp_assets_folder, unreal.DataTable, factory)
+            created_datatable, bBuilt = self.fixture_cache.get_or_build(datatable_path, spec, self._build_user_datatable)
+            assert created_datatable, "created_datatable None"
+            msgs.append("datatable created." if bBuilt else "datatable cached.")
+            if not bBuilt:
+                # set again on a cached datatable, the same values
+                self._set_user_datatable_values(created_datatable, spec)
 
-            assert created_datatable, "created_datatable_failed"
-            msgs.append("datatable created.")
-            # 2. add row
-            for i in range(3):
-                if i == 0:
-                    self.add_test_log("add_row")
-                unreal.PythonDataTableLib.add_row(created_datatable, f"MyRow_{i}")
-
-            self.add_test_log("get_row_names")
-            row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
-            assert len(row_names) == 3, f"len(row_names): {len(row_names)} != 3"
-            for i in range(3):
-                if i == 0:
-                    self.add_test_log("get_row_name")
-                _row_name = unreal.PythonDataTableLib.get_row_name(created_datatable, i)
-                assert _row_name == row_names[i], f"get_row_name: {_row_name} != get_row_names[i]: {row_names[i]}"
-
-            # 3. move row
-            # 0, 1, 2
-            self.add_test_log("move_row")
-            unreal.PythonDataTableLib.move_row(created_datatable, "MyRow_0", up=False, num_rows_to_move_by=2)
             self.add_test_log("get_row_names")
-            assert unreal.PythonDataTableLib.get_row_names(created_datatable) == ["MyRow_1", "MyRow_2", "MyRow_0"], "Row not match after move row0 down 2"
-            unreal.PythonDataTableLib.move_row(created_datatable, "MyRow_2", up=False, num_rows_to_move_by=1)
-            assert unreal.PythonDataTableLib.get_row_names(created_datatable) == ["MyRow_1", "MyRow_0", "MyRow_2"], "Row not match after move row2 down 1"
-            unreal.PythonDataTableLib.move_row(created_datatable, "MyRow_0", up=True, num_rows_to_move_by=1), "Row not match after move row0 up 1"
-            # back to 0, 1, 2
-
-            msgs.append("Add row.")
-            # 4. remove row
-            self.add_test_log("remove_row")
-            unreal.PythonDataTableLib.remove_row(created_datatable, "MyRow_1")
-            row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
-            assert row_names == ["MyRow_0", "MyRow_2"], "row name assert failed: {}".format(" ,".join(row_names))
-            msgs.append("Remove row.")
-
-            # 5. rename
-            self.add_test_log("rename_row")
-            unreal.PythonDataTableLib.rename_row(created_datatable,  "MyRow_2",  "MyRow_1")
             row_names = unreal.PythonDataTableLib.get_row_names(created_datatable)
-            assert row_names == ["MyRow_0", "MyRow_1"], "row name assert failed: {}".format(" ,".join(row_names))
-            msgs.append("Rename row.")
+            assert row_names == ["MyRow_0", "MyRow_1", "DuplicatedRow_2"], "row name assert failed: {}".format(" ,".join(row_names))
+            msgs.append("Row names.")
 
-            # 6. struct
+            # 2. struct
             self.add_test_log("get_data_table_struct_path")
             struct_path_from_datatable = unreal.PythonDataTableLib.get_data_table_struct_path(created_datatable)
             self.add_test_log("get_data_table_struct")
@@ -1843,7 +2216,7 @@ class TestPythonAPIs(metaclass=Singleton):
             assert struct_from_datatable.get_outermost().get_path_name() == struct_path, "{} != {}".format(struct_from_datatable.get_outermost().get_path_name(), struct_path)
             msgs.append("Struct info.")
 
-            # 7 column name
+            # 3 column name
             self.add_test_log("created_datatable")
             column_names = unreal.PythonDataTableLib.get_column_names(created_datatable, friendly_name=True)
             assert len(column_names) == 5, f"column name count: {len(column_names)} != 5"
@@ -1854,29 +2227,13 @@ class TestPythonAPIs(metaclass=Singleton):
                 assert name == _name, f"column {i}: {_name} != {name}"
             msgs.append("Column name.")
 
-            # 7 shape
+            # 4 shape, with the duplicated row
             self.add_test_log("created_datatable")
             shape = unreal.PythonDataTableLib.get_shape(created_datatable)
-            assert shape == [2, 5], f"shape: {shape} != [2, 5]"
+            assert shape == [3, 5], f"shape: {shape} != [3, 5]"
             msgs.append("Shape.")
 
-            # 8 get property
-            self.add_test_log("get_property_as_string_at")
-            ori_property = unreal.PythonDataTableLib.get_property_as_string_at(created_datatable, row_id=0, column_id=0)
-            assert ori_property == "", f"ori_property: != empty"
-
-            # 9 set property
-            self.add_test_log("set_property_by_string_at")
-            unreal.PythonDataTableLib.set_property_by_string_at(created_datatable, row_index=0, column_index=0, value_as_string='(1.1, 2.2, 3.3)')
-            self.add_test_log("set_property_by_string")
-            unreal.PythonDataTableLib.set_property_by_string(created_datatable, row_name="MyRow_0", column_name="my_bool_var", value_as_string='True')
-            unreal.PythonDataTableLib.set_property_by_string(created_datatable, row_name="MyRow_0",column_name="my_mesh_var"
-                                                             , value_as_string="StaticMesh'/Game/StarterContent/Props/SM_TableRound.SM_TableRound'")
-            unreal.PythonDataTableLib.set_property_by_string(created_datatable, row_name="MyRow_0", column_name="my_transform_var"
-                                                    , value_as_string='(Rotation=(X=0,Y=0,Z=0,W=1),Translation=(X=7,Y=7,Z=7),Scale3D=(X=1,Y=1,Z=1))')
-
-            unreal.PythonDataTableLib.set_property_by_string_at(created_datatable, row_index=1, column_index=1, value_as_string='True')
-
+            # 5 get property
             self.add_test_log("get_property_as_string_at")
             assert '(1.100000,2.200000,3.300000)' == unreal.PythonDataTableLib.get_property_as_string_at(created_datatable, row_id=0, column_id=0), "value assert failed. @[0][0]"
             self.add_test_log("get_property_as_string_at")
@@ -1887,29 +2244,20 @@ class TestPythonAPIs(metaclass=Singleton):
                                       , "value assert failed. @[0][3]: current: {}".format(unreal.PythonDataTableLib.get_property_as_string_at(created_datatable, row_id=0, column_id=3))
 
             msgs.append("set_property")
-            # 10. set dict
-            value_str = '(("Chair", StaticMesh\'"/Game/StarterContent/Props/SM_Chair.SM_Chair"\'),("Cube", StaticMesh\'"/Engine/BasicShapes/Cube.Cube"\'))'
-            # unreal.PythonDataTableLib.set_property_by_string_at(created_datatable, 1, 5, value_str)
-            unreal.PythonDataTableLib.set_property_by_string(created_datatable, row_name="MyRow_1", column_name="name_to_mesh_dict", value_as_string=value_str)
+            # 6. dict
+            value_str = spec["values"][-1][2]
             self.add_test_log("get_property_as_string")
             after_property_str = unreal.PythonDataTableLib.get_property_as_string(created_datatable, row_name="MyRow_1", column_name="name_to_mesh_dict")
             assert value_str == after_property_str, f"value as str not same after set. {value_str} vs {after_property_str}"
 
             msgs.append("set_property_by_string")
-            # 11.
+            # 7.
             self.add_test_log("get_table_as_json")
             table_as_json = unreal.PythonDataTableLib.get_table_as_json(created_datatable)
             assert '"Chair": "StaticMesh\'/Game/StarterContent/Props/SM_Chair.SM_Chair\'"' in table_as_json, '"Chair content not in json"'
             msgs.append("get_table_as_json")
-            #
-            self.add_test_log("duplicate_row")
-            unreal.PythonDataTableLib.duplicate_row(created_datatable, "MyRow_1", "DuplicatedRow_2")
-            after_duplicate_str = unreal.PythonDataTableLib.get_property_as_string(created_datatable, row_name="DuplicatedRow_2", column_name="name_to_mesh_dict")
-            assert value_str == after_duplicate_str, f"value as str not same after duplicate set. {value_str} vs {after_property_str}"
-            self.add_test_log("reset_row")
-            unreal.PythonDataTableLib.reset_row(created_datatable, "DuplicatedRow_2")
-
-            # 12 flaten
+
+            # 8 flaten
             self.add_test_log("get_flatten_data_table")
             flatten = unreal.PythonDataTableLib.get_flatten_data_table(created_datatable, include_header=True)
             print(flatten)
@@ -1921,32 +2269,218 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_datatable_bulk(self):
+        succ, msgs = False, []
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        try:
+            datatable_name = "IAmABulkDataTable"
+            factory = unreal.DataTableFactory()
+            factory.struct = unreal.load_asset(f"{self.temp_assets_folder}/IAmAStruct")
+            data_table = asset_tools.create_asset(datatable_name, self.temp_assets_folder, unreal.DataTable, factory)
+            assert data_table, "created_datatable_failed"
+
+            # 1. a few edits, cell by cell
+            buffer = DataTableBulk.DataTableEditBuffer(data_table)
+            for i in range(3):
+                buffer.add_row(f"BulkRow_{i}", {"my_bool_var": "True"} if i == 1 else None)
+            applied = buffer.apply(mode="cells")
+            index = DataTableBulk.DataTableIndex.read(data_table)
+            assert index.row_names == ["BulkRow_0", "BulkRow_1", "BulkRow_2"], f"rows: {index.row_names}"
+            assert index.get("BulkRow_1", "my_bool_var") is True and index.get("BulkRow_2", "my_bool_var") is False \
+                , f"my_bool_var: {index.column('my_bool_var')}"
+            msgs.append(f"cells: {applied['edits']} edits with {applied['engine_calls']} calls")
+
+            # 2. merged into the table json, one fill
+            sizes = (1000,)
+            if DataTableBulk.can_fill_from_json():
+                buffer.remove_row("BulkRow_0")
+                buffer.set("BulkRow_2", "my_bool_var", True)
+                applied = buffer.apply(mode="json")
+                index = DataTableBulk.DataTableIndex.read(data_table)
+                assert index.row_names == ["BulkRow_1", "BulkRow_2"], f"rows after json apply: {index.row_names}"
+                assert index.column("my_bool_var") == [True, True], f"my_bool_var after json apply: {index.column('my_bool_var')}"
+                msgs.append(f"json: {applied['edits']} edits with {applied['engine_calls']} calls")
+                sizes = (1000, 10_000, 100_000)
+
+            # 3. benchmark
+            for result in DataTableBulk.benchmark(data_table, sizes=sizes, values={"my_bool_var": True}):
+                msgs.append(f"{result['mode']} {result['rows']} rows: apply {result['apply_seconds']:.2f}s, {result['engine_calls']} calls"
+                            f", read {result['read_seconds']:.2f}s")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _testcase_datatable_sync(self):
+        succ, msgs = False, []
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        try:
+            factory = unreal.DataTableFactory()
+            factory.struct = unreal.load_asset(f"{self.temp_assets_folder}/IAmAStruct")
+            data_table = asset_tools.create_asset("IAmASyncDataTable", self.temp_assets_folder, unreal.DataTable, factory)
+            assert data_table, "created_datatable_failed"
+            buffer = DataTableBulk.DataTableEditBuffer(data_table)
+            for i in range(100):
+                buffer.add_row(f"SyncRow_{i}", {"my_bool_var": "True" if i % 2 == 0 else "False"})
+            buffer.apply()
+
+            # 1. export, then edit the csv: 2 changed, 1 removed, 1 renamed, 1 added and 1 moved
+            table = DataTableSync.EditorDataTable(data_table, source="flatten")
+            export_folder = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/Export")
+            current_path = os.path.join(export_folder, "IAmASyncDataTable.csv")
+            assert DataTableSync.export_csv(table.read_rows(), current_path) == 100, "export_csv rows != 100"
+
+            rows = list(DataTableSync.iter_csv_rows(current_path))
+            for i in [3, 5]:
+                rows[i][1]["my_bool_var"] = "True" if rows[i][1]["my_bool_var"] == "False" else "False"
+            rows[20] = ("SyncRow_Renamed", rows[20][1])
+            rows.pop(10)
+            rows.insert(50, ("SyncRow_New", dict(rows[0][1], my_bool_var="False")))
+            rows.append(rows.pop(0))
+            target_path = os.path.join(export_folder, "IAmASyncDataTable_target.csv")
+            DataTableSync.export_csv(rows, target_path)
+
+            # 2. sync, only the diff is applied. add_row appends, so the added row is moved too
+            diff, result = DataTableSync.sync_from_file(table, target_path)
+            expected = {"changed": 2, "removed": 1, "renamed": 1, "added": 1, "moved": 2}
+            assert all(result[k] == v for k, v in expected.items()), f"diff: {diff.report()} != {expected}"
+            assert result["engine_calls"] < 20, f"engine_calls: {result['engine_calls']}"
+            msgs.append(f"diff: {result['diff_seconds'] * 1000:.1f}ms, apply {result['engine_calls']} calls in {result['apply_seconds'] * 1000:.1f}ms")
+
+            row_names = unreal.PythonDataTableLib.get_row_names(data_table)
+            assert row_names == [name for name, _ in rows], "row names after sync != target"
+            assert DataTableSync.diff_rows(table.read_rows(), DataTableSync.iter_csv_rows(target_path)).is_empty(), "diff after sync not empty"
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _testcase_datatable_view(self):
+        succ, msgs = False, []
+        try:
+            assert DataTableView.bNumpy, "Need 3rd package: numpy"
+            data_table = unreal.load_asset(f"{self.temp_assets_folder}/IAmADataTable")
+            assert data_table, "IAmADataTable None"
+            cache = DataTableView.TableViewCache()
+            self.add_test_log("get_flatten_data_table")
+            view = cache.get(data_table)
+            assert view.kind("my_bool_var") == "bool", f"my_bool_var kind: {view.kind('my_bool_var')}"
+            assert view.kind("my_transform_var") == "numeric", f"my_transform_var kind: {view.kind('my_transform_var')}"
+            assert view.kind("name_to_mesh_dict") == "map", f"name_to_mesh_dict kind: {view.kind('name_to_mesh_dict')}"
+
+            float_vars = view.get("MyRow_0", "my_float_vars")
+            assert all(abs(a - b) < 0.0001 for a, b in zip(float_vars, (1.1, 2.2, 3.3))), f"my_float_vars: {float_vars}"
+            assert view.get("MyRow_0", "my_mesh_var") == "/Game/StarterContent/Props/SM_TableRound.SM_TableRound", f"my_mesh_var: {view.get('MyRow_0', 'my_mesh_var')}"
+            # ue5.1+ exports the object with its class path
+            for text in ["StaticMesh'/Game/A/B.B'", "/Script/Engine.StaticMesh'/Game/A/B.B'", "(\"B\", /Script/Engine.StaticMesh'\"/Game/A/B.B\"')"]:
+                parsed = DataTableView.parse_ue_text(text)
+                assert parsed in ("/Game/A/B.B", ("B", "/Game/A/B.B")), f"object path of {text}: {parsed}"
+            assert view.get("MyRow_1", "name_to_mesh_dict")["Chair"] == "/Game/StarterContent/Props/SM_Chair.SM_Chair", "name_to_mesh_dict['Chair'] failed"
+            assert view.select(view.field("my_transform_var", "Translation.X") > 5) == ["MyRow_0"], "select by Translation.X failed"
+            assert view.select(view.column("my_bool_var")) == ["MyRow_0", "MyRow_1"], f"select by my_bool_var: {view.select(view.column('my_bool_var'))}"
+
+            # saved package: no read at all. dirty package: one read, parsed again only if the text changed
+            assert cache.get(data_table) is view and cache.hits == 1, "view of the saved table not cached"
+            unreal.PythonDataTableLib.set_property_by_string(data_table, row_name="MyRow_1", column_name="my_bool_var", value_as_string='False')
+            view = cache.get(data_table)
+            assert cache.parses == 2 and view.get("MyRow_1", "my_bool_var") is False, "view not updated after edit"
+            assert cache.get(data_table) is view and cache.hits == 2, "view of the dirty table not cached"
+            msgs.append(f"parse: {view.parse_seconds * 1000:.1f}ms, hits: {cache.hits}, parses: {cache.parses}")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _testcase_schema_builder(self):
+        succ, msgs = False, []
+        try:
+            schema = {"folder": f"{self.temp_assets_folder}/Schema"
+                    , "enums": [{"name": "E_SchemaWeapon", "description": "weapon kind", "items": ["Sword", "Bow", {"display_name": "Staff", "description": "magic"}]}
+                              , {"name": "E_SchemaRarity", "items": ["Common", "Rare", "Epic"]}]
+                    , "structs": [{"name": "S_SchemaWeapon", "variables": [
+                                    {"name": "damage", "category": "float", "default": "10"}
+                                  , {"name": "kind", "category": "byte", "sub_object": "E_SchemaWeapon"}
+                                  , {"name": "rarity", "category": "byte", "sub_object": "E_SchemaRarity"}
+                                  , {"name": "mesh", "category": "object", "sub_object": "/Script/Engine.StaticMesh"}
+                                  , {"name": "tags", "category": "name", "container": 1}
+                                  , {"name": "lookup", "category": "name", "map_value": {"category": "object", "sub_object": "/Script/Engine.StaticMesh"}}]}]}
+            schema_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/TAPythonTestCase/Schema.json")
+            os.makedirs(os.path.dirname(schema_path), exist_ok=True)
+            with open(schema_path, "w", encoding="utf-8") as f:
+                json.dump(schema, f, indent=2)
+
+            # 0. dry run: the missing assets are planned, not created
+            report = SchemaBuilder.SchemaBuilder(schema).build(dry_run=True)
+            assert all(r["created"] and r["ops"] for r in report), f"dry run plan: {[(r['asset'], r['created'], len(r['ops'])) for r in report]}"
+            created = [r["asset"] for r in report if unreal.EditorAssetLibrary.does_asset_exist(r["asset"])]
+            assert not created, f"created by dry run: {created}"
+
+            # 1. create all
+            report = SchemaBuilder.SchemaBuilder(SchemaBuilder.load_schema(schema_path)).build()
+            assert all(r["created"] for r in report), f"not created: {[r['asset'] for r in report if not r['created']]}"
+            struct_asset = unreal.load_asset(f"{schema['folder']}/S_SchemaWeapon")
+            friendly_names = [str(name) for name in unreal.PythonStructLib.get_friendly_names(struct_asset)]
+            assert friendly_names == [var["name"] for var in schema["structs"][0]["variables"]], f"variables: {friendly_names}"
+            msgs.append(f"create: {sum(len(r['ops']) for r in report)} ops in {sum(r['apply_seconds'] for r in report):.2f}s")
+
+            # 2. same schema, nothing to do
+            report = SchemaBuilder.SchemaBuilder(schema).build()
+            assert not any(r["ops"] for r in report), f"ops of unchanged schema: {[(r['asset'], r['ops']) for r in report if r['ops']]}"
+
+            # 3. only the changes
+            schema["enums"][0]["items"] = ["Bow", "Sword", {"display_name": "Staff", "description": "magic"}]
+            schema["structs"][0]["variables"][0]["default"] = "12"
+            schema["structs"][0]["variables"].append({"name": "weight", "category": "float", "default": "1.5"})
+            report = {os.path.basename(r["asset"]): r for r in SchemaBuilder.SchemaBuilder(schema).build()}
+            op_counts = {name: len(r["ops"]) for name, r in report.items()}
+            assert op_counts == {"E_SchemaWeapon": 1, "E_SchemaRarity": 0, "S_SchemaWeapon": 3}, f"op counts: {op_counts}"
+            enum_asset = unreal.load_asset(f"{schema['folder']}/E_SchemaWeapon")
+            display_names = [str(unreal.PythonEnumLib.get_display_name_by_index(enum_asset, i)) for i in range(3)]
+            assert display_names == ["Bow", "Sword", "Staff"], f"display names after move: {display_names}"
+            msgs.append(f"update: {op_counts}")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
     def test_category_datatable(self, id):
         self.test_being(id=id)
         level_path = '/Game/StarterContent/Maps/StarterMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
 
-        self.push_call(py_task(self._delete_assets, asset_paths=[f"{self.temp_assets_folder}/{x}" for x in ["IAmADataTable", "IAmAStruct", "IAmAEnum"]]
+        # IAmAEnum, IAmAStruct and IAmADataTable are cached fixtures, built again only when their spec changes
+        asset_names = ["IAmABulkDataTable", "IAmASyncDataTable"
+                     , "Schema/S_SchemaWeapon", "Schema/E_SchemaWeapon", "Schema/E_SchemaRarity"]
+        self.push_call(py_task(self._delete_assets, asset_paths=[f"{self.temp_assets_folder}/{x}" for x in asset_names]
                                ), delay_seconds=0.1)
 
         self.push_call(py_task(self._testcase_user_defined_enum), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_user_defined_struct), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_user_datatable), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_datatable_bulk), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_datatable_sync), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_datatable_view), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_schema_builder), delay_seconds=0.1)
 
         self.test_finish(id)
 
+    def load_level_fixture(self, level_path):
+        # no reload if the level is current and clean
+        self.level_fixtures.load_level(level_path)
+
     def _testcase_prepare_empty_level(self, level_path):
         succ, msgs = False, []
         try:
-            # 1. delete if level1 exists.
-                # load another level
-            unreal.EditorLevelLibrary.load_level('/Game/StarterContent/Maps/StarterMap')
-            unreal.PythonBPLib.delete_asset(level_path, show_confirmation=False)
-
-
-            unreal.EditorLevelLibrary.new_level_from_template(asset_path=level_path, template_asset_path='/Engine/Maps/Templates/Template_Default.Template_Default')
+            # 1. created from template at the first time, then reset by destroying the spawned actors
+            result, seconds = self.level_fixtures.prepare_empty_level(level_path)
             # 2. open level
-            unreal.EditorLevelLibrary.load_level(level_path)
             world = unreal.EditorLevelLibrary.get_editor_world()
 
             assert world.get_name() == os.path.basename(level_path), f"world name: {world.get_name()} != {os.path.basename(level_path)}"
@@ -1955,7 +2489,7 @@ class TestPythonAPIs(metaclass=Singleton):
             if False:
                 for actor in unreal.PythonBPLib.find_actors_by_label_name("Floor", world=world):
                     actor.destroy_actor()
-            msgs.append("Empty level.")
+            msgs.append(f"Empty level {result}, {seconds:.2f}s.")
             succ = True
         except AssertionError as e:
             msgs.append(str(e))
@@ -2305,6 +2839,75 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_landscape_tiled_heightmap(self):
+        succ, msgs = False, []
+        try:
+            assert LandscapeTiles.bNumpy, "Need 3rd package: numpy"
+            guid = unreal.GuidLibrary.new_guid()
+            section_size = 63
+            section_per_component = 1
+            component_count_x_y = 2
+            tiles_x_y = 4  # 16 proxies
+            Z_HEIGHT_RANGE = 100
+            per_land_offset = section_size * section_per_component * component_count_x_y * 100
+
+            proxies = []
+            for y in range(tiles_x_y):
+                for x in range(tiles_x_y):
+                    this_land_t = unreal.Transform(location=[per_land_offset * x, per_land_offset * y, 0]
+                                                   , rotation=[0, 0, 0]
+                                                   , scale=[100, 100, Z_HEIGHT_RANGE / 512 * 100])
+                    proxy = unreal.PythonLandscapeLib.create_landscape_proxy_with_guid(landscape_transform=this_land_t
+                                                        , section_size=section_size
+                                                        , sections_per_component=section_per_component
+                                                        , component_count_x=component_count_x_y
+                                                        , component_count_y=component_count_x_y
+                                                        , guid=guid)
+                    assert proxy, "Create landscape proxy failed."
+                    proxies.append(proxy)
+            msgs.append(f"{len(proxies)} landscape proxies")
+
+            # heightmap of the whole world, generated row by row into a raw file and paged back in tiles
+            resolution_size = section_size * section_per_component * component_count_x_y + 1
+            world_size = tiles_x_y * (resolution_size - 1) + 1
+
+            def _height_row(xs, y):
+                v_x = LandscapeTiles.np.sin(xs / 10.0) * 0.5 + 0.5
+                v_y = math.sin(y / 15.0) * 0.5 + 0.5
+                scale = LandscapeTiles.np.sin((xs + y) / 40.0) * 0.5 + 0.5
+                v = LandscapeTiles.np.minimum(LandscapeTiles.np.maximum(v_x, v_y), 1) * scale
+                return (1 - v) * 0.5 * 65535
+
+            r16_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/Export/4TestCase_TiledHeightmap.r16")
+            source = LandscapeTiles.write_raw_heightmap(r16_path, LandscapeTiles.rows_from_function(_height_row, world_size, world_size)
+                                                        , width=world_size, height=world_size)
+            result = LandscapeTiles.write_heightmap_tiles(proxies, source, section_size
+                                                          , sections_per_component=section_per_component
+                                                          , component_count_x=component_count_x_y
+                                                          , component_count_y=component_count_x_y
+                                                          , tiles_x=tiles_x_y, tiles_y=tiles_x_y)
+            assert result["tiles"] == 16, f"tiles: {result['tiles']} != 16"
+            assert tuple(result["tile_size"]) == (resolution_size, resolution_size), f"tile_size: {result['tile_size']}"
+
+            # read back each proxy: the same as its window of the raw file, and the shared edges are equal
+            self.add_test_log("get_heightmap_data")
+            tiles = LandscapeTiles.read_back_tiles(proxies, resolution_size, resolution_size, tiles_x_y, tiles_x_y)
+            for tx, ty, window in source.iter_tile_windows(resolution_size, resolution_size, tiles_x_y, tiles_x_y):
+                assert LandscapeTiles.np.array_equal(tiles[(tx, ty)], window), f"heightmap of proxy ({tx}, {ty}) != raw heightmap"
+            seam_errors = LandscapeTiles.seam_mismatches(tiles, tiles_x_y, tiles_x_y)
+            assert not seam_errors, f"seams mismatch: {seam_errors}"
+            msgs.append(f"{len(tiles)} proxies read back, seams matched")
+            msgs.append(f"Streamed heightmap tiles in {result['total_seconds']:.2f}s")
+
+            unreal.PythonBPLib.select_none()
+            unreal.PythonBPLib.select_actor(proxies[-1], selected=True, notify=True)
+            unreal.PythonBPLib.request_viewport_focus_on_selection()
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
     def _testcase_sub_levels(self):
         succ, msgs = False, []
         world = unreal.EditorLevelLibrary.get_editor_world()
@@ -2377,6 +2980,75 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_sample_height_tiled(self):
+        try:
+            assert HeightSampler.bNumpy, "Need 3rd package: numpy"
+            world = unreal.EditorLevelLibrary.get_editor_world()
+            # the 4 x 4 proxies from _testcase_landscape_tiled_heightmap
+            world_size = 4 * 63 * 2 * 100
+            self.add_test_log("sample_heights")
+            sampler = HeightSampler.TiledHeightSampler(world, center=[world_size / 2, world_size / 2, 0]
+                                                       , width=world_size, height=world_size, grid_size=400
+                                                       , tile_samples=32, trace_depth=100_00)
+        except AssertionError as e:
+            self.push_result(False, [str(e)])
+            return
+
+        def _on_progress(done, total):
+            self.set_output(f"sample_heights tile: {done} / {total}")
+
+        def _on_finished(report, error):
+            succ, msgs = False, []
+            try:
+                assert error is None, f"sample_heights failed: {error}"
+                assert report["tiles"] == sampler.total_tiles(), f"tiles: {report['tiles']} != {sampler.total_tiles()}"
+                assert report["filled_cells"] > 0, "no height sampled"
+                msgs.append(f"Sampled {report['samples']} heights in {report['tiles']} tiles, trace: {report['trace_seconds']:.2f}s"
+                            f", height range: {report['min_height']:.1f} ~ {report['max_height']:.1f}")
+
+                r16_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/Export/4TestCase_SampledHeights.r16")
+                HeightSampler.export_heightmap_r16(r16_path, sampler.heights)
+                raw = LandscapeTiles.RawHeightmap(r16_path, width=sampler.x_count, height=sampler.y_count)
+                assert raw.data.shape == sampler.heights.shape, f"exported heightmap shape: {raw.data.shape} != {sampler.heights.shape}"
+                succ = True
+            except AssertionError as e:
+                msgs.append(str(e))
+            self.delay_calibration.end_task(step_key)
+            self.push_result(succ, msgs, bTaskResult=True)
+
+        step_key = self.delay_calibration.start_task()
+        self.running_tasks.append(sampler.sample_time_sliced(budget_ms=8, on_progress=_on_progress, on_finished=_on_finished))
+
+    def _testcase_multi_line_trace_batched(self):
+        succ, msgs = False, []
+        try:
+            assert LineTraces.bNumpy, "Need 3rd package: numpy"
+            world = unreal.EditorLevelLibrary.get_editor_world()
+            # ~100k vertical rays over the 4 x 4 proxies from _testcase_landscape_tiled_heightmap
+            world_size = 4 * 63 * 2 * 100
+            step = 160
+            xs = LineTraces.np.arange(0, world_size, step)
+            starts, ends = LineTraces.vertical_rays(xs, xs, z_top=100_00, z_bottom=-100_00)
+
+            self.add_test_log("multi_line_trace_at_once_by_profile")
+            tracer = LineTraces.BatchedLineTracer(world, "BlockAll", latency_ms=16)
+            results = tracer.trace(starts, ends)
+            report = tracer.report()
+            hit_count = int(results["hit"].sum())
+            assert hit_count > 0, "no ray hit the landscape"
+            msgs.append(f"{report['rays']} rays, {hit_count} hits, {report['calls']} calls, last chunk_size: {report['chunk_size']}")
+
+            hit_map = LineTraces.rasterize_hits(results, origin=[0, 0], cell_size=step, shape=(len(xs), len(xs)), mode="count")
+            assert hit_map.sum() == hit_count, f"hit map sum: {hit_map.sum()} != {hit_count}"
+
+            rays_per_sec = LineTraces.benchmark(world, starts, ends, chunk_sizes=(1000, 10_000, 100_000))
+            msgs.append(", ".join(f"chunk {k}: {v:.0f} rays/sec" for k, v in rays_per_sec.items()))
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
     def test_category_Landscape(self, id):
         self.test_being(id=id)
 
@@ -2392,12 +3064,18 @@ class TestPythonAPIs(metaclass=Singleton):
         self.push_call(py_task(self._testcase_prepare_empty_level, level_path='/Game/_AssetsForTAPythonTestCase/Maps/OpenWorld/LandscapeProxyMap'), delay_seconds=1)
         self.push_call(py_task(self._testcase_landscape_proxy_with_guid), delay_seconds=1)
         #
-        self.push_call(py_task(self._testcase_streaming_levels), delay_seconds=3)
+        self.push_call(py_task(self._testcase_prepare_empty_level, level_path='/Game/_AssetsForTAPythonTestCase/Maps/OpenWorld/LandscapeProxyMap'), delay_seconds=1)
+        self.push_call(py_task(self._testcase_landscape_tiled_heightmap), delay_seconds=1)
+        self.push_call(py_task(self._testcase_sample_height_tiled), delay_seconds=1)
+        # the tiled sampler is time-sliced, the following cases start after it
+        self.push_call_after_running(self._testcase_multi_line_trace_batched, delay_seconds=0.1)
+        #
+        self.push_call_after_running(self._testcase_streaming_levels, delay_seconds=3)
 
         # level_path = '/Game/StarterContent/Maps/StarterMap' # avoid saving level by mistake
         # self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
 
-        self.test_finish(id)
+        self.test_finish_after_async(id)
 
     def _testcase_texture(self):
         succ, msgs = False, []
@@ -2439,22 +3117,75 @@ class TestPythonAPIs(metaclass=Singleton):
         succ = True
         self.push_result(succ, msg)
 
-    def _testcase_create_rt(self):
+    def _testcase_fixture_cache_stub(self):
         succ, msgs = False, []
+        try:
+            registry = FixtureCache.MemoryAssetRegistry()
+            cache = FixtureCache.FixtureCache(registry)
+            path = "/Game/Stub/M_Fixture"
+            builds = []
+
+            def _builder(asset_path, spec):
+                builds.append(asset_path)
+                return registry.add(asset_path, {"color": list(spec["color"])})
+
+            # 1. miss: built, tagged and saved
+            asset, bBuilt = cache.get_or_build(path, {"color": [1, 0, 0]}, _builder)
+            assert bBuilt and len(builds) == 1 and cache.build_count == 1, f"miss not built: {builds}"
+            assert registry.get_tag(asset, FixtureCache.HASH_TAG) == FixtureCache.spec_hash({"color": [1, 0, 0]}), "hash tag not set"
+            assert registry.saved == [path], f"saved: {registry.saved}"
+
+            # 2. hit: an equal spec, the same asset and no build
+            cached, bBuilt = cache.get_or_build(path, {"color": [1, 0, 0]}, _builder)
+            assert not bBuilt and cached is asset, "equal spec built again"
+            assert len(builds) == 1 and cache.hit_count == 1, f"builds: {len(builds)}, hits: {cache.hit_count}"
+
+            # 3. spec changed: the old asset is deleted and built again
+            rebuilt, bBuilt = cache.get_or_build(path, {"color": [0, 1, 0]}, _builder)
+            assert bBuilt and rebuilt is not asset and rebuilt["color"] == [0, 1, 0], f"changed spec not built: {rebuilt}"
+            assert registry.deleted == [path] and cache.build_count == 2, f"deleted: {registry.deleted}, builds: {cache.build_count}"
+
+            # 4. an asset without the tag, or invalidated, is not reused
+            registry.add("/Game/Stub/M_Untagged", {})
+            assert not cache.is_valid("/Game/Stub/M_Untagged", {"color": [0, 1, 0]}), "untagged asset reused"
+            cache.invalidate(path)
+            assert not cache.is_valid(path, {"color": [0, 1, 0]}), "invalidated asset reused"
+            msgs.append(f"hits: {cache.hit_count}, builds: {cache.build_count}")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _set_rt_properties(self, rt, spec):
+        for name, value in spec["properties"].items():
+            rt.set_editor_property(name, getattr(unreal.TextureRenderTargetFormat, value) if name == "render_target_format" else value)
+
+    def _build_rt(self, rt_path, spec):
         asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        folder, rt_name = rt_path.rsplit("/", 1)
+        factory = unreal.TextureRenderTargetFactoryNew()
+        rt_assets = asset_tools.create_asset(rt_name, folder, unreal.TextureRenderTarget2D, factory)
+        assert rt_assets, f"Create render target failed: {rt_path}"
+        print(f"rt_assets.get_path_name: {rt_assets.get_path_name()}")
+        self._set_rt_properties(rt_assets, spec)
+        return rt_assets
 
+    def _testcase_create_rt(self):
+        succ, msgs = False, []
         try:
             folder = "/Game/_AssetsForTAPythonTestCase/Textures"
             rt_name = "RT_Created"
             rt_path = f"{folder}/{rt_name}"
-            if unreal.EditorAssetLibrary.does_asset_exist(rt_path):
-
-                unreal.PythonBPLib.delete_asset(rt_path, show_confirmation=False)
-            factory = unreal.TextureRenderTargetFactoryNew()
-            rt_assets = asset_tools.create_asset(rt_name, folder, unreal.TextureRenderTarget2D, factory)
-            print(f"rt_assets.get_path_name: {rt_assets.get_path_name()}")
-            rt_assets.set_editor_property("render_target_format", unreal.TextureRenderTargetFormat.RTF_RGBA8)
-            unreal.EditorAssetLibrary.save_asset(rt_assets.get_path_name())
+            spec = {"factory": "TextureRenderTargetFactoryNew", "properties": {"render_target_format": "RTF_RGBA8"}}
+            rt_assets, bBuilt = self.fixture_cache.get_or_build(rt_path, spec, self._build_rt)
+            if not bBuilt:
+                # _testcase_set_rt edits the pixels, set the properties back to the spec
+                self._set_rt_properties(rt_assets, spec)
+                unreal.EditorAssetLibrary.save_asset(rt_path)
+            msgs.append("RT created." if bBuilt else "RT cached.")
+            assert rt_assets.get_editor_property("render_target_format") == unreal.TextureRenderTargetFormat.RTF_RGBA8, "render_target_format != RTF_RGBA8"
             succ = True
         except AssertionError as e:
             msgs.append(str(e))
@@ -2467,7 +3198,7 @@ class TestPythonAPIs(metaclass=Singleton):
             folder = "/Game/_AssetsForTAPythonTestCase/Textures"
             rt_name = "RT_Created"
             rt_path = f"{folder}/{rt_name}"
-            assert unreal.EditorAssetLibrary.does_asset_exist(rt_path), f"Asset not exist: {rt_path}"
+            assert self.asset_snapshot.exists(rt_path), f"Asset not exist: {rt_path}"
             rt = unreal.load_asset(rt_path)
 
             assert rt, "rt null"
@@ -2510,6 +3241,23 @@ class TestPythonAPIs(metaclass=Singleton):
             # print(f"lastPixel: {last_pixel[0]}, {last_pixel[1]}, {last_pixel[2]}, {last_pixel[3]}")
             assert first_pixel == (0, 0, 255, 255) , f"first pixel not red, {type(first_pixel)}, {first_pixel}"
             assert last_pixel == (0, 0, 0, 255), "last pixel not black"
+
+            # whole image analysis without unpacking pixels one by one
+            if RenderTargetUtils.bNumpy:
+                readback = RenderTargetUtils.RenderTargetReadback(rt, raw_data)
+                assert readback.bgra.shape == (height, width, 4), f"readback shape: {readback.bgra.shape}"
+                assert readback.pixel(0, 0, order="BGRA") == first_pixel, f"readback first pixel: {readback.pixel(0, 0)} != {first_pixel}"
+                assert readback.pixel(width - 1, height - 1, order="BGRA") == last_pixel, "readback last pixel not black"
+                histogram = readback.histogram()
+                assert histogram["A"][255] == width * height, f"alpha histogram: {histogram['A'][255]} != {width * height}"
+                stats = readback.statistics()
+                msgs.append(f"RT stats: R mean {stats['R']['mean']:.1f}, G mean {stats['G']['mean']:.1f}, B mean {stats['B']['mean']:.1f}")
+                png_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/Export/4TestCase_RT_Created.png")
+                readback.save_png(png_path)
+                assert os.path.exists(png_path), f"Export render target png failed: {png_path}"
+            else:
+                msgs.append("Warning: can't find numpy, skip render target readback helper")
+
             unreal.PythonBPLib.sync_to_assets([unreal.EditorAssetLibrary.find_asset_data(rt_path)])
 
             succ = True
@@ -2518,104 +3266,132 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _material_fixture_expressions(self, mat, spec) -> dict:
+        # the expressions of a built material keep the order of spec["nodes"]
+        expressions = unreal.PythonMaterialLib.get_material_expressions(mat)
+        assert len(expressions) == len(spec["nodes"]), f"{mat.get_name()} expression count: {len(expressions)} != {len(spec['nodes'])}"
+        for exp, (key, class_name, _) in zip(expressions, spec["nodes"]):
+            assert isinstance(exp, getattr(unreal, class_name)), f"{mat.get_name()}: {key} is not a {class_name}"
+        return {key: exp for exp, (key, _, _) in zip(expressions, spec["nodes"])}
+
+    def _connect_material_fixture(self, expressions, spec):
+        # connecting the same link again changes nothing, so a cached material still runs the connection apis
+        self.add_test_log("connect_material_property")
+        for lib_name, from_key, from_output, property_str in spec.get("outputs", []):
+            if lib_name == "MaterialEditingLibrary":
+                unreal.MaterialEditingLibrary.connect_material_property(from_expression=expressions[from_key], from_output_name=from_output
+                                                                        , property_=getattr(unreal.MaterialProperty, property_str))
+            else:
+                unreal.PythonMaterialLib.connect_material_property(from_expression=expressions[from_key], from_output_name=from_output
+                                                                   , material_property_str=property_str)
+        self.add_test_log("connect_material_expressions")
+        for lib_name, from_key, from_output, to_key, to_input in spec.get("connections", []):
+            getattr(unreal, lib_name).connect_material_expressions(from_expression=expressions[from_key], from_output_name=from_output
+                                                                   , to_expression=expressions[to_key], to_input_name=to_input)
+
+    def _build_material_fixture(self, mat_path, spec):
+        # spec: {"nodes": [[key, expression class, {property: value}]], lists as LinearColor
+        #      , "attributes": {key: [material property]}, the inputs of SetMaterialAttributes, the outputs of GetMaterialAttributes
+        #      , "outputs": [[lib, from key, output name, material property]]
+        #      , "connections": [[lib, from key, output name, to key, input name]]}
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        mat = asset_tools.create_asset(os.path.basename(mat_path), os.path.dirname(mat_path), unreal.Material, unreal.MaterialFactoryNew())
+        assert mat, f"Create material failed: {mat_path}"
+        self.add_test_log("create_material_expression")
+        for key, class_name, props in spec["nodes"]:
+            exp = unreal.MaterialEditingLibrary.create_material_expression(mat, getattr(unreal, class_name))
+            for name, value in props.items():
+                exp.set_editor_property(name, unreal.LinearColor(*value) if isinstance(value, list) else value)
+        expressions = self._material_fixture_expressions(mat, spec)
+
+        for key, property_names in spec.get("attributes", {}).items():
+            if isinstance(expressions[key], unreal.MaterialExpressionSetMaterialAttributes):
+                self.add_test_log("add_input_at_expression_set_material_attributes")
+                for mp_name in property_names:
+                    unreal.PythonMaterialLib.add_input_at_expression_set_material_attributes(expressions[key], mp_name)
+            else:
+                self.add_test_log("add_output_at_expression_get_material_attributes")
+                for mp_name in property_names:
+                    unreal.PythonMaterialLib.add_output_at_expression_get_material_attributes(expressions[key], mp_name)
+
+        self._connect_material_fixture(expressions, spec)
+        unreal.MaterialEditingLibrary.layout_material_expressions(mat)
+        unreal.MaterialEditingLibrary.recompile_material(mat)
+        return mat
+
+    def _build_mi_fixture(self, mi_path, spec):
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        mi = asset_tools.create_asset(os.path.basename(mi_path), os.path.dirname(mi_path), unreal.MaterialInstanceConstant, unreal.MaterialInstanceConstantFactoryNew())
+        assert mi, f"Create material instance failed: {mi_path}"
+        unreal.MaterialEditingLibrary.set_material_instance_parent(mi, unreal.load_asset(spec["parent"]))
+        self._set_mi_fixture_switches(mi, spec)
+        return mi
+
+    def _set_mi_fixture_switches(self, mi, spec):
+        # "switch": [name, enabled], or "switches": [names, values, overrides]
+        if "switch" in spec:
+            self.add_test_log("set_static_switch_parameter_value")
+            name, enabled = spec["switch"]
+            unreal.PythonMaterialLib.set_static_switch_parameter_value(mi, name, enabled=enabled, update_static_permutation=True)
+        else:
+            self.add_test_log("set_static_switch_parameters_values")
+            names, values, overrides = spec["switches"]
+            unreal.PythonMaterialLib.set_static_switch_parameters_values(mi, switch_names=names, values=values, overrides=overrides)
+
     def _testcase_create_swtich_materials(self):
         succ, msgs = False, []
         mat_paths = ["/Game/_AssetsForTAPythonTestCase/Materials/M_StaticSwitch"
             , "/Game/_AssetsForTAPythonTestCase/Materials/MI_StaticSwitch_A"
             , "/Game/_AssetsForTAPythonTestCase/Materials/MI_StaticSwitch_B"
             , "/Game/_AssetsForTAPythonTestCase/Materials/MI_StaticSwitch_C" ]
-        # delte exists
-        for _path in reversed(mat_paths): # delete mi first
-            if unreal.EditorAssetLibrary.does_asset_exist(_path):
-                unreal.EditorAssetLibrary.save_asset(_path)
-                unreal.get_editor_subsystem(unreal.AssetEditorSubsystem).close_all_editors_for_asset(unreal.load_asset(_path))
-
-                unreal.PythonBPLib.delete_asset(_path, show_confirmation=False)
-        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        # offical lib: MaterialEditingLibrary, PythonMaterialLib way adds extra log when failed.
+        # MP_WorldPositionOffset connection will be disconnect later
+        spec = {"nodes": [["ForceUseBlue", "MaterialExpressionStaticSwitchParameter", {"parameter_name": "ForceUseBlue"}]
+                        , ["UseRed", "MaterialExpressionStaticSwitchParameter", {"parameter_name": "UseRed"}]
+                        , ["Blue", "MaterialExpressionVectorParameter", {"default_value": [0, 0, 1, 1], "parameter_name": "Blue"}]
+                        , ["Red", "MaterialExpressionVectorParameter", {"default_value": [1, 0, 0, 1], "parameter_name": "Red"}]
+                        , ["Green", "MaterialExpressionVectorParameter", {"default_value": [0, 1, 0, 1], "parameter_name": "Green"}]]
+                , "outputs": [["MaterialEditingLibrary", "ForceUseBlue", "", "MP_BASE_COLOR"]
+                            , ["PythonMaterialLib", "ForceUseBlue", "", "MP_WorldPositionOffset"]]
+                , "connections": [["MaterialEditingLibrary", "Blue", "", "ForceUseBlue", "True"]
+                                , ["MaterialEditingLibrary", "UseRed", "", "ForceUseBlue", "False"]
+                                , ["PythonMaterialLib", "Red", "", "UseRed", "True"]
+                                , ["PythonMaterialLib", "Green", "", "UseRed", "False"]]}
+        # the mis are built again with their parent
+        mi_specs = [{"parent": mat_paths[0], "parent_spec": spec, "switch": ["UseRed", True]}
+                  , {"parent": mat_paths[0], "parent_spec": spec, "switches": [["UseRed", "ForceUseBlue"], [False, False], [True, True]]}
+                  , {"parent": mat_paths[0], "parent_spec": spec, "switch": ["ForceUseBlue", True]}]
+        if not self.fixture_cache.is_valid(mat_paths[0], spec):
+            # delte exists, m and mis in one batch
+            AssetCleanup.delete_assets_batched(mat_paths, snapshot=self.asset_snapshot)
         try:
-            # create m
+            # create m, or reuse the one built from the same spec
             m_path = mat_paths[0]
-
-            mat_name = os.path.basename(m_path)
-            folder_name = os.path.dirname(m_path)
-
-            mat = asset_tools.create_asset(mat_name, folder_name, unreal.Material, unreal.MaterialFactoryNew())
+            mat, bBuilt = self.fixture_cache.get_or_build(m_path, spec, self._build_material_fixture)
             self.add_test_log("get_shader_map_info")
             map_infos = unreal.PythonMaterialLib.get_shader_map_info(mat, "PCD3D_SM5")
             assert map_infos, "map_info null"
             print(map_infos)
             assert '"ShaderMapName"' in map_infos, "Can't find ShaderID.VFType"
-
-            self.add_test_log("create_material_expression")
-            switch_force_blue = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionStaticSwitchParameter)
-            switch_force_blue.set_editor_property("parameter_name", "ForceUseBlue")
-            switch_use_red = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionStaticSwitchParameter)
-            switch_use_red.set_editor_property("parameter_name", "UseRed")
-
-            c_blue = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            c_blue.set_editor_property("default_value", unreal.LinearColor.BLUE)
-            c_blue.set_editor_property("parameter_name", "Blue")
-
-            c_red = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            c_red.set_editor_property("default_value", unreal.LinearColor.RED)
-            c_red.set_editor_property("parameter_name", "Red")
-
-            c_green = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            c_green.set_editor_property("default_value", unreal.LinearColor.GREEN)
-            c_green.set_editor_property("parameter_name", "Green")
-
-            # offical lib: MaterialEditingLibrary
-            unreal.MaterialEditingLibrary.connect_material_property(from_expression=switch_force_blue, from_output_name=""
-                                                               , property_=unreal.MaterialProperty.MP_BASE_COLOR)
-            # MP_WorldPositionOffset connection will be disconnect later
-            self.add_test_log("connect_material_property")
-            unreal.PythonMaterialLib.connect_material_property(from_expression=switch_force_blue, from_output_name=""
-                                                               , material_property_str="MP_WorldPositionOffset")
-
-            # swith a
-            unreal.MaterialEditingLibrary.connect_material_expressions(from_expression=c_blue, from_output_name=""
-                                                                       , to_expression=switch_force_blue, to_input_name="True")
-
-            unreal.MaterialEditingLibrary.connect_material_expressions(from_expression=switch_use_red, from_output_name=""
-                                                                   , to_expression=switch_force_blue, to_input_name="False")
-            # PythonMaterialLib way, add extra log when failed.
-            self.add_test_log("connect_material_expressions")
-            unreal.PythonMaterialLib.connect_material_expressions(from_expression=c_red, from_output_name=""
-                                                                       , to_expression=switch_use_red, to_input_name="True")
-            unreal.PythonMaterialLib.connect_material_expressions(from_expression=c_green, from_output_name=""
-                                                                       , to_expression=switch_use_red, to_input_name="False")
-
-            unreal.MaterialEditingLibrary.layout_material_expressions(mat)
-            unreal.MaterialEditingLibrary.recompile_material(mat)
-            unreal.EditorAssetLibrary.save_asset(mat.get_path_name())
+            if not bBuilt:
+                self._connect_material_fixture(self._material_fixture_expressions(mat, spec), spec)
 
             self.add_test_log("get_hlsl_code")
             hlsl = unreal.PythonMaterialLib.get_hlsl_code(mat)
 
-            msgs.append("Create Material.")
+            msgs.append("Create Material." if bBuilt else "Cached Material.")
 
-            unreal.PythonBPLib.sync_to_assets([unreal.EditorAssetLibrary.find_asset_data(m_path)]
+            unreal.PythonBPLib.sync_to_assets([self.asset_snapshot.find_asset_data(m_path)]
                                               , allow_locked_browsers=True, focus_content_browser=True)
 
             # 3. create mis
             assert mat and isinstance(mat, unreal.Material), "mat None or type error"
-            for i, mi_path in enumerate(mat_paths[1:]):
-                mi_name = os.path.basename(mi_path)
-                folder_name = os.path.dirname(mi_path)
-                mi = asset_tools.create_asset(mi_name, folder_name, unreal.MaterialInstanceConstant, unreal.MaterialInstanceConstantFactoryNew())
-                unreal.MaterialEditingLibrary.set_material_instance_parent(mi, mat)
-                if i == 0:
-                    self.add_test_log("set_static_switch_parameter_value")
-                    unreal.PythonMaterialLib.set_static_switch_parameter_value(mi, "UseRed", enabled=True, update_static_permutation=True)
-                elif i == 1:
-                    self.add_test_log("set_static_switch_parameters_values")
-                    unreal.PythonMaterialLib.set_static_switch_parameters_values(mi, switch_names=["UseRed", "ForceUseBlue"]
-                                                                                 , values=[False, False], overrides=[True, True])
-                elif i == 2:
-                    unreal.PythonMaterialLib.set_static_switch_parameter_value(mi, "ForceUseBlue", enabled=True, update_static_permutation=True)
-
-                unreal.EditorAssetLibrary.save_asset(mi_path)
-                msgs.append(f"Creaste MI: {mi.get_name()}")
+            for mi_path, mi_spec in zip(mat_paths[1:], mi_specs):
+                mi, bMiBuilt = self.fixture_cache.get_or_build(mi_path, mi_spec, self._build_mi_fixture)
+                if not bMiBuilt:
+                    # the same values again, no new permutation
+                    self._set_mi_fixture_switches(mi, mi_spec)
+                msgs.append(f"Creaste MI: {mi.get_name()}" if bMiBuilt else f"Cached MI: {mi.get_name()}")
             mat = None
             assert hlsl, "hlsl None"
 
@@ -2680,6 +3456,10 @@ class TestPythonAPIs(metaclass=Singleton):
             unreal.PythonMaterialLib.disconnect_material_property(mat, "MP_WorldPositionOffset")
             connections = unreal.PythonMaterialLib.get_material_connections(mat)
             assert len(connections) == 5, f"len(connections): {len(connections)} != 5, after disconnection "
+            # connect it back, the cached M_StaticSwitch stays the same as its spec
+            unreal.PythonMaterialLib.connect_material_property(expressions[0], "", "MP_WorldPositionOffset")
+            connections = unreal.PythonMaterialLib.get_material_connections(mat)
+            assert len(connections) == 6, f"len(connections): {len(connections)} != 6, after connecting back "
 
             # 9.2
             exp_0 = expressions[0]
@@ -2741,38 +3521,22 @@ class TestPythonAPIs(metaclass=Singleton):
             msgs.append("get_selected_material_nodes")
             # 10.1
             mat_path = "/Game/_AssetsForTAPythonTestCase/Materials/M_FeatureLevel4Test"
-            if not unreal.EditorAssetLibrary.does_asset_exist(mat_path):
-                folder, mat_name = mat_path.rsplit("/", 1)
-                mat = asset_tools.create_asset(mat_name, folder, unreal.Material, unreal.MaterialFactoryNew())
-                unreal.EditorAssetLibrary.save_asset(mat.get_path_name())
-
-                exp_feature = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionFeatureLevelSwitch)
-
-                exp_add = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionAdd)
-                exp_one = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionConstant)
-                exp_one.set_editor_property("r", 1)
-                exp_zero = unreal.MaterialEditingLibrary.create_material_expression(mat,unreal.MaterialExpressionConstant)
-                exp_zero.set_editor_property("r", 0)
-
-                esp_sm31 = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-                esp_sm31.set_editor_property("parameter_name", "ES31")
-                esp_sm31.set_editor_property("default_value", unreal.LinearColor(1, 1, 1, 1))
-
-                unreal.MaterialEditingLibrary.connect_material_property(from_expression=exp_feature, from_output_name=""
-                                                                    , property_=unreal.MaterialProperty.MP_BASE_COLOR)
-                self.add_test_log("connect_material_expressions")
-                unreal.PythonMaterialLib.connect_material_expressions(exp_one, "", exp_add, "A")
-                unreal.PythonMaterialLib.connect_material_expressions(exp_zero, "", exp_add, "B")
-
-                unreal.PythonMaterialLib.connect_material_expressions(exp_add, "", exp_feature, "DEFAULT")
-                unreal.PythonMaterialLib.connect_material_expressions(esp_sm31, "", exp_feature, "ES3_1")
-
-                unreal.MaterialEditingLibrary.layout_material_expressions(mat)
-                unreal.EditorAssetLibrary.save_asset(mat.get_path_name())
 
+            spec = {"nodes": [["FeatureLevel", "MaterialExpressionFeatureLevelSwitch", {}]
+                            , ["Add", "MaterialExpressionAdd", {}]
+                            , ["One", "MaterialExpressionConstant", {"r": 1}]
+                            , ["Zero", "MaterialExpressionConstant", {"r": 0}]
+                            , ["ES31", "MaterialExpressionVectorParameter", {"parameter_name": "ES31", "default_value": [1, 1, 1, 1]}]]
+                    , "outputs": [["MaterialEditingLibrary", "FeatureLevel", "", "MP_BASE_COLOR"]]
+                    , "connections": [["PythonMaterialLib", "One", "", "Add", "A"]
+                                    , ["PythonMaterialLib", "Zero", "", "Add", "B"]
+                                    , ["PythonMaterialLib", "Add", "", "FeatureLevel", "DEFAULT"]
+                                    , ["PythonMaterialLib", "ES31", "", "FeatureLevel", "ES3_1"]]}
+            mat_feature_level, bBuilt = self.fixture_cache.get_or_build(mat_path, spec, self._build_material_fixture)
+            if not bBuilt:
+                self._connect_material_fixture(self._material_fixture_expressions(mat_feature_level, spec), spec)
 
             # 10.2 get_all_referenced_expressions
-            mat_feature_level = unreal.load_asset('/Game/_AssetsForTAPythonTestCase/Materials/M_FeatureLevel4Test')
             self.add_test_log("get_all_referenced_expressions")
             expressions = unreal.PythonMaterialLib.get_all_referenced_expressions(mat_feature_level, feature_level=3) #SM5
             expressions_es31 = unreal.PythonMaterialLib.get_all_referenced_expressions(mat_feature_level, feature_level=1) #SM5
@@ -2797,83 +3561,127 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
-    def _testcase_material_attributes(self):
+    def _testcase_material_graph_builder(self):
         succ, msgs = False, []
+        m_path = "/Game/_AssetsForTAPythonTestCase/Materials/M_GraphBuilder"
+        AssetCleanup.delete_assets_batched([m_path], snapshot=self.asset_snapshot)
         try:
-            asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
-            mat_paths = ["/Game/_AssetsForTAPythonTestCase/Materials/M_Attributes"]
-            # 1. delte exists
-            for _path in reversed(mat_paths): # delete mi first
-                if unreal.EditorAssetLibrary.does_asset_exist(_path):
-                    unreal.EditorAssetLibrary.save_asset(_path)
-                    unreal.get_editor_subsystem(unreal.AssetEditorSubsystem).close_all_editors_for_asset(unreal.load_asset(_path))
-                    unreal.PythonBPLib.delete_asset(_path, show_confirmation=False)
-            # 2. create a new
-            mat_path = mat_paths[0]
-            folder, mat_name = mat_path.rsplit("/", 1)
-            mat = asset_tools.create_asset(mat_name, folder, unreal.Material, unreal.MaterialFactoryNew())
-            unreal.EditorAssetLibrary.save_asset(mat.get_path_name())
-
-
-            # 2.1 MaterialExpressionSetMaterialAttributes
-            node_sma = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionSetMaterialAttributes,
-                                                                                node_pos_x=-500, node_pos_y=0)
-            property_names = ["MP_Specular", "MP_Normal", "MP_WorldPositionOffset", "MP_CustomData0"]
-
-            self.add_test_log("add_input_at_expression_set_material_attributes")
-            for mp_name in property_names:
-                unreal.PythonMaterialLib.add_input_at_expression_set_material_attributes(node_sma, mp_name)
-
-            # same with MaterialExpressionGetMaterialAttributes
-            node_gma = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionGetMaterialAttributes,
-                                                                                node_pos_x=-200, node_pos_y=0)
-            self.add_test_log("add_output_at_expression_get_material_attributes")
-            for mp_name in property_names:
-                unreal.PythonMaterialLib.add_output_at_expression_get_material_attributes(node_gma, mp_name)
-            unreal.PythonMaterialLib.connect_material_expressions(from_expression=node_sma, from_output_name=""
-                                                                  , to_expression=node_gma, to_input_name="")
-
-            for mp_name in property_names:
-                unreal.PythonMaterialLib.connect_material_property(node_gma, mp_name, mp_name)
-
-            switch_spec = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionStaticSwitchParameter)
-            switch_spec.set_editor_property("parameter_name", "SpecUseOne")
+            spec = {"nodes": {"ForceUseBlue": {"class": "MaterialExpressionStaticSwitchParameter", "props": {"parameter_name": "ForceUseBlue"}}
+                            , "UseRed": {"class": "MaterialExpressionStaticSwitchParameter", "props": {"parameter_name": "UseRed"}}
+                            , "Blue": {"class": "MaterialExpressionVectorParameter", "props": {"parameter_name": "Blue", "default_value": [0, 0, 1, 1]}}
+                            , "Red": {"class": "MaterialExpressionVectorParameter", "props": {"parameter_name": "Red", "default_value": [1, 0, 0, 1]}}
+                            , "Green": {"class": "MaterialExpressionVectorParameter", "props": {"parameter_name": "Green", "default_value": [0, 1, 0, 1]}}}
+                  , "connections": [["Blue", "", "ForceUseBlue", "True"], ["UseRed", "", "ForceUseBlue", "False"]
+                                  , ["Red", "", "UseRed", "True"], ["Green", "", "UseRed", "False"]]
+                  , "outputs": {"MP_BaseColor": ["ForceUseBlue", ""], "MP_WorldPositionOffset": ["ForceUseBlue", ""]}}
+            # 1. build, compile once
+            report = MaterialGraphBuilder.build_materials({m_path: spec})[m_path]
+            mat = unreal.load_asset(m_path)
+            assert mat, f"Material not created: {m_path}"
+            expressions = unreal.PythonMaterialLib.get_material_expressions(mat)
+            assert len(expressions) == 5, f"expression count: {len(expressions)} != 5"
+            connections = unreal.PythonMaterialLib.get_material_connections(mat)
+            assert len(connections) == 6, f"len(connections): {len(connections)} != 6"
+            assert report["compiles"] == 1, f"compiles: {report['compiles']} != 1"
+            msgs.append(f"build: {report['create']} nodes, edit: {report['edit_seconds']:.2f}s, compile: {report['compile_seconds']:.2f}s")
+
+            # 2. same spec, nothing to do
+            report = MaterialGraphBuilder.build_materials({m_path: spec})[m_path]
+            assert not report["changed"] and report["compiles"] == 0, f"unchanged spec rebuilt: {report}"
+
+            # 3. only the difference
+            spec["nodes"]["Blue"]["props"]["default_value"] = [0, 1, 1, 1]
+            spec["outputs"].pop("MP_WorldPositionOffset")
+            report = MaterialGraphBuilder.build_materials({m_path: spec})[m_path]
+            assert (report["create"], report["update"], report["disconnect_outputs"]) == (0, 1, 1), f"diff build: {report}"
+            connections = unreal.PythonMaterialLib.get_material_connections(mat)
+            assert len(connections) == 5, f"len(connections): {len(connections)} != 5, after diff build"
+            assert report["compiles"] == 1, f"compiles: {report['compiles']} != 1, after diff build"
+            msgs.append(f"diff build: edit {report['edit_seconds'] * 1000:.1f}ms, compile: {report['compile_seconds']:.2f}s")
+
+            # 4. a material not built from a spec is refused, not built over
+            untagged = unreal.load_asset("/Game/_AssetsForTAPythonTestCase/Materials/M_StaticSwitch")
+            expression_count = len(unreal.PythonMaterialLib.get_material_expressions(untagged))
+            bRefused = False
+            try:
+                MaterialGraphBuilder.MaterialGraphBuilder(untagged).build(spec, compile=False)
+            except AssertionError as e:
+                bRefused = True
+                msgs.append(f"untagged material refused: {e}")
+            assert bRefused, "untagged M_StaticSwitch was built over"
+            assert len(unreal.PythonMaterialLib.get_material_expressions(untagged)) == expression_count, "M_StaticSwitch expressions changed"
 
-            exp_spec = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            exp_spec.set_editor_property("parameter_name", "Zero")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
 
-            exp_spec_one = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            exp_spec_one.set_editor_property("parameter_name", "One")
-            exp_spec_one.set_editor_property("default_value", unreal.LinearColor(1, 1, 1, 1))
+        self.push_result(succ, msgs)
 
-            unreal.PythonMaterialLib.connect_material_expressions(exp_spec_one, "", switch_spec, "True")
-            unreal.PythonMaterialLib.connect_material_expressions(exp_spec, "", switch_spec, "False")
+    def _testcase_shader_map_stats(self):
+        succ, msgs = False, []
+        m_path = "/Game/_AssetsForTAPythonTestCase/Materials/M_StaticSwitch"
+        try:
+            mat = unreal.load_asset(m_path)
+            assert mat, f"mat None: {m_path}"
+            cache = ShaderMapStats.ShaderStatsCache("PCD3D_SM5")
+            self.add_test_log("get_shader_map_info")
+            stats = cache.get(mat)
+            assert stats["total"] > 0 and stats["by_vertex_factory"], f"no shader in stats: {stats['name']}"
+            assert sum(stats["by_type"].values()) == stats["total"], "by_type count != total"
+            stats_again = cache.get(mat)
+            assert stats_again is stats and cache.hits == 1, f"cache hits: {cache.hits} != 1"
+            msgs.append(f"{stats['total']} shaders in {len(stats['by_vertex_factory'])} vertex factories")
+
+            # MI_StaticSwitch_A/B/C: 3 static permutations of M_StaticSwitch
+            report = ShaderMapStats.analyze_folder(os.path.dirname(m_path), cache=cache, max_permutations=2)
+            permutations = report["permutations"].get(mat.get_path_name())
+            assert permutations, "no permutations of M_StaticSwitch"
+            assert permutations["instances"] == 3 and permutations["unique"] == 3, f"permutations: {permutations['instances']}, {permutations['unique']}"
+            assert any(f["parent"] == mat.get_path_name() for f in report["explosions"]), "permutation explosion not flagged"
+            assert cache.parses <= len(report["materials"]), f"parses: {cache.parses} > {len(report['materials'])}"
+            msgs.append(f"folder: {report['total_shaders']} shaders, explosions: {len(report['explosions'])}")
 
-            esp_normal = unreal.MaterialEditingLibrary.create_material_expression(mat,unreal.MaterialExpressionVectorParameter)
-            esp_normal.set_editor_property("parameter_name", "Normal")
-            esp_normal.set_editor_property("default_value", unreal.LinearColor(0, 0, 1, 0))
-            esp_wpo = unreal.MaterialEditingLibrary.create_material_expression(mat, unreal.MaterialExpressionVectorParameter)
-            esp_wpo.set_editor_property("parameter_name", "WPO")
-            esp_cd0 = unreal.MaterialEditingLibrary.create_material_expression(mat,unreal.MaterialExpressionConstant2Vector)
-            # esp_cd0.set_editor_property("parameter_name", "CustomData0")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
 
-            for mp_name, express in zip(["Specular", "Normal", "World Position Offset", "Custom Data 0"], [switch_spec, esp_normal, esp_wpo, esp_cd0]):
-                # unreal.PythonMaterialLib.connect_material_property(node_gma, mp_name, mp_name)
-                unreal.PythonMaterialLib.connect_material_expressions(express, "", node_sma, mp_name)
+        self.push_result(succ, msgs)
 
-            unreal.MaterialEditingLibrary.layout_material_expressions(mat)
-            unreal.EditorAssetLibrary.save_asset(mat_path)
+    def _testcase_material_attributes(self):
+        succ, msgs = False, []
+        try:
+            mat_path = "/Game/_AssetsForTAPythonTestCase/Materials/M_Attributes"
+            mf_path = "/Game/_AssetsForTAPythonTestCase/Materials/MF_ForTestCase"
+            # 1. delte the mf created in step 3
+            AssetCleanup.delete_assets_batched([mf_path], snapshot=self.asset_snapshot)
+            # 2. create a new M_Attributes, or reuse the one built from the same spec
+            property_names = ["MP_Specular", "MP_Normal", "MP_WorldPositionOffset", "MP_CustomData0"]
+            spec = {"nodes": [["SetAttributes", "MaterialExpressionSetMaterialAttributes", {}]
+                            , ["GetAttributes", "MaterialExpressionGetMaterialAttributes", {}]
+                            , ["SpecUseOne", "MaterialExpressionStaticSwitchParameter", {"parameter_name": "SpecUseOne"}]
+                            , ["Zero", "MaterialExpressionVectorParameter", {"parameter_name": "Zero"}]
+                            , ["One", "MaterialExpressionVectorParameter", {"parameter_name": "One", "default_value": [1, 1, 1, 1]}]
+                            , ["Normal", "MaterialExpressionVectorParameter", {"parameter_name": "Normal", "default_value": [0, 0, 1, 0]}]
+                            , ["WPO", "MaterialExpressionVectorParameter", {"parameter_name": "WPO"}]
+                            , ["CustomData0", "MaterialExpressionConstant2Vector", {}]]
+                    , "attributes": {"SetAttributes": property_names, "GetAttributes": property_names}
+                    , "outputs": [["PythonMaterialLib", "GetAttributes", mp_name, mp_name] for mp_name in property_names]
+                    , "connections": [["PythonMaterialLib", "SetAttributes", "", "GetAttributes", ""]
+                                    , ["PythonMaterialLib", "One", "", "SpecUseOne", "True"]
+                                    , ["PythonMaterialLib", "Zero", "", "SpecUseOne", "False"]]
+                                    + [["PythonMaterialLib", key, "", "SetAttributes", mp_name] for key, mp_name in
+                                       zip(["SpecUseOne", "Normal", "WPO", "CustomData0"], ["Specular", "Normal", "World Position Offset", "Custom Data 0"])]}
+            mat, bBuilt = self.fixture_cache.get_or_build(mat_path, spec, self._build_material_fixture)
+            if not bBuilt:
+                self._connect_material_fixture(self._material_fixture_expressions(mat, spec), spec)
+            self.add_test_log("get_material_connections")
+            connections = unreal.PythonMaterialLib.get_material_connections(mat)
+            assert len(connections) == len(spec["connections"]) + len(spec["outputs"]) \
+                , f"M_Attributes len(connections): {len(connections)} != {len(spec['connections']) + len(spec['outputs'])}"
+            msgs.append("Create M_Attributes." if bBuilt else "Cached M_Attributes.")
 
             # 3. create MF
             asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
-            mf_path = "/Game/_AssetsForTAPythonTestCase/Materials/MF_ForTestCase"
-
-            if unreal.EditorAssetLibrary.does_asset_exist(mf_path):
-                # delete first
-                unreal.EditorAssetLibrary.save_asset(mf_path)
-                unreal.get_editor_subsystem(unreal.AssetEditorSubsystem).close_all_editors_for_asset(unreal.load_asset(mf_path))
-                unreal.PythonBPLib.delete_asset(mf_path, show_confirmation=False)
-
             folder, mf_name = mf_path.rsplit("/", 1)
 
             my_mf = asset_tools.create_asset(mf_name, folder, unreal.MaterialFunction, unreal.MaterialFunctionFactoryNew())
@@ -3101,10 +3909,7 @@ class TestPythonAPIs(metaclass=Singleton):
             mesh_comp.set_material(0, mi)
             # delete existed mesh
             dest_package_path = "/Game/_AssetsForTAPythonTestCase/Meshes/SM_FromProcedural"
-            if unreal.EditorAssetLibrary.does_asset_exist(dest_package_path):
-                unreal.EditorAssetLibrary.save_asset(dest_package_path)
-                unreal.get_editor_subsystem(unreal.AssetEditorSubsystem).close_all_editors_for_asset(unreal.load_asset(dest_package_path))
-                unreal.PythonBPLib.delete_asset(dest_package_path, show_confirmation=False)
+            AssetCleanup.delete_assets_batched([dest_package_path], snapshot=self.asset_snapshot, fix_redirectors=False, run_gc=False)
 
             assert mesh_comp, "mesh_comp None"
             msgs.append("create procedural mesh")
@@ -3244,32 +4049,326 @@ class TestPythonAPIs(metaclass=Singleton):
 
         self.push_result(succ, msgs)
 
+    def _testcase_mesh_buffers(self):
+        succ, msgs = False, []
+        actor = None
+        try:
+            assert MeshBuffers.bNumpy, "Need 3rd package: numpy"
+            actor = unreal.PythonBPLib.spawn_actor_from_class(unreal.Actor, unreal.Vector.LEFT * 1500)
+            actor.set_actor_label("MeshBuffersForTest")
+            mesh_comp = unreal.PythonBPLib.add_component(unreal.ProceduralMeshComponent, actor, actor.root_component)
+
+            # 1. normals of a box, same as the ones from generate_box_mesh
+            vertices, triangles, normals, u_vs, tangents = unreal.ProceduralMeshLibrary.generate_box_mesh(unreal.Vector(100, 100, 100))
+            box = MeshBuffers.MeshBuffers.from_unreal(vertices, triangles, u_vs, normals)
+            api_normals = box.normals.copy()
+            computed = box.compute_normals()
+            max_error = float(abs(computed - api_normals).max())
+            assert max_error < 1e-4, f"box normals error: {max_error}"
+            msgs.append("box normals")
+
+            # 2. a height field over the section limit
+            grid = MeshBuffers.grid(300, 300, spacing=10, height=lambda x, y: (x * 0.01) ** 2 * 20)
+            grid.compute_tangents()
+            created = grid.create_sections(mesh_comp, max_vertices=32768)
+            assert created["sections"] >= 3, f"sections: {created['sections']} < 3"
+            section_count = mesh_comp.get_num_sections()
+            assert section_count == created["sections"], f"get_num_sections: {section_count} != {created['sections']}"
+            msgs.append(f"{grid.vertex_count} verts in {created['sections']} sections")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+        finally:
+            if actor:
+                actor.destroy_actor()
+
+        self.push_result(succ, msgs)
+
+    def _testcase_mesh_edit_transaction(self):
+        succ, msgs = False, []
+        try:
+            mesh_path = "/Game/_AssetsForTAPythonTestCase/Meshes/SM_ColorCalibrator_Copied"
+            mesh = unreal.load_asset(mesh_path)
+            assert mesh, f"mesh null: {mesh_path}"
+            self.add_test_log("get_static_mesh_section_info")
+            material_indexes = list(unreal.PythonBPLib.get_static_mesh_section_info(mesh, 0))
+            assert len(material_indexes) > 3, f"section count: {len(material_indexes)}"
+
+            # 1. reverse the materials of lod0, one rebuild
+            transaction = MeshEdits.MeshEditTransaction()
+            for i in range(len(material_indexes)):
+                transaction.set_section_material(mesh, 0, i, material_indexes[len(material_indexes) - i - 1])
+            report = transaction.commit()
+            after = list(unreal.PythonBPLib.get_static_mesh_section_info(mesh, 0))
+            assert after == material_indexes[::-1], f"material_indexes after commit: {after} != {material_indexes[::-1]}"
+            expected_applied = sum(1 for a, b in zip(material_indexes, after) if a != b)
+            assert report["applied"] == expected_applied and report["rebuilds"] == 1, f"report: {report}"
+            msgs.append(f"{report['applied']} section materials, {report['rebuilds']} rebuild in {report['seconds'] * 1000:.1f}ms")
+
+            # 2. same values again, nothing applied
+            for i in range(len(material_indexes)):
+                transaction.set_section_material(mesh, 0, i, after[i])
+            report = transaction.commit()
+            assert report["engine_calls"] == 0 and report["skipped"] == len(material_indexes), f"no-op report: {report}"
+
+            # 3. restore the materials with a cast shadow edit, the material ids are deferred to the cast shadow rebuild
+            for i in range(len(material_indexes)):
+                transaction.set_section_material(mesh, 0, i, material_indexes[i])
+            self.add_test_log("get_section_cast_shadow")
+            cast_shadow = unreal.PythonMeshLib.get_section_cast_shadow(mesh, lod_level=0, section_id=3)
+            transaction.set_cast_shadow(mesh, 0, 3, not cast_shadow)
+            report = transaction.commit()
+            after = list(unreal.PythonBPLib.get_static_mesh_section_info(mesh, 0))
+            assert after == material_indexes, f"material_indexes after restore: {after} != {material_indexes}"
+            assert unreal.PythonMeshLib.get_section_cast_shadow(mesh, lod_level=0, section_id=3) != cast_shadow, "cast shadow not changed"
+            assert report["rebuilds"] == 1, f"rebuilds: {report['rebuilds']} != 1"
+
+            transaction.set_cast_shadow(mesh, 0, 3, cast_shadow)
+            transaction.commit()
+            assert unreal.PythonMeshLib.get_section_cast_shadow(mesh, lod_level=0, section_id=3) == cast_shadow, "cast shadow not restored"
+            msgs.append("MeshEditTransaction restored.")
+
+            # 4. bad indices fail when staged, with the mesh path, and nothing is staged
+            for stage in [lambda: transaction.set_section_material(mesh, 0, len(material_indexes), 0)
+                        , lambda: transaction.set_section_material(mesh, 0, 0, len(mesh.get_editor_property("static_materials")))
+                        , lambda: transaction.set_slot_material(mesh, -1, None)]:
+                bRaised = False
+                try:
+                    stage()
+                except AssertionError as e:
+                    bRaised = mesh_path in str(e)
+                assert bRaised, "bad index staged without an AssertionError with the mesh path"
+            assert transaction.edit_count() == 0, f"edits staged with bad indices: {transaction.edit_count()}"
+            transaction.rollback()
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _testcase_mesh_batch(self):
+        # run with push_sliced_call
+        succ, msgs = False, []
+        folder = f"{self.temp_assets_folder}/Meshes/Batch"
+        source_paths = ["/Engine/BasicShapes/Cube", "/Engine/BasicShapes/Sphere", "/Engine/BasicShapes/Cylinder"
+                        , "/Engine/EditorMeshes/ColorCalibrator/SM_ColorCalibrator"]
+        mesh_paths = [f"{folder}/{os.path.basename(path)}_Batch" for path in source_paths]
+        self._delete_assets(mesh_paths)
+        try:
+            for source_path, mesh_path in zip(source_paths, mesh_paths):
+                assert unreal.EditorAssetLibrary.duplicate_asset(source_path, mesh_path), f"duplicate failed: {source_path}"
+            yield
+            bUE5 = unreal.PythonBPLib.get_unreal_version()["major"] == 5
+            settings = {"lods": [[1.0, 1.0], [0.5, 0.5]], "nanite": True if bUE5 else None}
+
+            # 1. apply and verify with is_this_lod_generated_by_mesh_reduction, get_original_lod_data_count
+            self.add_test_log("set_lods, apply_nanite")
+            processor = MeshBatch.MeshBatchProcessor([folder], settings)
+            yield from processor.iter_process()
+            summary = processor.summary()
+            failed = [f"{r['path']}: {r['errors']}" for r in processor.results if r["status"] == "failed"]
+            assert not failed, f"failed: {'; '.join(failed)}"
+            assert summary["applied"] == len(mesh_paths), f"applied: {summary['applied']} != {len(mesh_paths)}"
+            report_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/TAPythonTestCase/MeshBatch.json")
+            processor.write_report(report_path)
+            msgs.append(f"{summary['applied']} meshes in {summary['seconds']:.2f}s, groups: {', '.join(summary['groups'])}")
+
+            # 2. same settings, skipped
+            yield from processor.iter_process()
+            summary = processor.summary()
+            assert summary["skipped"] == len(mesh_paths), f"skipped: {summary['skipped']} != {len(mesh_paths)}"
+
+            # 3. cancel after the first mesh
+            processor = MeshBatch.MeshBatchProcessor([folder], {"lods": [[1.0, 1.0], [0.5, 0.5], [0.25, 0.25]], "nanite": None}, save=False)
+            processor.on_progress = lambda done, total, result: processor.cancel()
+            yield from processor.iter_process()
+            summary = processor.summary()
+            assert summary["applied"] == 1 and summary["cancelled"] == len(mesh_paths) - 1, f"cancel summary: {summary}"
+            msgs.append("MeshBatchProcessor cancelled.")
+
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+        return succ, msgs
+
+    def _testcase_hism_bulk(self):
+        succ, msgs = False, []
+        try:
+            assert HismInstances.bNumpy, "Need 3rd package: numpy"
+            hism_actor = unreal.PythonBPLib.spawn_actor_from_class(unreal.Actor, unreal.Vector(0, 5000, 0))
+            hism_actor.set_actor_label("HismBulkActorForTest")
+            hism_comp = unreal.PythonBPLib.add_component(unreal.HierarchicalInstancedStaticMeshComponent, hism_actor, hism_actor.root_component)
+            instance_mesh = unreal.load_asset("/Game/StarterContent/Props/SM_Lamp_Ceiling")
+            assert instance_mesh, "instance_mesh null"
+            hism_comp.set_editor_property("static_mesh", instance_mesh)
+
+            instances = HismInstances.grid_instances(100, 100, spacing=200, z=300)
+            builder = HismInstances.BulkInstanceBuilder(hism_comp, chunk_size=1000)
+            report = builder.add(instances)
+            assert hism_comp.get_instance_count() == len(instances), f"instance count: {hism_comp.get_instance_count()} != {len(instances)}"
+            msgs.append(f"add_instances: {report['instances_per_sec']:.0f} instances/sec")
+
+            # overlapping count from engine should match the inserted data
+            bounds = instance_mesh.get_bounds()
+            extent = [bounds.box_extent.x, bounds.box_extent.y, bounds.box_extent.z]
+            # world space boxes, the instances are relative to the actor at (0, 5000, 0)
+            for box_min, box_max in [([0, 4900, 100], [2000, 5300, 500]), ([-1000, 4000, 0], [5000, 8000, 1000])]:
+                count = unreal.PythonMeshLib.get_overlapping_box_count(hism_comp, box=unreal.Box(min=box_min, max=box_max))
+                expected = HismInstances.count_in_box(instances, box_min, box_max, extent, component_location=[0, 5000, 0]
+                                                      , bounds_origin=[bounds.origin.x, bounds.origin.y, bounds.origin.z])
+                assert count == expected, f"overlapping box count: {count} != {expected}"
+            msgs.append("hism bulk overlapping.")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
+
+    def _testcase_hism_overlap_oracle(self):
+        succ, msgs = False, []
+        try:
+            assert HismInstances.bNumpy, "Need 3rd package: numpy"
+            hism_actor = unreal.PythonBPLib.spawn_actor_from_class(unreal.Actor, unreal.Vector(0, -30000, 0))
+            hism_actor.set_actor_label("HismOracleActorForTest")
+            hism_comp = unreal.PythonBPLib.add_component(unreal.HierarchicalInstancedStaticMeshComponent, hism_actor, hism_actor.root_component)
+            instance_mesh = unreal.load_asset("/Game/StarterContent/Props/SM_Lamp_Ceiling")
+            assert instance_mesh, "instance_mesh null"
+            hism_comp.set_editor_property("static_mesh", instance_mesh)
 
+            instances = HismInstances.random_instances(20000, [-20000, -20000, 0], [20000, 20000, 1000], scale_range=(0.5, 2.0), seed=29)
+            HismInstances.BulkInstanceBuilder(hism_comp, chunk_size=5000).add(instances)
+
+            bounds = instance_mesh.get_bounds()
+            index = HismInstances.InstanceGridIndex(instances
+                                                    , bounds_extent=[bounds.box_extent.x, bounds.box_extent.y, bounds.box_extent.z]
+                                                    , bounds_radius=bounds.sphere_radius
+                                                    , component_location=[0, -30000, 0]
+                                                    , bounds_origin=[bounds.origin.x, bounds.origin.y, bounds.origin.z])
+            rng = HismInstances.np.random.default_rng(0)
+            query_count = 200
+            centers = rng.uniform([-22000, -52000, -200], [22000, -8000, 1200], size=(query_count, 3))
+            half_sizes = rng.uniform(100, 3000, size=(query_count, 3))
+            radii = rng.uniform(100, 3000, size=query_count)
+
+            self.add_test_log("get_overlapping_box_count")
+            self.add_test_log("get_overlapping_sphere_count")
+            t = time.time()
+            engine_box = [unreal.PythonMeshLib.get_overlapping_box_count(hism_comp, box=unreal.Box(min=(c - h).tolist(), max=(c + h).tolist()))
+                          for c, h in zip(centers, half_sizes)]
+            engine_sphere = [unreal.PythonMeshLib.get_overlapping_sphere_count(hism_comp, unreal.Vector(*c.tolist()), float(r))
+                             for c, r in zip(centers, radii)]
+            engine_seconds = time.time() - t
+
+            t = time.time()
+            oracle_box = index.count_boxes(centers - half_sizes, centers + half_sizes)
+            oracle_sphere = index.count_spheres(centers, radii)
+            oracle_seconds = time.time() - t
+
+            for i in range(query_count):
+                assert engine_box[i] == oracle_box[i], f"box query {i}, overlapping count: {engine_box[i]} != {oracle_box[i]}"
+                assert engine_sphere[i] == oracle_sphere[i], f"sphere query {i}, overlapping count: {engine_sphere[i]} != {oracle_sphere[i]}"
+            msgs.append(f"{query_count * 2} overlap queries, engine: {engine_seconds:.3f}s, oracle: {oracle_seconds:.3f}s")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+
+        self.push_result(succ, msgs)
 
     def test_category_Mesh(self, id):
         self.test_being(id=id)
         level_path = '/Game/StarterContent/Maps/StarterMap'  # avoid saving level by mistake
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
 
         self.push_call(py_task(self._testcase_texture), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_close_temp_assets_editor), delay_seconds=1)
+        self.push_call(py_task(self._testcase_fixture_cache_stub), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_create_rt), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_set_rt), delay_seconds=0.1)
 
         self.push_call(py_task(self._testcase_create_swtich_materials), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_material_attributes), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_material_graph_builder), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_shader_map_stats), delay_seconds=0.1)
 
         self.push_call(py_task(self._testcase_duplicate_mesh), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_mesh_materials), delay_seconds=0.1)
 
         level_path = '/Game/_AssetsForTAPythonTestCase/Maps/NewMap'
-        self.push_call(py_task(unreal.EditorLevelLibrary.load_level, level_path), delay_seconds=0.1)
+        self.push_call(py_task(self.load_level_fixture, level_path=level_path), delay_seconds=0.1)
         self.push_call(py_task(self._testcase_mesh_misc), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_mesh_buffers), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_mesh_edit_transaction), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_hism_bulk), delay_seconds=0.1)
+        self.push_call(py_task(self._testcase_hism_overlap_oracle), delay_seconds=0.1)
+        self.push_sliced_call(self._testcase_mesh_batch, delay_seconds=0.1, budget_ms=16)
 
+        self.test_finish_after_async(id)
 
+    async def _testcase_permutation_benchmark(self):
+        succ, msgs = False, []
+        folder = f"{self.temp_assets_folder}/Permutations"
+        switch_counts, limit = (1, 2, 3, 4), 16
+        asset_paths = [f"{folder}/MI_Permutation_{n}_{PermutationBenchmark.permutation_name(values)}"
+                       for n in switch_counts for values in PermutationBenchmark.permutations(n, limit)]
+        asset_paths += [f"{folder}/{name}_{n}" for n in switch_counts for name in ("M_Permutation", "M_PermutationInstances")]
+        self._delete_assets(asset_paths)
+        try:
+            self.add_test_log("get_shader_map_info, get_statistics, set_static_switch_parameters_values")
+            rows = await PermutationBenchmark.sweep(folder, switch_counts=switch_counts, limit=limit, platform="PCD3D_SM5")
+            summary = PermutationBenchmark.summarize(rows)
+            table = PermutationBenchmark.scaling_table(summary)
+            print(table)
+            msgs.extend(table.split("\n"))
+            for s in summary:
+                assert s["permutations"] == min(s["possible"], limit), f"{s['switches']} switches: {s['permutations']} permutations"
+                assert s["shaders_min"] > 0, f"{s['switches']} switches: no shader in a permutation"
+
+            baseline_path = os.path.join(unreal.SystemLibrary.get_project_directory(), r"Saved/TAPythonTestCase/PermutationBaseline.json")
+            baseline = PermutationBenchmark.load_baseline(baseline_path)
+            if baseline:
+                regressions = PermutationBenchmark.compare_baseline(summary, baseline)
+                assert not regressions, f"Regressions from {baseline_path}: {'; '.join(regressions)}"
+                msgs.append("No shader count regression from baseline.")
+                # compile times depend on the DDC state, reported but not gated
+                msgs.append(f"Compile time from baseline: {'; '.join(PermutationBenchmark.compile_deltas(summary, baseline))}")
+            else:
+                PermutationBenchmark.save_baseline(baseline_path, summary, "PCD3D_SM5")
+                msgs.append(f"Baseline saved: {baseline_path}")
+            unreal.EditorAssetLibrary.save_directory(folder, only_if_is_dirty=True, recursive=True)
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+        return succ, msgs
 
-        self.test_finish(id)
-
-
+    def _testcase_mesh_buffers_benchmark(self):
+        succ, msgs = False, []
+        actor = None
+        try:
+            assert MeshBuffers.bNumpy, "Need 3rd package: numpy"
+            actor = unreal.PythonBPLib.spawn_actor_from_class(unreal.Actor, unreal.Vector.LEFT * 1500)
+            actor.set_actor_label("MeshBuffersBenchmark")
+            mesh_comp = unreal.PythonBPLib.add_component(unreal.ProceduralMeshComponent, actor, actor.root_component)
+            self.add_test_log("create_mesh_section")
+            # verts/sec into create_mesh_section, blocks the editor for seconds with 1M verts
+            for result in MeshBuffers.benchmark(mesh_comp, sizes=(10_000, 100_000, 1_000_000)):
+                msgs.append(f"{result['vertices']} verts: {result['verts_per_second']:,.0f} verts/s, create {result['create_seconds']:.2f}s")
+            succ = True
+        except AssertionError as e:
+            msgs.append(str(e))
+        finally:
+            if actor:
+                actor.destroy_actor()
 
+        self.push_result(succ, msgs)
 
+    def test_category_benchmark(self, id):
+        # static switch permutations of the switch materials in category 9, one master for each switch count
+        self.test_being(id=id)
+        self.push_async_call(self._testcase_permutation_benchmark, delay_seconds=0.1)
+        # procedural mesh sections from numpy buffers, after the permutations
+        level_path = '/Game/_AssetsForTAPythonTestCase/Maps/NewMap'
+        self.push_call_after_running(self.load_level_fixture, delay_seconds=0.1, wait_timeout=3600.0, level_path=level_path)
+        self.push_call_after_running(self._testcase_mesh_buffers_benchmark, delay_seconds=0.5)
+        self.test_finish_after_async(id, wait_timeout=3600.0)
@@ -62,13 +62,17 @@ def editor_snapshot(window_name):
         unreal.PythonBPLib.execute_console_command(f'EditorShot Name="{window_name}"')
 
 
-def get_latest_snaps(time_from_now_limit:float, group_threshold:float) -> [str]:
-    result = []
+def get_screenshots_folder() -> str:
     prject_folder = unreal.SystemLibrary.get_project_directory()
     if unreal.PythonBPLib.get_unreal_version()["major"] == 5:
-        saved_folder = os.path.abspath(os.path.join(prject_folder, "Saved/Screenshots/WindowsEditor"))
+        return os.path.abspath(os.path.join(prject_folder, "Saved/Screenshots/WindowsEditor"))
     else:
-        saved_folder = os.path.abspath(os.path.join(prject_folder, "Saved/Screenshots/Windows"))
+        return os.path.abspath(os.path.join(prject_folder, "Saved/Screenshots/Windows"))
+
+
+def get_latest_snaps(time_from_now_limit:float, group_threshold:float) -> [str]:
+    result = []
+    saved_folder = get_screenshots_folder()
     if not os.path.exists(saved_folder):
         unreal.log_error("Can't find Screenshots folder")
 
@@ -1,7 +1,55 @@
 from . import Utilities
+from . import LandscapeTiles
+from . import RenderTargetUtils
+from . import FrameBudget
+from . import Coroutines
+from . import DelayCalibration
+from . import FixtureCache
+from . import LevelFixtures
+from . import AssetSnapshot
+from . import AssetCleanup
+from . import HismInstances
+from . import HeightSampler
+from . import LineTraces
+from . import DependencyGraph
+from . import PropertySnapshot
+from . import DataTableBulk
+from . import DataTableSync
+from . import DataTableView
+from . import SchemaBuilder
+from . import MaterialGraphBuilder
+from . import ShaderMapStats
+from . import PermutationBenchmark
+from . import MeshEdits
+from . import MeshBatch
+from . import MeshBuffers
 from . import TestPythonAPIs
 
 import importlib
 
 importlib.reload(Utilities)
+importlib.reload(LandscapeTiles)
+importlib.reload(RenderTargetUtils)
+importlib.reload(FrameBudget)
+importlib.reload(Coroutines)
+importlib.reload(DelayCalibration)
+importlib.reload(FixtureCache)
+importlib.reload(LevelFixtures)
+importlib.reload(AssetSnapshot)
+importlib.reload(AssetCleanup)
+importlib.reload(HismInstances)
+importlib.reload(HeightSampler)
+importlib.reload(LineTraces)
+importlib.reload(DependencyGraph)
+importlib.reload(PropertySnapshot)
+importlib.reload(DataTableBulk)
+importlib.reload(DataTableSync)
+importlib.reload(DataTableView)
+importlib.reload(SchemaBuilder)
+importlib.reload(MaterialGraphBuilder)
+importlib.reload(ShaderMapStats)
+importlib.reload(PermutationBenchmark)
+importlib.reload(MeshEdits)
+importlib.reload(MeshBatch)
+importlib.reload(MeshBuffers)
 importlib.reload(TestPythonAPIs)